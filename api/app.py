@@ -1,18 +1,37 @@
-@'
 from __future__ import annotations
 
 import os
 import json
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from dotenv import load_dotenv
 
-from .routes import router
+from .db import engine
+from .outbox import ENABLED as OUTBOX_ENABLED, writer as outbox_writer
+from .routes import prober as health_prober, router
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background workers: the /health prober and, with RULE_RESULT_OUTBOX=1,
+    # the writer that drains dbo.RuleResultOutbox.
+    if health_prober is not None:
+        health_prober.start()
+    if OUTBOX_ENABLED and engine is not None:
+        outbox_writer.start(engine)
+    yield
+    if health_prober is not None:
+        health_prober.stop()
+    outbox_writer.stop()
+
+
 app = FastAPI(
     title="AUW Navigator 211 POC",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.include_router(router)
@@ -23,4 +42,3 @@ try:
         app.state.settings = json.load(f)
 except Exception:
     app.state.settings = {"rules_enabled": True, "default_queue": "General"}
-'@ | Set-Content -Encoding UTF8 .\api\app.py
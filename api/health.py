@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+# Cached DB health for GET /health: a daemon thread runs SELECT 1 every
+# HEALTH_PROBE_INTERVAL_S seconds and /health returns the last result; a
+# result older than HEALTH_STALE_AFTER_S is refreshed inline. This is a
+# trimmed copy of the POC's api/health.py (the two apps share no code).
+PROBE_INTERVAL_S = float(os.getenv("HEALTH_PROBE_INTERVAL_S", "5"))
+STALE_AFTER_S = float(os.getenv("HEALTH_STALE_AFTER_S", "30"))
+
+
+class HealthProber:
+    def __init__(self, engine, interval_s: float = PROBE_INTERVAL_S, stale_after_s: float = STALE_AFTER_S) -> None:
+        self.engine = engine
+        self.interval_s = interval_s
+        self.stale_after_s = stale_after_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.db_status = "not_probed"
+        self.last_probe_at: Optional[float] = None
+        self.last_success_at: Optional[float] = None
+        self.last_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+
+    def probe(self) -> str:
+        start = time.perf_counter()
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            status, error = "ok", None
+        except Exception as e:
+            status, error = f"error: {type(e).__name__}", str(e)
+        self.last_latency_ms = (time.perf_counter() - start) * 1e3
+        self.last_probe_at = time.time()
+        self.last_error = error
+        if error is None:
+            self.last_success_at = self.last_probe_at
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+        self.db_status = status
+        return status
+
+    def current(self) -> str:
+        last = self.last_probe_at
+        if last is None or time.time() - last > self.stale_after_s:
+            return self.probe()
+        return self.db_status
+
+    def start(self) -> None:
+        if self.interval_s <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self.probe()
+        self._thread = threading.Thread(target=self._run, name="health-probe", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.probe()
+
+    def details(self) -> Dict[str, Any]:
+        pool = self.engine.pool
+        counts = {name: getattr(pool, name)() for name in ("size", "checkedin", "checkedout", "overflow")
+                  if callable(getattr(pool, name, None))}
+        since = time.time() - self.last_success_at if self.last_success_at else None
+        return {
+            "db": self.db_status,
+            "interval_s": self.interval_s,
+            "running": self._thread is not None,
+            "seconds_since_success": since,
+            "last_latency_ms": self.last_latency_ms,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "pool": {"class": type(pool).__name__, **counts},
+        }
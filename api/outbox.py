@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+log = logging.getLogger(__name__)
+
+# Opt-in RuleResult outbox. With RULE_RESULT_OUTBOX=1 the rules engine
+# stages each intake's rule results as one dbo.RuleResultOutbox row in the
+# request transaction (one INSERT however many rules matched) and an
+# OutboxWriter moves them into dbo.RuleResult in large batches.
+#
+# Nothing is lost across a crash or restart: the outbox row commits with the
+# intake's QueueItem, and a drain claims rows (DELETE ... RETURNING/OUTPUT)
+# and inserts their RuleResult rows in one transaction, so a batch is either
+# moved completely or stays in the outbox for the next drain.
+ENABLED = os.getenv("RULE_RESULT_OUTBOX", "").strip().lower() in ("1", "true", "yes", "on")
+BATCH_SIZE = int(os.getenv("RULE_RESULT_OUTBOX_BATCH", "500"))
+INTERVAL_S = float(os.getenv("RULE_RESULT_OUTBOX_INTERVAL_S", "1.0"))
+
+_INSERT_OUTBOX = text("""
+    INSERT INTO dbo.RuleResultOutbox (IntakeId, PayloadJson)
+    VALUES (:IntakeId, :PayloadJson)
+""")
+
+_INSERT_RULE_RESULT = text("""
+    INSERT INTO dbo.RuleResult (EvaluatedAt, IntakeId, RuleId, Action, OutcomeJson)
+    VALUES (:EvaluatedAt, :IntakeId, :RuleId, :Action, :OutcomeJson)
+""")
+
+# Claim the oldest rows. READPAST lets concurrent writers take disjoint
+# batches on SQL Server; SQLite serializes them on the write lock.
+_CLAIM_SQL = {
+    "mssql": text("""
+        WITH batch AS (
+            SELECT TOP (:n) OutboxId, CreatedAt, IntakeId, PayloadJson
+            FROM dbo.RuleResultOutbox WITH (ROWLOCK, READPAST, UPDLOCK)
+            ORDER BY OutboxId
+        )
+        DELETE FROM batch
+        OUTPUT DELETED.OutboxId, DELETED.CreatedAt, DELETED.IntakeId, DELETED.PayloadJson
+    """),
+    "sqlite": text("""
+        DELETE FROM dbo.RuleResultOutbox
+        WHERE OutboxId IN (SELECT OutboxId FROM dbo.RuleResultOutbox ORDER BY OutboxId LIMIT :n)
+        RETURNING OutboxId, CreatedAt, IntakeId, PayloadJson
+    """),
+}
+
+_LAG_SQL = text("SELECT COUNT(*), MIN(CreatedAt) FROM dbo.RuleResultOutbox")
+
+
+def stage(conn: Connection, rule_results: Sequence[Dict[str, Any]]) -> None:
+    """
+    Write rule results to the outbox instead of dbo.RuleResult: one row per
+    intake whose PayloadJson is [[RuleId, Action, OutcomeJson], ...].
+    """
+    by_intake: Dict[int, List[List[Any]]] = {}
+    for r in rule_results:
+        by_intake.setdefault(int(r["IntakeId"]), []).append([r["RuleId"], r["Action"], r["OutcomeJson"]])
+    conn.execute(
+        _INSERT_OUTBOX,
+        [
+            {"IntakeId": intake_id, "PayloadJson": json.dumps(rows, ensure_ascii=False, separators=(",", ":"))}
+            for intake_id, rows in by_intake.items()
+        ],
+    )
+
+
+def drain_once(conn: Connection, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Move up to batch_size outbox rows into dbo.RuleResult within the caller's
+    transaction. EvaluatedAt is the outbox row's CreatedAt, i.e. when the
+    rules ran, not when the row was drained. Returns the outbox rows moved.
+    """
+    claim = _CLAIM_SQL["mssql" if conn.dialect.name == "mssql" else "sqlite"]
+    claimed = conn.execute(claim, {"n": batch_size}).all()
+    if not claimed:
+        return 0
+
+    results = []
+    for _, created_at, intake_id, payload in sorted(claimed, key=lambda r: r[0]):
+        for rule_id, action, outcome_json in json.loads(payload):
+            results.append({
+                "EvaluatedAt": created_at,
+                "IntakeId": intake_id,
+                "RuleId": rule_id,
+                "Action": action,
+                "OutcomeJson": outcome_json,
+            })
+    if results:
+        conn.execute(_INSERT_RULE_RESULT, results)
+    return len(claimed)
+
+
+def drain(engine, batch_size: int = BATCH_SIZE, max_batches: Optional[int] = None) -> int:
+    """Drain until the outbox is empty (or max_batches), one transaction per batch."""
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        with engine.begin() as conn:
+            n = drain_once(conn, batch_size)
+        moved += n
+        batches += 1
+        if n < batch_size:
+            break
+    return moved
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def lag(conn: Connection, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Rows waiting in the outbox and how old the oldest one is."""
+    pending, oldest = conn.execute(_LAG_SQL).one()
+    oldest_at = _as_utc(oldest)
+    now = now or datetime.now(timezone.utc)
+    return {
+        "pending": int(pending or 0),
+        "oldest_created_at": oldest_at.isoformat() if oldest_at else None,
+        "lag_seconds": max(0.0, (now - oldest_at).total_seconds()) if oldest_at else 0.0,
+    }
+
+
+class OutboxWriter:
+    """
+    Background thread that drains the outbox every interval_s, and again
+    straight away while full batches keep coming back. stop() finishes with
+    a last drain; anything still pending after a crash is picked up by the
+    next writer (or `python -m api.outbox --drain`).
+    """
+
+    def __init__(self, interval_s: float = INTERVAL_S, batch_size: int = BATCH_SIZE) -> None:
+        self.interval_s = interval_s
+        self.batch_size = batch_size
+        self.rows_moved = 0
+        self.last_drain_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._engine = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, engine) -> None:
+        if self.running:
+            return
+        self._engine = engine
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rule-result-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._engine is not None:
+            self._drain()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "rows_moved": self.rows_moved,
+            "last_drain_at": self.last_drain_at.isoformat() if self.last_drain_at else None,
+            "last_error": self.last_error,
+        }
+
+    def _drain(self) -> int:
+        try:
+            moved = drain(self._engine, self.batch_size, max_batches=20)
+        except Exception as e:  # keep the thread alive; rows stay in the outbox
+            self.last_error = f"{type(e).__name__}: {e}"
+            log.exception("RuleResult outbox drain failed")
+            return 0
+        self.rows_moved += moved
+        self.last_drain_at = datetime.now(timezone.utc)
+        self.last_error = None
+        return moved
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            moved = self._drain()
+            if moved < self.batch_size * 20:
+                self._stop.wait(self.interval_s)
+
+
+writer = OutboxWriter()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    from .db import engine
+
+    parser = argparse.ArgumentParser(description="RuleResult outbox status / manual drain.")
+    parser.add_argument("--drain", action="store_true", help="move every pending row into dbo.RuleResult")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if engine is None:
+        parser.error("DB is not configured (DB_SERVER, DB_NAME, DB_USER, DB_PASSWORD)")
+    if args.drain:
+        start = time.perf_counter()
+        moved = drain(engine, args.batch_size)
+        print(f"moved {moved} outbox rows in {time.perf_counter() - start:.1f}s")
+    with engine.connect() as conn:
+        print(json.dumps(lag(conn)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,26 +1,24 @@
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import text
-
-from .models import IntakeCreate, IntakeResponse, HealthResponse
-from .db import engine
-from .rules_engine import evaluate_rules_and_enqueue
-
-
 from __future__ import annotations
 
+import base64
+import binascii
 import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import text
 
 from .models import IntakeCreate, IntakeResponse, HealthResponse
 from .db import engine
+from . import outbox
+from .health import HealthProber
 from .rules_engine import evaluate_rules_and_enqueue
 
 router = APIRouter()
 
+prober = HealthProber(engine) if engine is not None else None
+
 def _require_engine():
     if engine is None:
         raise HTTPException(
@@ -33,16 +31,30 @@ def _require_engine():
 
 @router.get("/health", response_model=HealthResponse)
 def health() -> HealthResponse:
-    # Quick DB ping
-    try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        db_status = "ok"
-    except Exception as e:
-        db_status = f"error: {type(e).__name__}"
+    # Last background probe (api/health.py); no DB round trip per call.
+    db_status = prober.current() if prober is not None else "not_configured"
     return HealthResponse(status="ok", db=db_status, version="0.1.0")
 
 
+@router.get("/health/details")
+def health_details() -> Dict[str, Any]:
+    """Last probe result, latency and time since success, plus pool counters."""
+    if prober is None:
+        return {"status": "ok", "db": "not_configured", "version": "0.1.0"}
+    probe = prober.details()
+    db_status, pool = probe.pop("db"), probe.pop("pool")
+    return {"status": "ok", "db": db_status, "version": "0.1.0", "probe": probe, "pool": pool}
+
+
+@router.get("/outbox/lag")
+def outbox_lag() -> Dict[str, Any]:
+    """RuleResult outbox backlog (pending rows, age of the oldest) and writer state."""
+    _require_engine()
+    with engine.connect() as conn:
+        pending = outbox.lag(conn)
+    return {"enabled": outbox.ENABLED, **pending, "writer": outbox.writer.status()}
+
+
 @router.post("/intakes", response_model=IntakeResponse)
 def create_intake(payload: IntakeCreate) -> IntakeResponse:
     """
@@ -92,21 +104,71 @@ def create_intake(payload: IntakeCreate) -> IntakeResponse:
         raise HTTPException(status_code=500, detail=f"Failed to create intake: {type(e).__name__}: {e}")
 
 
+def _encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"q:{last_id}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        prefix, _, last_id = raw.partition(":")
+        if prefix != "q":
+            raise ValueError(prefix)
+        return int(last_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
 @router.get("/queues")
-def list_queues() -> List[Dict[str, Any]]:
+def list_queues(
+    limit: int = Query(50, ge=1, le=500),
+    after: Optional[str] = None,
+    queue: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Dict[str, Any]:
     """
-    Show all queue items (most recent first).
+    Queue items, most recent first, one keyset page at a time. Pass the
+    previous page's next_cursor as `after`; each page is a seek on the
+    clustered key or IX_QueueItem_Queue_Id / IX_QueueItem_Status_Id.
     """
+    params: Dict[str, Any] = {
+        "after": _decode_cursor(after),
+        "queue": queue,
+        "status": status,
+        "since": since,
+        "until": until,
+        "limit": limit + 1,
+    }
+    where = [cond for cond, key in (
+        ("q.QueueItemId < :after", "after"),
+        ("q.QueueName = :queue", "queue"),
+        ("q.Status = :status", "status"),
+        ("q.CreatedAt >= :since", "since"),
+        ("q.CreatedAt < :until", "until"),
+    ) if params[key] is not None]
+
+    _require_engine()
     with engine.connect() as conn:
-        rows = conn.execute(text("""
-            SELECT TOP 200
+        # TOP on SQL Server; LIMIT on the SQLite stand-in used by the tests.
+        top, tail = ("TOP (:limit) ", "") if conn.dialect.name == "mssql" else ("", "LIMIT :limit")
+        rows = conn.execute(text(f"""
+            SELECT {top}
                 q.QueueItemId, q.IntakeId, q.QueueName, q.Status, q.Reason, q.CreatedAt,
                 i.DomainModule, i.Priority, i.Crisis
             FROM dbo.QueueItem q
             JOIN dbo.Intake i ON i.IntakeId = q.IntakeId
+            {"WHERE " + " AND ".join(where) if where else ""}
             ORDER BY q.QueueItemId DESC
-        """)).mappings().all()
-        return [dict(r) for r in rows]
+            {tail}
+        """), params).mappings().all()
+
+    items = [dict(r) for r in rows[:limit]]
+    next_cursor = _encode_cursor(items[-1]["QueueItemId"]) if len(rows) > limit else None
+    return {"count": len(items), "items": items, "next_cursor": next_cursor}
 
 
 @router.get("/intakes/{intake_id}")
@@ -1,69 +1,132 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Tuple, Optional
-from sqlalchemy import text
+import threading
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Connection
 
+from . import outbox
 
-def evaluate_rules_and_enqueue(conn: Connection, intake_id: int) -> Tuple[str, Optional[str], List[Dict[str, Any]]]:
+try:
+    # Optional: pyahocorasick gives a C multi-pattern automaton for
+    # "contains" clauses. Without it, each field is lowercased once per intake
+    # and needles are checked against that.
+    import ahocorasick  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    ahocorasick = None
+
+
+Decision = Tuple[str, Optional[str], List[Dict[str, Any]]]
+
+_SELECT_INTAKE_COLUMNS = "SELECT IntakeId, DomainModule, Priority, Crisis, Narrative, AttributesJson FROM dbo.Intake"
+
+_INSERT_RULE_RESULT = text("""
+    INSERT INTO dbo.RuleResult (IntakeId, RuleId, Action, OutcomeJson)
+    VALUES (:IntakeId, :RuleId, :Action, :OutcomeJson)
+""")
+
+_INSERT_QUEUE_ITEM = text("""
+    INSERT INTO dbo.QueueItem (IntakeId, QueueName, Status, Reason)
+    VALUES (:IntakeId, :QueueName, 'Open', :Reason)
+""")
+
+# SQL Server caps a statement at 2100 parameters.
+_BATCH_SELECT_SIZE = 1000
+
+
+def evaluate_rules_and_enqueue(conn: Connection, intake_id: int) -> Decision:
     """
     Loads intake + enabled rules from DB, evaluates them, writes RuleResult,
     and enqueues to QueueItem with final queue decision.
     """
     intake = conn.execute(
-        text("""
-            SELECT IntakeId, DomainModule, Priority, Crisis, Narrative, AttributesJson
-            FROM dbo.Intake
-            WHERE IntakeId = :id
-        """),
+        text(_SELECT_INTAKE_COLUMNS + " WHERE IntakeId = :id"),
         {"id": intake_id},
     ).mappings().first()
 
     if not intake:
         raise RuntimeError("Intake not found for evaluation")
 
-    attrs = _loads_json(intake.get("AttributesJson"))
+    # Enabled rules come pre-compiled from the cache; the Rule table is only
+    # read again after the rule-set version stamp changes.
+    rule_results: List[Dict[str, Any]] = []
+    queue_items: List[Dict[str, Any]] = []
+    decision = _evaluate(rule_cache.get(conn), intake, rule_results, queue_items)
+    _write_results(conn, rule_results, queue_items)
+    return decision
+
+
+def evaluate_rules_and_enqueue_many(conn: Connection, intake_ids: Sequence[int]) -> List[Decision]:
+    """
+    Batch form of evaluate_rules_and_enqueue for backfills and bulk imports.
+    Loads all intakes with IN-list SELECTs, evaluates them in memory and writes
+    every RuleResult/QueueItem row with one executemany per table.
+    Returns (queue, reason, applied) per intake id, in input order.
+    """
+    ids = [int(i) for i in intake_ids]
+    if not ids:
+        return []
+
+    intakes: Dict[int, Mapping[str, Any]] = {}
+    unique_ids = list(dict.fromkeys(ids))
+    stmt = text(_SELECT_INTAKE_COLUMNS + " WHERE IntakeId IN :ids").bindparams(bindparam("ids", expanding=True))
+    for i in range(0, len(unique_ids), _BATCH_SELECT_SIZE):
+        chunk = unique_ids[i:i + _BATCH_SELECT_SIZE]
+        for row in conn.execute(stmt, {"ids": chunk}).mappings():
+            intakes[int(row["IntakeId"])] = row
+
+    missing = [i for i in unique_ids if i not in intakes]
+    if missing:
+        raise RuntimeError(f"Intake not found for evaluation: {missing[:10]}")
+
+    rules = rule_cache.get(conn)
+    rule_results: List[Dict[str, Any]] = []
+    queue_items: List[Dict[str, Any]] = []
+    decisions = [_evaluate(rules, intakes[i], rule_results, queue_items) for i in ids]
+    _write_results(conn, rule_results, queue_items)
+    return decisions
 
-    # Fetch enabled rules
-    rules = conn.execute(
-        text("""
-            SELECT RuleId, RuleName, MatchJson, Action, ActionParamsJson, PriorityOrder
-            FROM dbo.Rule
-            WHERE IsEnabled = 1
-            ORDER BY PriorityOrder ASC, RuleId ASC
-        """)
-    ).mappings().all()
+
+def _evaluate(
+    rules: "RuleSet",
+    intake: Mapping[str, Any],
+    rule_results: List[Dict[str, Any]],
+    queue_items: List[Dict[str, Any]],
+) -> Decision:
+    """
+    Evaluate one intake against the cached rule set. RuleResult and QueueItem
+    rows are appended to the given lists for the caller to write.
+    """
+    intake_id = int(intake["IntakeId"])
+    attrs = _loads_json(intake.get("AttributesJson"))
 
     applied: List[Dict[str, Any]] = []
     final_queue = "General"
     final_reason: Optional[str] = None
 
-    # Evaluate in order; first matching rule(s) can set queue / reason.
-    for rule in rules:
-        match = _loads_json(rule["MatchJson"])
-        if _matches(match, intake, attrs):
-            outcome = _apply_action(intake, attrs, rule["Action"], _loads_json(rule.get("ActionParamsJson")))
-
-            # Persist rule result
-            conn.execute(
-                text("""
-                    INSERT INTO dbo.RuleResult (IntakeId, RuleId, Action, OutcomeJson)
-                    VALUES (:IntakeId, :RuleId, :Action, :OutcomeJson)
-                """),
+    # Evaluate in order; first matching rule(s) can set queue / reason. The
+    # discrimination index narrows the set to rules that could match, and
+    # the scan answers all "contains" clauses from one pass per text field.
+    scan = rules.new_scan()
+    for rule in rules.candidates(intake):
+        if rule.matches(intake, attrs, scan):
+            outcome = rule.apply(intake, attrs)
+
+            rule_results.append(
                 {
                     "IntakeId": intake_id,
-                    "RuleId": rule["RuleId"],
-                    "Action": rule["Action"],
+                    "RuleId": rule.rule_id,
+                    "Action": rule.action,
                     "OutcomeJson": json.dumps(outcome, ensure_ascii=False, separators=(",", ":")),
-                },
+                }
             )
 
             applied.append(
                 {
-                    "rule_id": int(rule["RuleId"]),
-                    "rule_name": rule["RuleName"],
-                    "action": rule["Action"],
+                    "rule_id": rule.rule_id,
+                    "rule_name": rule.rule_name,
+                    "action": rule.action,
                     "outcome": outcome,
                 }
             )
@@ -74,18 +137,23 @@ def evaluate_rules_and_enqueue(conn: Connection, intake_id: int) -> Tuple[str, O
             if "reason" in outcome and outcome["reason"]:
                 final_reason = outcome["reason"]
 
-    # Enqueue
-    conn.execute(
-        text("""
-            INSERT INTO dbo.QueueItem (IntakeId, QueueName, Status, Reason)
-            VALUES (:IntakeId, :QueueName, 'Open', :Reason)
-        """),
-        {"IntakeId": intake_id, "QueueName": final_queue, "Reason": final_reason},
-    )
-
+    queue_items.append({"IntakeId": intake_id, "QueueName": final_queue, "Reason": final_reason})
     return final_queue, final_reason, applied
 
 
+def _write_results(conn: Connection, rule_results: List[Dict[str, Any]], queue_items: List[Dict[str, Any]]) -> None:
+    # A list of parameter sets runs as a single executemany. In outbox mode
+    # the audit rows become one outbox row per intake, moved to RuleResult
+    # later by outbox.writer.
+    if rule_results:
+        if outbox.ENABLED:
+            outbox.stage(conn, rule_results)
+        else:
+            conn.execute(_INSERT_RULE_RESULT, rule_results)
+    if queue_items:
+        conn.execute(_INSERT_QUEUE_ITEM, queue_items)
+
+
 def _apply_action(intake: Dict[str, Any], attrs: Dict[str, Any], action: str, params: Dict[str, Any]) -> Dict[str, Any]:
     action = (action or "").lower().strip()
     params = params or {}
@@ -172,3 +240,369 @@ def _loads_json(val: Any) -> Dict[str, Any]:
         return json.loads(val)
     except Exception:
         return {}
+
+
+# -----------------------
+# Compiled rule cache
+# -----------------------
+# (intake, attrs, scan=None) -> bool; scan is the intake's TextScan, if any.
+Predicate = Callable[..., bool]
+ActionFn = Callable[[Mapping[str, Any], Mapping[str, Any]], Dict[str, Any]]
+
+
+class CompiledRule(NamedTuple):
+    rule_id: int
+    rule_name: str
+    action: str
+    matches: Predicate
+    apply: ActionFn
+    # (field, values) of the equality clause used to index this rule, or None
+    # if it has to be checked against every intake.
+    index_key: Optional[Tuple[str, Tuple[Any, ...]]] = None
+    # ("field"|"attr", name, lowercased needle) for each "contains" clause.
+    needles: Tuple[Tuple[str, str, str], ...] = ()
+
+
+class TextScan:
+    """
+    Per-intake memo for "contains" clauses. The first clause on a field scans
+    it once: with an automaton the result is the set of needles found,
+    otherwise the lowercased text itself. Either way `needle in found` is
+    the answer for every later clause on that field.
+    """
+
+    __slots__ = ("_automata", "_found")
+
+    def __init__(self, automata: Mapping[Tuple[str, str], Any]) -> None:
+        self._automata = automata
+        self._found: Dict[Tuple[str, str], Any] = {}
+
+    def contains(self, source: str, key: str, actual: Any, needle: str) -> bool:
+        found = self._found.get((source, key))
+        if found is None:
+            lowered = str(actual).lower()
+            automaton = self._automata.get((source, key))
+            if automaton is not None:
+                found = {n for _, n in automaton.iter(lowered)}
+            else:
+                found = lowered
+            self._found[(source, key)] = found
+        return needle in found
+
+
+def _build_automata(needles) -> Dict[Tuple[str, str], Any]:
+    """One Aho-Corasick automaton per scanned field/attr (needs pyahocorasick)."""
+    if ahocorasick is None:
+        return {}
+    by_source: Dict[Tuple[str, str], set] = {}
+    for source, key, needle in needles:
+        by_source.setdefault((source, key), set()).add(needle)
+
+    automata = {}
+    for source_key, words in by_source.items():
+        automaton = ahocorasick.Automaton()
+        for w in words:
+            automaton.add_word(w, w)
+        automaton.make_automaton()
+        automata[source_key] = automaton
+    return automata
+
+
+# Intake fields preferred as index keys, most selective first. Any other
+# field eq/in clause is used when none of these is present.
+INDEX_FIELDS = ("DomainModule", "Priority", "Crisis")
+
+
+class RuleSet:
+    """
+    Enabled rules in evaluation order (PriorityOrder, RuleId) plus a
+    discrimination index on field eq/in clauses. A rule whose index clause
+    can't hold for an intake can't match it either, so candidates() skips it
+    without changing order or first-match semantics.
+    """
+
+    def __init__(self, rules: Sequence[CompiledRule]) -> None:
+        self.rules: Tuple[CompiledRule, ...] = tuple(rules)
+        self._unindexed: List[int] = []
+        self._index: Dict[str, Dict[Any, List[int]]] = {}
+        self._automata = _build_automata(n for rule in self.rules for n in rule.needles)
+
+        for pos, rule in enumerate(self.rules):
+            if rule.index_key is None:
+                self._unindexed.append(pos)
+                continue
+            field, values = rule.index_key
+            buckets = self._index.setdefault(field, {})
+            for v in set(values):
+                buckets.setdefault(v, []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def new_scan(self) -> TextScan:
+        return TextScan(self._automata)
+
+    def candidates(self, intake: Mapping[str, Any]) -> List[CompiledRule]:
+        if not self._index:
+            return list(self.rules)
+
+        positions = list(self._unindexed)
+        for field, buckets in self._index.items():
+            try:
+                hit = buckets.get(intake.get(field))
+            except TypeError:
+                # Unhashable value: it can't equal any hashable index key.
+                continue
+            if hit:
+                positions.extend(hit)
+
+        positions.sort()
+        rules = self.rules
+        return [rules[p] for p in positions]
+
+
+class RuleCache:
+    """
+    Process-wide cache of enabled rules, compiled once into ready-to-run
+    predicates/actions. Invalidated by dbo.RuleSetVersion, which a trigger on
+    dbo.Rule bumps on every insert/update/delete (see sql/schema.sql).
+    If the stamp is unavailable, rules are reloaded on every call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._rules = RuleSet(())
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def get(self, conn: Connection) -> RuleSet:
+        version = _read_rule_version(conn)
+        if version is not None and version == self._version:
+            return self._rules
+
+        with self._lock:
+            if version is None or version != self._version:
+                rows = conn.execute(
+                    text("""
+                        SELECT RuleId, RuleName, MatchJson, Action, ActionParamsJson, PriorityOrder
+                        FROM dbo.Rule
+                        WHERE IsEnabled = 1
+                        ORDER BY PriorityOrder ASC, RuleId ASC
+                    """)
+                ).mappings().all()
+                self._rules = RuleSet([compile_rule(r) for r in rows])
+                self._version = version
+            return self._rules
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+            self._rules = RuleSet(())
+
+
+rule_cache = RuleCache()
+
+
+def _read_rule_version(conn: Connection) -> Optional[int]:
+    v = conn.execute(text("SELECT Version FROM dbo.RuleSetVersion WHERE Id = 1")).scalar()
+    return int(v) if v is not None else None
+
+
+def compile_rule(rule: Mapping[str, Any]) -> CompiledRule:
+    """
+    Compile a dbo.Rule row into a CompiledRule. Semantics match
+    _matches/_eval_clause/_apply_action exactly.
+    """
+    match = _loads_json(rule["MatchJson"])
+    return CompiledRule(
+        rule_id=int(rule["RuleId"]),
+        rule_name=rule["RuleName"],
+        action=rule["Action"],
+        matches=_compile_match(match),
+        apply=_compile_action(rule["Action"], _loads_json(rule.get("ActionParamsJson"))),
+        index_key=_index_key(match),
+        needles=_contains_needles(match),
+    )
+
+
+def _contains_needles(match: Any) -> Tuple[Tuple[str, str, str], ...]:
+    if not match or not isinstance(match, dict):
+        return ()
+    needles = []
+    for c in match.get("all") or []:
+        if not isinstance(c, dict) or (c.get("op") or "eq").lower() != "contains":
+            continue
+        source = "field" if "field" in c else "attr" if "attr" in c else None
+        needle = str(c.get("value")).lower()
+        if source and isinstance(c[source], str) and needle:
+            needles.append((source, c[source], needle))
+    return tuple(needles)
+
+
+def _index_key(match: Any) -> Optional[Tuple[str, Tuple[Any, ...]]]:
+    """
+    Pick the clause to index a rule on: a field 'eq' (one value) or 'in'
+    (list of values) clause, preferring INDEX_FIELDS in order. Clauses with
+    unhashable values are not indexable.
+    """
+    if not match or not isinstance(match, dict):
+        return None
+
+    keys: Dict[str, Tuple[Any, ...]] = {}
+    for c in match.get("all") or []:
+        if not isinstance(c, dict) or not isinstance(c.get("field"), str):
+            continue
+        op = (c.get("op") or "eq").lower()
+        value = c.get("value")
+        if op == "eq":
+            values: Tuple[Any, ...] = (value,)
+        elif op == "in" and isinstance(value, (list, tuple)):
+            values = tuple(value)
+        else:
+            continue
+        try:
+            hash(values)
+        except TypeError:
+            continue
+        keys.setdefault(c["field"], values)
+
+    for field in INDEX_FIELDS:
+        if field in keys:
+            return field, keys[field]
+    for field, values in keys.items():
+        return field, values
+    return None
+
+
+def _never(intake: Mapping[str, Any], attrs: Mapping[str, Any], scan: Optional[TextScan] = None) -> bool:
+    return False
+
+
+def _always(intake: Mapping[str, Any], attrs: Mapping[str, Any], scan: Optional[TextScan] = None) -> bool:
+    return True
+
+
+def _compile_match(match: Any) -> Predicate:
+    if not match or not isinstance(match, dict):
+        return _never
+
+    clauses = tuple(_compile_clause(c) for c in (match.get("all") or []))
+    if not clauses:
+        return _always
+    if len(clauses) == 1:
+        return clauses[0]
+
+    def predicate(intake: Mapping[str, Any], attrs: Mapping[str, Any], scan: Optional[TextScan] = None) -> bool:
+        for c in clauses:
+            if not c(intake, attrs, scan):
+                return False
+        return True
+
+    return predicate
+
+
+def _compile_clause(clause: Dict[str, Any]) -> Predicate:
+    op = (clause.get("op") or "eq").lower()
+    if op == "contains" and ("field" in clause or "attr" in clause):
+        return _compile_contains(clause)
+
+    test = _compile_op(op, clause.get("value"))
+    if test is None:
+        return _never
+
+    if "field" in clause:
+        field = clause["field"]
+
+        def field_clause(intake: Mapping[str, Any], attrs: Mapping[str, Any], scan: Optional[TextScan] = None) -> bool:
+            try:
+                return test(intake.get(field))
+            except Exception:
+                return False
+
+        return field_clause
+
+    if "attr" in clause:
+        attr = clause["attr"]
+
+        def attr_clause(intake: Mapping[str, Any], attrs: Mapping[str, Any], scan: Optional[TextScan] = None) -> bool:
+            try:
+                return test(attrs.get(attr))
+            except Exception:
+                return False
+
+        return attr_clause
+
+    return _never
+
+
+def _compile_contains(clause: Dict[str, Any]) -> Predicate:
+    source = "field" if "field" in clause else "attr"
+    key = clause[source]
+    from_field = source == "field"
+    needle = str(clause.get("value")).lower()
+
+    def contains_clause(intake: Mapping[str, Any], attrs: Mapping[str, Any], scan: Optional[TextScan] = None) -> bool:
+        actual = intake.get(key) if from_field else attrs.get(key)
+        if actual is None:
+            return False
+        if not needle:
+            return True
+        try:
+            if scan is not None:
+                return scan.contains(source, key, actual, needle)
+            return needle in str(actual).lower()
+        except Exception:
+            return False
+
+    return contains_clause
+
+
+def _compile_op(op: str, expected: Any) -> Optional[Callable[[Any], bool]]:
+    if op == "eq":
+        return lambda actual: actual == expected
+    if op == "neq":
+        return lambda actual: actual != expected
+    if op == "lt":
+        return lambda actual: actual < expected
+    if op == "lte":
+        return lambda actual: actual <= expected
+    if op == "gt":
+        return lambda actual: actual > expected
+    if op == "gte":
+        return lambda actual: actual >= expected
+    if op == "in":
+        values = expected or []
+        try:
+            lookup = frozenset(values) if isinstance(values, (list, tuple)) else None
+        except TypeError:
+            lookup = None
+        if lookup is None:
+            return lambda actual: actual in values
+
+        def in_op(actual: Any) -> bool:
+            try:
+                return actual in lookup
+            except TypeError:
+                return actual in values
+
+        return in_op
+    return None
+
+
+def _compile_action(action: str, params: Dict[str, Any]) -> ActionFn:
+    action = (action or "").lower().strip()
+    params = params or {}
+
+    if action == "set_priority" and "priority" not in params:
+        return lambda intake, attrs: {"priority": intake.get("Priority", "Normal")}
+
+    # Every other outcome is independent of the intake: build it once and
+    # hand out copies so callers can't mutate the cached value.
+    outcome = _apply_action({}, {}, action, params)
+    return lambda intake, attrs: dict(outcome)
@@ -0,0 +1,88 @@
+"""
+Rule discrimination index benchmark.
+
+Times in-memory evaluation of one intake against rule books of 10..10k rules,
+with and without the index. Rule books grow the way ours do: more domains and
+sub-programs, each with a handful of rules, plus a few catch-all rules.
+
+Run from the repo root:
+    python -m benchmarks.bench_rule_index
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from api.rules_engine import RuleSet, compile_rule
+
+RULES_PER_DOMAIN = 5
+CATCH_ALL_RULES = 5
+
+
+def make_rules(n: int, seed: int = 1) -> List[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    domains = max(1, n // RULES_PER_DOMAIN)
+    rows = []
+    for i in range(n):
+        if i < CATCH_ALL_RULES:
+            clauses = [{"attr": "risk_days", "op": "lte", "value": rnd.randint(1, 14)}]
+        else:
+            clauses = [
+                {"field": "DomainModule", "op": "eq", "value": f"Domain{rnd.randrange(domains)}"},
+                {"field": "Crisis", "op": "eq", "value": rnd.random() < 0.3},
+                {"attr": "risk_days", "op": "lte", "value": rnd.randint(1, 14)},
+            ]
+        rows.append(
+            {
+                "RuleId": i + 1,
+                "RuleName": f"rule-{i + 1}",
+                "MatchJson": json.dumps({"all": clauses}),
+                "Action": "set_queue",
+                "ActionParamsJson": json.dumps({"queue": f"Q{i % 17}"}),
+            }
+        )
+    return rows
+
+
+def time_eval(rules: RuleSet, intakes: List[Dict[str, Any]], indexed: bool) -> float:
+    start = time.perf_counter()
+    for intake in intakes:
+        attrs = intake["_attrs"]
+        candidates = rules.candidates(intake) if indexed else rules.rules
+        for rule in candidates:
+            if rule.matches(intake, attrs):
+                rule.apply(intake, attrs)
+    return (time.perf_counter() - start) / len(intakes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--intakes", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'rules':>8} {'linear us':>12} {'indexed us':>12} {'candidates':>11}")
+    for n in [int(x) for x in args.sizes.split(",")]:
+        rules = RuleSet([compile_rule(r) for r in make_rules(n)])
+        rnd = random.Random(n)
+        domains = max(1, n // RULES_PER_DOMAIN)
+        intakes = [
+            {
+                "DomainModule": f"Domain{rnd.randrange(domains)}",
+                "Crisis": rnd.random() < 0.3,
+                "Priority": "Normal",
+                "_attrs": {"risk_days": rnd.randint(0, 30)},
+            }
+            for _ in range(args.intakes)
+        ]
+        linear = time_eval(rules, intakes, indexed=False)
+        indexed = time_eval(rules, intakes, indexed=True)
+        avg_candidates = sum(len(rules.candidates(i)) for i in intakes) / len(intakes)
+        print(f"{n:>8} {linear * 1e6:>12.1f} {indexed * 1e6:>12.1f} {avg_candidates:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Rules-engine microbenchmark suite.
+
+Measures, on synthetic rule books and intakes (benchmarks/synthetic.py):
+  - micro: _eval_clause, _matches, _apply_action and the compiled equivalents
+  - memory: whole-intake evaluation against the cached RuleSet, no DB
+  - sqlite: evaluate_rules_and_enqueue / evaluate_rules_and_enqueue_many
+            against a temporary on-disk SQLite database
+
+Results are written as JSON so runs can be compared across versions:
+
+    python -m benchmarks.bench_rules --rules 500 --intakes 2000 --out before.json
+    ... change code ...
+    python -m benchmarks.bench_rules --rules 500 --intakes 2000 --out after.json --compare before.json
+
+With --compare, the run exits non-zero if any latency metric regressed by
+more than --threshold (default 20%).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List
+
+from api import rules_engine
+from api.rules_engine import (
+    RuleSet,
+    _apply_action,
+    _eval_clause,
+    _evaluate,
+    _loads_json,
+    _matches,
+    compile_rule,
+    evaluate_rules_and_enqueue,
+    evaluate_rules_and_enqueue_many,
+    rule_cache,
+)
+
+from .synthetic import load_sqlite, make_intakes, make_rules, sqlite_engine
+
+
+def _stats(samples_ns: List[int], items: int) -> Dict[str, float]:
+    """Latency percentiles in microseconds plus throughput (items/s)."""
+    samples = sorted(samples_ns)
+    total_s = sum(samples) / 1e9
+
+    def pct(p: float) -> float:
+        return samples[min(len(samples) - 1, int(p * len(samples)))] / 1e3
+
+    return {
+        "n": len(samples),
+        "mean_us": statistics.fmean(samples) / 1e3,
+        "p50_us": pct(0.50),
+        "p95_us": pct(0.95),
+        "p99_us": pct(0.99),
+        "max_us": samples[-1] / 1e3,
+        "throughput_per_s": items / total_s if total_s else 0.0,
+    }
+
+
+def _time_each(fn: Callable[[Any], Any], items: Iterable[Any]) -> Dict[str, float]:
+    clock = time.perf_counter_ns
+    samples = []
+    for item in items:
+        start = clock()
+        fn(item)
+        samples.append(clock() - start)
+    return _stats(samples, len(samples))
+
+
+def bench_micro(rules: List[Dict[str, Any]], intakes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    parsed = [(_loads_json(r["MatchJson"]), r["Action"], _loads_json(r["ActionParamsJson"])) for r in rules]
+    compiled = [compile_rule(r) for r in rules]
+    pairs = [(i, _loads_json(i["AttributesJson"])) for i in intakes[:200]]
+
+    clause_items = [(c, i, a) for m, _, _ in parsed for c in m["all"] for i, a in pairs[:20]]
+    match_items = [(m, i, a) for m, _, _ in parsed for i, a in pairs[:20]]
+    compiled_items = [(r, i, a) for r in compiled for i, a in pairs[:20]]
+    action_items = [(act, p, i, a) for _, act, p in parsed for i, a in pairs[:5]]
+
+    return {
+        "eval_clause": _time_each(lambda x: _eval_clause(*x), clause_items),
+        "matches": _time_each(lambda x: _matches(*x), match_items),
+        "compiled_matches": _time_each(lambda x: x[0].matches(x[1], x[2]), compiled_items),
+        "apply_action": _time_each(lambda x: _apply_action(x[2], x[3], x[0], x[1]), action_items),
+    }
+
+
+def bench_memory(rules: List[Dict[str, Any]], intakes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    start = time.perf_counter_ns()
+    rule_set = RuleSet([compile_rule(r) for r in rules])
+    compile_us = (time.perf_counter_ns() - start) / 1e3
+
+    def interpreted(intake: Dict[str, Any]) -> None:
+        # Pre-cache evaluation: parse every rule's JSON and walk them all.
+        attrs = _loads_json(intake["AttributesJson"])
+        for r in rules:
+            if _matches(_loads_json(r["MatchJson"]), intake, attrs):
+                _apply_action(intake, attrs, r["Action"], _loads_json(r["ActionParamsJson"]))
+
+    return {
+        "compile_us": compile_us,
+        "interpreted": _time_each(interpreted, intakes),
+        "evaluate": _time_each(lambda i: _evaluate(rule_set, i, [], []), intakes),
+    }
+
+
+def bench_sqlite(rules: List[Dict[str, Any]], intakes: List[Dict[str, Any]], batch_size: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="rules-bench-") as tmp:
+        engine = sqlite_engine(os.path.join(tmp, "dbo.db"))
+        try:
+            load_sqlite(engine, rules, intakes)
+            ids = [i["IntakeId"] for i in intakes]
+            rule_cache.invalidate()
+
+            with engine.begin() as conn:
+                results["evaluate_rules_and_enqueue"] = _time_each(
+                    lambda intake_id: evaluate_rules_and_enqueue(conn, intake_id), ids
+                )
+
+            batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+            samples = []
+            for batch in batches:
+                start = time.perf_counter_ns()
+                with engine.begin() as conn:
+                    evaluate_rules_and_enqueue_many(conn, batch)
+                samples.append(time.perf_counter_ns() - start)
+            many = _stats(samples, len(ids))
+            many["batch_size"] = batch_size
+            results["evaluate_rules_and_enqueue_many"] = many
+        finally:
+            rule_cache.invalidate()
+            engine.dispose()
+    return results
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def _latency_metrics(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for k, v in results.items():
+        if isinstance(v, dict):
+            out.update(_latency_metrics(v, f"{prefix}{k}."))
+        elif k in ("mean_us", "p50_us", "p95_us", "p99_us"):
+            out[prefix + k] = float(v)
+    return out
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return the latency metrics that got slower than baseline by > threshold."""
+    cur = _latency_metrics(current["results"])
+    base = _latency_metrics(baseline["results"])
+    regressions = []
+    for k in sorted(cur.keys() & base.keys()):
+        if base[k] > 0 and (cur[k] - base[k]) / base[k] > threshold:
+            regressions.append(f"{k}: {base[k]:.1f}us -> {cur[k]:.1f}us")
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=200, help="rule book size")
+    parser.add_argument("--intakes", type=int, default=1000)
+    parser.add_argument("--clauses", type=int, default=3, help="max clauses per rule")
+    parser.add_argument("--narrative-chars", type=int, default=2000, help="mean narrative length")
+    parser.add_argument("--attrs", type=int, default=5, help="attributes per intake")
+    parser.add_argument("--batch-size", type=int, default=200, help="evaluate_rules_and_enqueue_many batch")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--suites", default="micro,memory,sqlite")
+    parser.add_argument("--out", help="write JSON results here")
+    parser.add_argument("--compare", help="baseline JSON from a previous run")
+    parser.add_argument("--threshold", type=float, default=0.20)
+    args = parser.parse_args(argv)
+
+    rules = make_rules(args.rules, seed=args.seed, clauses_per_rule=args.clauses)
+    intakes = make_intakes(args.intakes, seed=args.seed + 1, narrative_chars=args.narrative_chars, attr_count=args.attrs)
+
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    results: Dict[str, Any] = {}
+    if "micro" in suites:
+        results["micro"] = bench_micro(rules, intakes)
+    if "memory" in suites:
+        results["memory"] = bench_memory(rules, intakes)
+    if "sqlite" in suites:
+        results["sqlite"] = bench_sqlite(rules, intakes, args.batch_size)
+
+    report = {
+        "benchmark": "rules_engine",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "aho_corasick": rules_engine.ahocorasick is not None,
+        "params": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "threshold")},
+        "results": results,
+    }
+
+    for name, value in sorted(_latency_metrics(results).items()):
+        if name.endswith("p50_us") or name.endswith("p99_us"):
+            print(f"{name:<55} {value:>12.2f}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Synthetic rule books and intakes for the rules-engine benchmarks.
+
+Rows have the same shape as dbo.Rule / dbo.Intake, so they can be compiled
+in memory or inserted into a temporary SQLite database (sql/schema.sqlite.sql).
+Everything is driven by a seed, so two runs with the same arguments see the
+same data.
+"""
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+DOMAINS = ["Housing", "Food", "Utilities", "Health", "Childcare", "Transportation", "Employment", "Legal"]
+PRIORITIES = ["Low", "Normal", "High", "Critical"]
+CHANNELS = ["phone", "web", "chat", "walkin"]
+KEYWORDS = [
+    "eviction", "shutoff", "domestic", "landlord", "homeless", "insulin", "overdue",
+    "disconnect", "shelter", "unsafe", "foreclosure", "pantry", "diapers", "bus pass",
+]
+FILLER = (
+    "caller reports family needs help with rent this month and has been "
+    "calling agencies since monday about the notice received from the office "
+    "kids are at school during the day and partner works nights"
+).split()
+ATTR_NAMES = ["risk_days", "household_size", "zip", "income", "minors", "language", "veteran", "age"]
+
+# Clause kinds and their share of a rule book, roughly matching ours.
+OP_MIX = [
+    ("domain_eq", 0.30),
+    ("crisis_eq", 0.10),
+    ("priority_in", 0.10),
+    ("narrative_contains", 0.20),
+    ("attr_range", 0.15),
+    ("attr_eq", 0.05),
+    ("attr_in", 0.05),
+    ("channel_neq", 0.05),
+]
+ACTION_MIX = [("set_queue", 0.8), ("set_priority", 0.1), ("flag_crisis", 0.1)]
+
+
+def _pick(rnd: random.Random, mix) -> str:
+    return rnd.choices([k for k, _ in mix], weights=[w for _, w in mix])[0]
+
+
+def make_clause(rnd: random.Random, kind: str) -> Dict[str, Any]:
+    if kind == "domain_eq":
+        return {"field": "DomainModule", "op": "eq", "value": rnd.choice(DOMAINS)}
+    if kind == "crisis_eq":
+        return {"field": "Crisis", "op": "eq", "value": rnd.random() < 0.7}
+    if kind == "priority_in":
+        return {"field": "Priority", "op": "in", "value": rnd.sample(PRIORITIES, 2)}
+    if kind == "narrative_contains":
+        return {"field": "Narrative", "op": "contains", "value": rnd.choice(KEYWORDS)}
+    if kind == "attr_range":
+        return {"attr": "risk_days", "op": rnd.choice(["lt", "lte", "gt", "gte"]), "value": rnd.randint(1, 30)}
+    if kind == "attr_eq":
+        return {"attr": "veteran", "op": "eq", "value": True}
+    if kind == "attr_in":
+        return {"attr": "zip", "op": "in", "value": [str(96700 + rnd.randrange(100)) for _ in range(5)]}
+    return {"field": "Channel", "op": "neq", "value": rnd.choice(CHANNELS)}
+
+
+def make_rules(n: int, seed: int = 1, clauses_per_rule: int = 3) -> List[Dict[str, Any]]:
+    """n dbo.Rule-shaped rows with 1..clauses_per_rule clauses each."""
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        clauses = [make_clause(rnd, _pick(rnd, OP_MIX)) for _ in range(rnd.randint(1, clauses_per_rule))]
+        action = _pick(rnd, ACTION_MIX)
+        if action == "set_queue":
+            params: Dict[str, Any] = {"queue": f"{rnd.choice(DOMAINS)}Escalation", "reason": f"rule {i + 1}"}
+        elif action == "set_priority":
+            params = {"priority": rnd.choice(PRIORITIES)}
+        else:
+            params = {"reason": "Crisis keywords"}
+        rows.append(
+            {
+                "RuleId": i + 1,
+                "RuleName": f"synthetic-{i + 1}",
+                "IsEnabled": 1,
+                "PriorityOrder": rnd.randrange(1, 1000),
+                "MatchJson": json.dumps({"all": clauses}),
+                "Action": action,
+                "ActionParamsJson": json.dumps(params),
+            }
+        )
+    rows.sort(key=lambda r: (r["PriorityOrder"], r["RuleId"]))
+    return rows
+
+
+def make_narrative(rnd: random.Random, length: int) -> str:
+    words: List[str] = []
+    size = 0
+    while size < length:
+        w = rnd.choice(KEYWORDS) if rnd.random() < 0.02 else rnd.choice(FILLER)
+        if rnd.random() < 0.1:
+            w = w.capitalize()
+        words.append(w)
+        size += len(w) + 1
+    return " ".join(words)[:length]
+
+
+def make_intakes(n: int, seed: int = 2, narrative_chars: int = 2000, attr_count: int = 5) -> List[Dict[str, Any]]:
+    """n dbo.Intake-shaped rows (with IntakeId) carrying attr_count attributes."""
+    rnd = random.Random(seed)
+    names = (ATTR_NAMES * (attr_count // len(ATTR_NAMES) + 1))[:attr_count]
+    rows = []
+    for i in range(n):
+        attrs: Dict[str, Any] = {}
+        for j, name in enumerate(names):
+            key = name if j < len(ATTR_NAMES) else f"{name}_{j}"
+            if name in ("zip",):
+                attrs[key] = str(96700 + rnd.randrange(100))
+            elif name in ("veteran", "minors"):
+                attrs[key] = rnd.random() < 0.2
+            elif name == "language":
+                attrs[key] = rnd.choice(["en", "haw", "ilo", "tl"])
+            else:
+                attrs[key] = rnd.randint(0, 60)
+        rows.append(
+            {
+                "IntakeId": i + 1,
+                "CallerId": f"bench-{i + 1}",
+                "Channel": rnd.choice(CHANNELS),
+                "DomainModule": rnd.choice(DOMAINS),
+                "Priority": rnd.choice(PRIORITIES),
+                "Crisis": rnd.random() < 0.15,
+                "Narrative": make_narrative(rnd, rnd.randint(narrative_chars // 2, narrative_chars * 3 // 2)),
+                "AttributesJson": json.dumps(attrs),
+            }
+        )
+    return rows
+
+
+def sqlite_engine(path: str = ":memory:") -> Engine:
+    """SQLite engine with the dbo schema from sql/schema.sqlite.sql attached."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, future=True)
+
+    @event.listens_for(engine, "connect")
+    def _attach_dbo(dbapi_conn, _):
+        dbapi_conn.execute(f"ATTACH DATABASE '{path}' AS dbo")
+
+    ddl = (Path(__file__).resolve().parents[1] / "sql" / "schema.sqlite.sql").read_text(encoding="utf-8")
+    with engine.begin() as conn:
+        for stmt in ddl.split(";\n\n"):
+            lines = [l for l in stmt.strip().splitlines() if not l.startswith("--")]
+            if lines:
+                conn.exec_driver_sql("\n".join(lines).rstrip(";") + ";")
+    return engine
+
+
+def load_sqlite(engine: Engine, rules: List[Dict[str, Any]], intakes: List[Dict[str, Any]]) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO dbo.Rule (RuleId, RuleName, IsEnabled, PriorityOrder, MatchJson, Action, ActionParamsJson)
+                VALUES (:RuleId, :RuleName, :IsEnabled, :PriorityOrder, :MatchJson, :Action, :ActionParamsJson)
+            """),
+            rules,
+        )
+        conn.execute(
+            text("""
+                INSERT INTO dbo.Intake (IntakeId, CallerId, Channel, DomainModule, Priority, Crisis, Narrative, AttributesJson)
+                VALUES (:IntakeId, :CallerId, :Channel, :DomainModule, :Priority, :Crisis, :Narrative, :AttributesJson)
+            """),
+            intakes,
+        )
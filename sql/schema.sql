@@ -2,13 +2,15 @@
 -- Run in your Azure SQL DB
 
 IF OBJECT_ID('dbo.QueueItem', 'U') IS NOT NULL DROP TABLE dbo.QueueItem;
+IF OBJECT_ID('dbo.RuleResultOutbox', 'U') IS NOT NULL DROP TABLE dbo.RuleResultOutbox;
 IF OBJECT_ID('dbo.RuleResult', 'U') IS NOT NULL DROP TABLE dbo.RuleResult;
 IF OBJECT_ID('dbo.Rule', 'U') IS NOT NULL DROP TABLE dbo.Rule;
+IF OBJECT_ID('dbo.RuleSetVersion', 'U') IS NOT NULL DROP TABLE dbo.RuleSetVersion;
 IF OBJECT_ID('dbo.Intake', 'U') IS NOT NULL DROP TABLE dbo.Intake;
 GO
 
 CREATE TABLE dbo.Intake (
-    IntakeId        INT IDENTITY(1,1) PRIMARY KEY,
+    IntakeId        INT IDENTITY(1,1) CONSTRAINT PK_Intake PRIMARY KEY,
     CreatedAt       DATETIME2(7) NOT NULL DEFAULT SYSUTCDATETIME(),
     CallerId        NVARCHAR(100) NULL,
     Channel         NVARCHAR(50)  NOT NULL,
@@ -31,6 +33,29 @@ CREATE TABLE dbo.Rule (
 );
 GO
 
+-- Rule-set version stamp. The rules engine caches compiled rules and only
+-- reloads dbo.Rule when this value changes.
+CREATE TABLE dbo.RuleSetVersion (
+    Id          INT    NOT NULL PRIMARY KEY CHECK (Id = 1),
+    Version     BIGINT NOT NULL DEFAULT 1,
+    UpdatedAt   DATETIME2(7) NOT NULL DEFAULT SYSUTCDATETIME()
+);
+GO
+
+INSERT INTO dbo.RuleSetVersion (Id, Version) VALUES (1, 1);
+GO
+
+CREATE TRIGGER dbo.TR_Rule_BumpVersion ON dbo.Rule
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    UPDATE dbo.RuleSetVersion
+    SET Version = Version + 1, UpdatedAt = SYSUTCDATETIME()
+    WHERE Id = 1;
+END;
+GO
+
 CREATE TABLE dbo.RuleResult (
     RuleResultId   INT IDENTITY(1,1) PRIMARY KEY,
     EvaluatedAt    DATETIME2(7) NOT NULL DEFAULT SYSUTCDATETIME(),
@@ -43,6 +68,17 @@ CREATE TABLE dbo.RuleResult (
 );
 GO
 
+-- RuleResult outbox (RULE_RESULT_OUTBOX=1, see api/outbox.py): one row per
+-- evaluated intake, PayloadJson = [[RuleId, Action, OutcomeJson], ...].
+-- The outbox writer moves rows into dbo.RuleResult in batches.
+CREATE TABLE dbo.RuleResultOutbox (
+    OutboxId       BIGINT IDENTITY(1,1) PRIMARY KEY,
+    CreatedAt      DATETIME2(7) NOT NULL DEFAULT SYSUTCDATETIME(),
+    IntakeId       INT NOT NULL,
+    PayloadJson    NVARCHAR(MAX) NOT NULL
+);
+GO
+
 CREATE TABLE dbo.QueueItem (
     QueueItemId    INT IDENTITY(1,1) PRIMARY KEY,
     CreatedAt      DATETIME2(7) NOT NULL DEFAULT SYSUTCDATETIME(),
@@ -56,4 +92,18 @@ GO
 
 CREATE INDEX IX_Intake_CreatedAt ON dbo.Intake(CreatedAt DESC);
 CREATE INDEX IX_QueueItem_QueueName ON dbo.QueueItem(QueueName, Status, CreatedAt DESC);
+-- Keyset paging of GET /queues (newest QueueItemId first) and latest-queue lookups
+CREATE INDEX IX_QueueItem_Queue_Id ON dbo.QueueItem(QueueName, QueueItemId DESC) INCLUDE (IntakeId, Status, Reason, CreatedAt);
+CREATE INDEX IX_QueueItem_Status_Id ON dbo.QueueItem(Status, QueueItemId DESC) INCLUDE (IntakeId, QueueName, Reason, CreatedAt);
+CREATE INDEX IX_QueueItem_Intake_Id ON dbo.QueueItem(IntakeId, QueueItemId DESC);
+CREATE INDEX IX_RuleResult_Intake_Id ON dbo.RuleResult(IntakeId, RuleResultId);
+GO
+
+-- Full-text search over intake narratives (CONTAINS / CONTAINSTABLE instead
+-- of LIKE '%...%' scans). CHANGE_TRACKING AUTO indexes new and edited
+-- narratives in the background. Full-text DDL can't run in a transaction.
+IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'ftIntake')
+    CREATE FULLTEXT CATALOG ftIntake;
+GO
+CREATE FULLTEXT INDEX ON dbo.Intake(Narrative) KEY INDEX PK_Intake ON ftIntake WITH CHANGE_TRACKING AUTO;
 GO
@@ -0,0 +1,74 @@
+-- SQLite stand-in for the dbo schema in schema.sql, used by tests and
+-- benchmarks. Attach a database as "dbo" first:
+--   ATTACH DATABASE ':memory:' AS dbo;
+-- Statements are separated by blank lines.
+
+CREATE TABLE dbo.Intake (
+    IntakeId        INTEGER PRIMARY KEY AUTOINCREMENT,
+    CreatedAt       TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CallerId        TEXT,
+    Channel         TEXT NOT NULL DEFAULT 'phone',
+    DomainModule    TEXT NOT NULL,
+    Priority        TEXT NOT NULL DEFAULT 'Normal',
+    Crisis          INTEGER NOT NULL DEFAULT 0,
+    Narrative       TEXT,
+    AttributesJson  TEXT
+);
+
+CREATE TABLE dbo.Rule (
+    RuleId            INTEGER PRIMARY KEY AUTOINCREMENT,
+    RuleName          TEXT NOT NULL,
+    IsEnabled         INTEGER NOT NULL DEFAULT 1,
+    PriorityOrder     INTEGER NOT NULL DEFAULT 100,
+    MatchJson         TEXT NOT NULL,
+    Action            TEXT NOT NULL,
+    ActionParamsJson  TEXT
+);
+
+CREATE TABLE dbo.RuleSetVersion (
+    Id          INTEGER PRIMARY KEY CHECK (Id = 1),
+    Version     INTEGER NOT NULL DEFAULT 1,
+    UpdatedAt   TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO dbo.RuleSetVersion (Id, Version) VALUES (1, 1);
+
+CREATE TRIGGER dbo.TR_Rule_Insert AFTER INSERT ON Rule
+BEGIN
+    UPDATE RuleSetVersion SET Version = Version + 1 WHERE Id = 1;
+END;
+
+CREATE TRIGGER dbo.TR_Rule_Update AFTER UPDATE ON Rule
+BEGIN
+    UPDATE RuleSetVersion SET Version = Version + 1 WHERE Id = 1;
+END;
+
+CREATE TRIGGER dbo.TR_Rule_Delete AFTER DELETE ON Rule
+BEGIN
+    UPDATE RuleSetVersion SET Version = Version + 1 WHERE Id = 1;
+END;
+
+CREATE TABLE dbo.RuleResult (
+    RuleResultId   INTEGER PRIMARY KEY AUTOINCREMENT,
+    EvaluatedAt    TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    IntakeId       INTEGER NOT NULL,
+    RuleId         INTEGER NOT NULL,
+    Action         TEXT NOT NULL,
+    OutcomeJson    TEXT
+);
+
+CREATE TABLE dbo.RuleResultOutbox (
+    OutboxId       INTEGER PRIMARY KEY AUTOINCREMENT,
+    CreatedAt      TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    IntakeId       INTEGER NOT NULL,
+    PayloadJson    TEXT NOT NULL
+);
+
+CREATE TABLE dbo.QueueItem (
+    QueueItemId    INTEGER PRIMARY KEY AUTOINCREMENT,
+    CreatedAt      TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    IntakeId       INTEGER NOT NULL,
+    QueueName      TEXT NOT NULL,
+    Status         TEXT NOT NULL DEFAULT 'Open',
+    Reason         TEXT
+);
@@ -1,13 +1,44 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 
+from . import db, metrics
+from .claims import router as claims_router
+from .exports import router as export_router
+from .feed import router as feed_router
+from .health import prober
+from .health import router as health_router
+from .idempotency import IDEMPOTENCY_HEADER, fingerprint
+from .idempotency import store as idempotency_store
+from .queue_stats import reconciler
+from .queue_stats import router as stats_router
 from .routes import router
+from .search import router as search_router
+from .routes_async import router as async_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if db.engine is not None:
+        reconciler.start()
+    prober.start()
+    yield
+    prober.stop()
+    reconciler.stop()
+
 
-app = FastAPI(title="Navigator 211 POC", version="0.1.0")
+app = FastAPI(title="Navigator 211 POC", version="0.1.0", lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(db.engine)
+metrics.instrument_engine(db.async_engine)
 
-from fastapi import Request
+
+from typing import Optional
+
+from fastapi import Header, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
@@ -44,10 +75,20 @@ class ClientIntakeRequest(BaseModel):
     consent: bool
 
 @app.post("/client/intake")
-def client_intake(req: ClientIntakeRequest):
+def client_intake(req: ClientIntakeRequest, idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)):
     if not req.consent:
         return JSONResponse({"error": "Consent required"}, status_code=400)
-    return {"case_id": "NAV-LOCAL-001", "status": "received"}
+
+    def work(record):
+        response = {"case_id": "NAV-LOCAL-001", "status": "received"}
+        if db.engine is not None and idempotency_key is not None:
+            with db.engine.begin() as conn:
+                record(conn, response)
+        return response
+
+    return idempotency_store.run(
+        db.engine, "POST /client/intake", idempotency_key, fingerprint(req.model_dump_json()), work
+    )
 
 
 # Optional: a tiny landing page so you can demo without Swagger
@@ -67,5 +108,15 @@ def home():
     </html>
     """
 
-# API routes
+# API routes (with DB_ASYNC, the async versions are registered first and win)
+app.include_router(health_router)
+app.include_router(metrics.router)
+app.include_router(feed_router)
+app.include_router(stats_router)
+# Before the /intakes/{intake_id} routes, which would otherwise claim "search".
+app.include_router(search_router)
+if db.async_engine is not None:
+    app.include_router(async_router)
 app.include_router(router)
+app.include_router(export_router)
+app.include_router(claims_router)
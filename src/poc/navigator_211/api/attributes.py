@@ -0,0 +1,142 @@
+"""
+IntakeAttribute: the top-level scalar members of each intake's
+AttributesJson, one row per (IntakeId, Name), written in the same
+transaction as the Intake row.
+
+TextValue holds the value as text (strings as-is, numbers as written,
+booleans as 'true'/'false'); NumValue holds JSON numbers. With
+IX_IntakeAttribute_Text / _Num (migration 6) the list endpoints filter on
+attributes with index seeks instead of parsing AttributesJson:
+
+    GET /intakes?attr.zip=96819&attr.risk_days.lte=7
+    GET /queues?attr.language.in=es,vi
+
+`attr.<name>=v` and `.eq` compare TextValue; lt/lte/gt/gte compare
+NumValue and need a number; `.in` takes a comma-separated list.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import text
+
+MAX_ATTR_FILTERS = 8
+MAX_IN_VALUES = 50
+
+_PREFIX = "attr."
+
+# Same extraction as migrations._FILL_INTAKE_ATTRIBUTE, for one intake.
+_INSERT_FROM_JSON = {
+    "sqlite": text(
+        """
+        INSERT INTO IntakeAttribute (IntakeId, Name, TextValue, NumValue)
+        SELECT :id, j.key,
+               CASE j.type WHEN 'true' THEN 'true' WHEN 'false' THEN 'false' ELSE CAST(j.value AS TEXT) END,
+               CASE WHEN j.type IN ('integer', 'real') THEN j.value END
+        FROM json_each(
+            CASE WHEN json_valid(:attributes) THEN
+                CASE WHEN json_type(:attributes) = 'object' THEN :attributes END
+            END) j
+        WHERE j.type IN ('text', 'integer', 'real', 'true', 'false')
+          AND length(j.key) <= 100 AND length(CAST(j.value AS TEXT)) <= 300
+        """
+    ),
+    "mssql": text(
+        """
+        INSERT INTO IntakeAttribute (IntakeId, Name, TextValue, NumValue)
+        SELECT :id, j.[key], j.[value], CASE WHEN j.[type] = 2 THEN TRY_CAST(j.[value] AS FLOAT) END
+        FROM OPENJSON(
+            CASE WHEN ISJSON(:attributes) = 1 AND LEFT(LTRIM(:attributes), 1) = '{'
+                 THEN :attributes END) j
+        WHERE j.[type] IN (1, 2, 3)
+          AND LEN(j.[key]) <= 100 AND LEN(j.[value]) <= 300
+        """
+    ),
+}
+
+_RANGE_OPS = {"lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
+
+
+class AttrFilter(NamedTuple):
+    name: str
+    op: str  # eq | in | lt | lte | gt | gte
+    values: tuple
+
+
+def insert_attributes_sql(dialect, attributes: Optional[Mapping[str, Any]]) -> Optional[Any]:
+    """Statement that indexes an intake's attributes, or None if there are none."""
+    if not attributes:
+        return None
+    return _INSERT_FROM_JSON["mssql" if dialect.name == "mssql" else "sqlite"]
+
+
+def insert_attributes(conn, intake_id: int, attributes: Optional[Mapping[str, Any]], attributes_json: str) -> None:
+    stmt = insert_attributes_sql(conn.dialect, attributes)
+    if stmt is not None:
+        conn.execute(stmt, {"id": intake_id, "attributes": attributes_json})
+
+
+def _number(name: str, raw: str) -> float:
+    try:
+        value = float(raw)
+    except ValueError:
+        value = math.nan
+    if not math.isfinite(value):
+        raise HTTPException(status_code=400, detail=f"attr.{name}: expected a number, got {raw!r}")
+    return value
+
+
+def parse_attr_filters(query: Mapping[str, str]) -> List[AttrFilter]:
+    """AttrFilters from `attr.<name>[.<op>]=value` query parameters (400 if malformed)."""
+    filters = []
+    for key, raw in query.items():
+        if not key.startswith(_PREFIX):
+            continue
+        name, _, op = key[len(_PREFIX):].rpartition(".")
+        if not name or op not in _RANGE_OPS and op not in ("eq", "in"):
+            name, op = key[len(_PREFIX):], "eq"
+        if not name:
+            raise HTTPException(status_code=400, detail=f"invalid attribute filter {key!r}")
+
+        if op == "eq":
+            values: tuple = (raw,)
+        elif op == "in":
+            values = tuple(v for v in raw.split(","))
+            if len(values) > MAX_IN_VALUES:
+                raise HTTPException(status_code=400, detail=f"attr.{name}.in: at most {MAX_IN_VALUES} values")
+        else:
+            values = (_number(name, raw),)
+        filters.append(AttrFilter(name, op, values))
+
+    if len(filters) > MAX_ATTR_FILTERS:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_ATTR_FILTERS} attribute filters")
+    return filters
+
+
+def attr_params(filters: List[AttrFilter]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    for n, f in enumerate(filters):
+        params[f"attr{n}_name"] = f.name
+        for k, v in enumerate(f.values):
+            params[f"attr{n}_v{k}"] = v
+    return params
+
+
+def attr_condition(n: int, f: AttrFilter, alias: str) -> str:
+    """Predicate on IntakeAttribute row `alias` for filter number n."""
+    cond = f"{alias}.Name = :attr{n}_name AND "
+    if f.op == "eq":
+        return cond + f"{alias}.TextValue = :attr{n}_v0"
+    if f.op == "in":
+        return cond + f"{alias}.TextValue IN ({', '.join(f':attr{n}_v{k}' for k in range(len(f.values)))})"
+    return cond + f"{alias}.NumValue {_RANGE_OPS[f.op]} :attr{n}_v0"
+
+
+def attr_exists(n: int, f: AttrFilter, intake_id_col: str) -> str:
+    """EXISTS probe on the (IntakeId, Name) primary key for filter number n."""
+    return (
+        f"EXISTS (SELECT 1 FROM IntakeAttribute a{n} "
+        f"WHERE a{n}.IntakeId = {intake_id_col} AND {attr_condition(n, f, f'a{n}')})"
+    )
@@ -0,0 +1,235 @@
+"""
+Re-route historical intakes after a routing rule change.
+
+Re-runs the rules for every intake matching the filters, batch by batch,
+across a process pool. Each batch commits in its own transaction, and the
+highest IntakeId below which every batch has committed is checkpointed, so
+an interrupted run picks up where it left off.
+
+Only intakes whose rules now pick a different queue are written: they get
+a new 'New' QueueItem there, like POST /intakes/{id}/requeue (an
+InProgress claim stays on the old row). Closed intakes are never
+reopened; if their queue would change they are counted in
+"skipped_closed" and left as they are. Rerunning with unchanged rules
+writes nothing.
+
+Usage (from the project root):
+    python -m api.backfill --since 2025-01-01 --domain Housing --workers 4
+    python -m api.backfill --queue Housing --dry-run
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+
+from . import db
+from .rules_engine import enqueue, route_intake
+
+DEFAULT_CHECKPOINT = db.PROJECT_ROOT / "data" / "backfill.checkpoint.json"
+
+# Latest queue per intake, as shown by GET /intakes.
+_CURRENT_QUEUE_SQL = """
+    (SELECT c.QueueName FROM IntakeCurrentQueue c
+     WHERE c.IntakeId = i.IntakeId)
+"""
+
+# Status of that latest QueueItem.
+_CURRENT_STATUS_SQL = """
+    (SELECT c.Status FROM IntakeCurrentQueue c
+     WHERE c.IntakeId = i.IntakeId)
+"""
+
+Moves = Dict[Tuple[Optional[str], str], int]
+
+
+def _select_ids_sql(filters: Dict[str, Any]) -> str:
+    where = ["i.IntakeId > :after"]
+    if filters.get("since"):
+        where.append("i.CreatedAt >= :since")
+    if filters.get("until"):
+        where.append("i.CreatedAt < :until")
+    if filters.get("domain"):
+        where.append("i.DomainModule = :domain")
+    if filters.get("queue"):
+        where.append(f"{_CURRENT_QUEUE_SQL} = :queue")
+    return f"""
+        SELECT i.IntakeId FROM Intake i
+        WHERE {' AND '.join(where)}
+        ORDER BY i.IntakeId
+        LIMIT :limit
+    """
+
+
+def iter_batches(filters: Dict[str, Any], after: int, batch_size: int):
+    """Yield lists of matching IntakeIds in ascending order (keyset scan)."""
+    sql = text(_select_ids_sql(filters))
+    params = {k: v for k, v in filters.items() if v}
+    while True:
+        with db.engine.connect() as conn:
+            ids = [int(r[0]) for r in conn.execute(sql, {**params, "after": after, "limit": batch_size})]
+        if not ids:
+            return
+        yield ids
+        after = ids[-1]
+
+
+def _init_worker() -> None:
+    # Forked workers must not reuse the parent's pooled connections.
+    db.init_engine()
+
+
+def process_batch(ids: List[int], dry_run: bool) -> Tuple[int, Moves, int]:
+    """
+    Re-route one batch in a single transaction. Returns (count, moves,
+    skipped_closed) where moves counts (current queue -> new queue) pairs
+    that differ and skipped_closed the Closed intakes left where they are.
+    """
+    stmt = text(
+        f"""
+        SELECT i.IntakeId, i.Crisis, i.Priority, i.DomainModule,
+               {_CURRENT_QUEUE_SQL} AS CurrentQueue, {_CURRENT_STATUS_SQL} AS CurrentStatus
+        FROM Intake i
+        WHERE i.IntakeId IN :ids
+        """
+    ).bindparams(bindparam("ids", expanding=True))
+
+    moves: Moves = Counter()
+    skipped_closed = 0
+    # A plain connect() never commits, so dry runs can't write by accident.
+    with (db.engine.connect() if dry_run else db.engine.begin()) as conn:
+        rows = conn.execute(stmt, {"ids": ids}).mappings().all()
+        for row in rows:
+            queue, reason, _ = route_intake(row)
+            if row["CurrentQueue"] == queue:
+                continue
+            if row["CurrentStatus"] == "Closed":
+                skipped_closed += 1
+                continue
+            moves[(row["CurrentQueue"], queue)] += 1
+            if not dry_run:
+                enqueue(conn, int(row["IntakeId"]), queue, reason)
+
+    return len(rows), dict(moves), skipped_closed
+
+
+def load_checkpoint(path: Path, filters: Dict[str, Any]) -> int:
+    if not path.exists():
+        return 0
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("filters") != filters:
+        raise SystemExit(
+            f"Checkpoint {path} was written for filters {data.get('filters')}; "
+            "pass --restart to discard it or --checkpoint to use another file."
+        )
+    return int(data.get("last_intake_id") or 0)
+
+
+def save_checkpoint(path: Path, filters: Dict[str, Any], last_intake_id: int, processed: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(
+        json.dumps({"filters": filters, "last_intake_id": last_intake_id, "processed": processed}),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+def run_backfill(
+    filters: Dict[str, Any],
+    workers: int = 4,
+    batch_size: int = 500,
+    checkpoint: Optional[Path] = DEFAULT_CHECKPOINT,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Re-route all intakes matching filters. Dry runs write nothing (not even
+    the checkpoint) and only report how many intakes would change queue.
+    """
+    after = load_checkpoint(checkpoint, filters) if checkpoint and not dry_run else 0
+    processed = 0
+    skipped_closed = 0
+    moves: Counter = Counter()
+
+    # Batches complete out of order; only checkpoint up to the highest id
+    # below which every submitted batch has committed.
+    pending: Dict[Future, int] = {}
+    order: deque = deque()
+    done_ids: set = set()
+    watermark = after
+
+    def _collect(finished) -> None:
+        nonlocal processed, skipped_closed, watermark
+        for fut in finished:
+            last_id = pending.pop(fut)
+            count, batch_moves, batch_skipped = fut.result()
+            processed += count
+            skipped_closed += batch_skipped
+            moves.update(batch_moves)
+            done_ids.add(last_id)
+        while order and order[0] in done_ids:
+            watermark = order.popleft()
+            done_ids.discard(watermark)
+        if checkpoint and not dry_run:
+            save_checkpoint(checkpoint, filters, watermark, processed)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for ids in iter_batches(filters, after, batch_size):
+            fut = pool.submit(process_batch, ids, dry_run)
+            pending[fut] = ids[-1]
+            order.append(ids[-1])
+            if len(pending) >= workers * 2:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(finished)
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            _collect(finished)
+
+    return {
+        "dry_run": dry_run,
+        "processed": processed,
+        "moved": sum(moves.values()),
+        "skipped_closed": skipped_closed,
+        "moves": [
+            {"from": src, "to": dst, "count": n}
+            for (src, dst), n in sorted(moves.items(), key=lambda kv: -kv[1])
+        ],
+        "last_intake_id": watermark,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-route intakes matching a filter.")
+    parser.add_argument("--since", help="CreatedAt >= (ISO date/time)")
+    parser.add_argument("--until", help="CreatedAt < (ISO date/time)")
+    parser.add_argument("--domain", help="DomainModule")
+    parser.add_argument("--queue", help="current (latest) queue name")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="ignore and overwrite an existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="report queue moves without writing")
+    args = parser.parse_args(argv)
+
+    filters = {"since": args.since, "until": args.until, "domain": args.domain, "queue": args.queue}
+    if args.restart and args.checkpoint.exists():
+        args.checkpoint.unlink()
+
+    report = run_backfill(
+        filters,
+        workers=max(1, args.workers),
+        batch_size=max(1, args.batch_size),
+        checkpoint=args.checkpoint,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
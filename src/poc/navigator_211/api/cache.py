@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .feed import hub
+from .settings import settings
+
+
+class LRUCache:
+    """
+    Bounded LRU cache with a per-entry TTL and hit/miss counters.
+
+    Invalidation races with readers: a reader can load a value from the DB,
+    a writer commits and invalidates, and then the reader stores what it
+    loaded. So readers take a token() before loading and put() only stores
+    when nothing has been invalidated since.
+    """
+
+    def __init__(self, max_entries: int, ttl_s: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def token(self) -> int:
+        with self._lock:
+            return self._epoch
+
+    def put(self, key: Hashable, value: Any, token: int) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if token != self._epoch:
+                return
+            self._data[key] = (time.monotonic() + self.ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, keys) -> None:
+        with self._lock:
+            self._epoch += 1
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Rendered GET /intakes/{id} bodies, keyed by IntakeId. Every committed
+# QueueItem change (enqueue/requeue, claim, close) goes through the feed
+# hub, which drops the affected intakes. Writes from other processes (e.g.
+# api.backfill) aren't seen here, so ttl_s bounds how stale a case can get.
+intake_detail_cache = LRUCache(
+    int(settings["intake_cache"]["max_entries"]),
+    float(settings["intake_cache"]["ttl_s"]),
+)
+
+
+def _invalidate_intakes(events: List[Dict[str, Any]]) -> None:
+    ids = {e["IntakeId"] for e in events if e.get("IntakeId") is not None}
+    if ids:
+        intake_detail_cache.invalidate(ids)
+
+
+hub.add_listener(_invalidate_intakes)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Response
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from . import db
+from .feed import publish_after_commit
+from .models import ClaimRequest, CloseRequest
+
+# Caseworker work-claim API. A claim moves the next eligible item of a
+# queue to InProgress for one worker in a single statement, so concurrent
+# claimers never get the same item. Claims carry a lease; an InProgress
+# item whose lease has run out is eligible again, so work held by a tool
+# that crashed goes back to the queue without a sweeper job.
+router = APIRouter()
+
+# Only an intake's current queue row can be claimed (older rows are
+# history after a requeue): 'New' (what the POC writes), 'Open' (the MSSQL
+# schema default), or 'InProgress' once its lease has run out. Each status
+# is one seek on IX_IntakeCurrentQueue_Claim (QueueName, Status,
+# Crisis DESC, QueueItemId), whose rows are already in claim order (crisis
+# first, then oldest), so the next item is the best of three seeks however
+# long the queue is.
+_CLAIMED_COLUMNS = "QueueItemId, IntakeId, QueueName, Status, Reason, CreatedAt, ClaimedBy, ClaimedAt, LeaseExpiresAt"
+
+# SQLite: one UPDATE ... RETURNING; the write lock makes pick + update
+# atomic. The compound ORDER BY ... LIMIT 1 merges the three ordered seeks
+# and stops at the first row.
+CLAIM_SQLITE_SQL = text(
+    f"""
+    UPDATE QueueItem
+    SET Status = 'InProgress', ClaimedBy = :worker, ClaimedAt = :now, LeaseExpiresAt = :lease_expires
+    WHERE QueueItemId = (
+        SELECT QueueItemId FROM (
+            SELECT c.QueueItemId, c.Crisis FROM IntakeCurrentQueue c
+            WHERE c.QueueName = :queue AND c.Status = 'New'
+            UNION ALL
+            SELECT c.QueueItemId, c.Crisis FROM IntakeCurrentQueue c
+            WHERE c.QueueName = :queue AND c.Status = 'Open'
+            UNION ALL
+            SELECT c.QueueItemId, c.Crisis FROM IntakeCurrentQueue c
+            JOIN QueueItem q ON q.QueueItemId = c.QueueItemId
+            WHERE c.QueueName = :queue AND c.Status = 'InProgress' AND q.LeaseExpiresAt < :now
+            ORDER BY 2 DESC, 1
+            LIMIT 1
+        )
+    )
+    RETURNING {_CLAIMED_COLUMNS}
+    """
+)
+
+# MSSQL: UPDLOCK + READPAST on the projection skips rows other claimers
+# have locked instead of waiting on them, so each seek takes its first
+# unlocked row. QueueItem has a trigger, so OUTPUT must go INTO a table
+# variable.
+_MSSQL_LOCKS = "WITH (UPDLOCK, READPAST, ROWLOCK)"
+CLAIM_MSSQL_SQL = text(
+    f"""
+    SET NOCOUNT ON;
+    DECLARE @claimed TABLE (
+        QueueItemId INT, IntakeId INT, QueueName NVARCHAR(100), Status NVARCHAR(20), Reason NVARCHAR(400),
+        CreatedAt DATETIME2(7), ClaimedBy NVARCHAR(100), ClaimedAt DATETIME2(7), LeaseExpiresAt DATETIME2(7)
+    );
+    DECLARE @next INT = (
+        SELECT TOP (1) x.QueueItemId
+        FROM (
+            SELECT * FROM (
+                SELECT TOP (1) c.QueueItemId, c.Crisis FROM IntakeCurrentQueue c {_MSSQL_LOCKS}
+                WHERE c.QueueName = :queue AND c.Status = 'New'
+                ORDER BY c.Crisis DESC, c.QueueItemId
+            ) n
+            UNION ALL
+            SELECT * FROM (
+                SELECT TOP (1) c.QueueItemId, c.Crisis FROM IntakeCurrentQueue c {_MSSQL_LOCKS}
+                WHERE c.QueueName = :queue AND c.Status = 'Open'
+                ORDER BY c.Crisis DESC, c.QueueItemId
+            ) o
+            UNION ALL
+            SELECT * FROM (
+                SELECT TOP (1) c.QueueItemId, c.Crisis FROM IntakeCurrentQueue c {_MSSQL_LOCKS}
+                JOIN QueueItem q ON q.QueueItemId = c.QueueItemId
+                WHERE c.QueueName = :queue AND c.Status = 'InProgress' AND q.LeaseExpiresAt < :now
+                ORDER BY c.Crisis DESC, c.QueueItemId
+            ) e
+        ) x
+        ORDER BY x.Crisis DESC, x.QueueItemId
+    );
+    UPDATE QueueItem
+    SET Status = 'InProgress', ClaimedBy = :worker, ClaimedAt = :now, LeaseExpiresAt = :lease_expires
+    OUTPUT {', '.join('INSERTED.' + c.strip() for c in _CLAIMED_COLUMNS.split(','))} INTO @claimed
+    WHERE QueueItemId = @next;
+    SELECT {_CLAIMED_COLUMNS} FROM @claimed;
+    """
+)
+
+CLOSE_SQL = text(
+    """
+    UPDATE QueueItem
+    SET Status = 'Closed', LeaseExpiresAt = NULL
+    WHERE QueueItemId = :id AND QueueName = :queue AND Status = 'InProgress' AND ClaimedBy = :worker
+    """
+)
+
+_SELECT_INTAKE_ID = text("SELECT IntakeId FROM QueueItem WHERE QueueItemId = :id")
+
+
+def _claim_sql(dialect) -> Any:
+    return CLAIM_MSSQL_SQL if dialect.name == "mssql" else CLAIM_SQLITE_SQL
+
+
+def claim_next(
+    conn: Connection, queue: str, worker: str, lease_seconds: int, now: Optional[datetime] = None
+) -> Optional[Dict[str, Any]]:
+    """Claim the next eligible item of `queue` for `worker`; None if the queue is empty."""
+    now = now or datetime.utcnow()
+    params = {
+        "queue": queue,
+        "worker": worker,
+        "now": now.isoformat(),
+        "lease_expires": (now + timedelta(seconds=lease_seconds)).isoformat(),
+    }
+    row = conn.execute(_claim_sql(conn.dialect), params).mappings().first()
+    if not row:
+        return None
+    item = dict(row)
+    publish_after_commit(conn, {"type": "status", **item})
+    return item
+
+
+@router.post("/queues/{name}/claim")
+def claim(name: str, req: ClaimRequest):
+    """
+    Move the next item of queue `name` to InProgress for req.worker, crisis
+    intakes first, then oldest first. 204 when nothing is available.
+    """
+    if db.engine is None:
+        raise HTTPException(status_code=500, detail="DB not configured")
+
+    with db.engine.begin() as conn:
+        item = claim_next(conn, name, req.worker, req.lease_seconds)
+
+    if item is None:
+        return Response(status_code=204)
+    return item
+
+
+@router.post("/queues/{name}/items/{queue_item_id}/close")
+def close_item(name: str, queue_item_id: int, req: CloseRequest):
+    """Close an item the worker holds. 409 if it isn't InProgress for that worker."""
+    if db.engine is None:
+        raise HTTPException(status_code=500, detail="DB not configured")
+
+    with db.engine.begin() as conn:
+        updated = conn.execute(CLOSE_SQL, {"id": queue_item_id, "queue": name, "worker": req.worker}).rowcount
+        if updated:
+            intake_id = conn.execute(_SELECT_INTAKE_ID, {"id": queue_item_id}).scalar_one()
+            publish_after_commit(
+                conn,
+                {
+                    "type": "status",
+                    "QueueItemId": queue_item_id,
+                    "IntakeId": intake_id,
+                    "QueueName": name,
+                    "Status": "Closed",
+                    "ClaimedBy": req.worker,
+                },
+            )
+
+    if not updated:
+        raise HTTPException(status_code=409, detail="not claimed by this worker")
+    return {"queue_item_id": queue_item_id, "status": "Closed"}
@@ -0,0 +1,65 @@
+"""
+IntakeCurrentQueue: one row per intake holding its latest QueueItem.
+
+GET /intakes and GET /intakes/{id} read the current assignment from here
+instead of taking MAX(QueueItemId) over the QueueItem history on every
+call. Triggers on QueueItem (migrations 3 and 10 in migrations.py) keep it
+in step inside the transaction that writes the QueueItem, and one on
+Intake keeps its copy of Crisis (claim order), so it's never stale;
+rebuild() regenerates it from history if it ever drifts (e.g. after a
+manual edit or a restore).
+
+Usage (from the project root):
+    python -m api.current_queue
+"""
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from . import db
+
+# Latest QueueItem per IntakeId = row with max QueueItemId, with the
+# intake's Crisis flag (claim order).
+_SELECT_LATEST_SQL = """
+    SELECT q.IntakeId, q.QueueItemId, q.QueueName, q.Status, q.Reason, q.CreatedAt, COALESCE(i.Crisis, 0)
+    FROM QueueItem q
+    JOIN (
+        SELECT IntakeId, MAX(QueueItemId) AS max_qid
+        FROM QueueItem
+        GROUP BY IntakeId
+    ) lq ON lq.max_qid = q.QueueItemId
+    LEFT JOIN Intake i ON i.IntakeId = q.IntakeId
+"""
+
+_INSERT_SQL = "INSERT INTO IntakeCurrentQueue (IntakeId, QueueItemId, QueueName, Status, Reason, UpdatedAt, Crisis)"
+
+REBUILD_SQL: List = [
+    text("DELETE FROM IntakeCurrentQueue"),
+    text(f"{_INSERT_SQL} {_SELECT_LATEST_SQL}"),
+]
+
+
+def rebuild(conn) -> Dict[str, int]:
+    """Regenerate IntakeCurrentQueue from QueueItem on conn's transaction."""
+    for stmt in REBUILD_SQL:
+        conn.execute(stmt)
+    count = conn.execute(text("SELECT COUNT(*) FROM IntakeCurrentQueue")).scalar_one()
+    return {"intakes": int(count)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    argparse.ArgumentParser(description="Rebuild IntakeCurrentQueue from QueueItem history.").parse_args(argv)
+    if db.engine is None:
+        raise SystemExit("DB not configured")
+    with db.engine.begin() as conn:
+        report = rebuild(conn)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
 import os
-from pathlib import Path
+from typing import Any, Dict, List
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from .settings import PROJECT_ROOT, settings
 
 # Load env from config/.env (project root)
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
 load_dotenv(PROJECT_ROOT / "config" / ".env")
 
 engine: Engine | None = None
 
+# Set when DB_ASYNC is enabled; the app then serves the hot routes from
+# routes_async.py. The sync engine is always built for scripts/bootstrap.
+async_engine: AsyncEngine | None = None
+
+# Sync driver -> asyncio driver for the same database.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "mssql+pyodbc": "mssql+aioodbc",
+}
+
 
 def _has_driver(name: str) -> bool:
     try:
@@ -50,22 +63,107 @@ def _build_mssql_url() -> str:
     )
 
 
+def _is_file_sqlite(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database not in (None, "", ":memory:")
+
+
+def sqlite_pragmas(profile: Dict[str, Any]) -> List[str]:
+    """PRAGMA statements for a settings["sqlite"]-style profile."""
+    pragmas = []
+    if profile.get("journal_mode"):
+        pragmas.append(f"PRAGMA journal_mode={profile['journal_mode']}")
+    if profile.get("synchronous"):
+        pragmas.append(f"PRAGMA synchronous={profile['synchronous']}")
+    if profile.get("busy_timeout_ms") is not None:
+        pragmas.append(f"PRAGMA busy_timeout={int(profile['busy_timeout_ms'])}")
+    if profile.get("cache_size_kib"):
+        # Negative cache_size is in KiB rather than pages.
+        pragmas.append(f"PRAGMA cache_size=-{int(profile['cache_size_kib'])}")
+    if profile.get("mmap_size_mb") is not None:
+        pragmas.append(f"PRAGMA mmap_size={int(profile['mmap_size_mb']) * 1024 * 1024}")
+    if profile.get("temp_store"):
+        pragmas.append(f"PRAGMA temp_store={profile['temp_store']}")
+    return pragmas
+
+
+def _engine_kwargs(url: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+    # :memory: databases use a single-connection pool; pool sizing only
+    # applies to file databases.
+    if not _is_file_sqlite(url):
+        return {}
+    return {
+        "pool_size": int(profile.get("pool_size", 5)),
+        "max_overflow": int(profile.get("max_overflow", 10)),
+        "pool_timeout": float(profile.get("pool_timeout_s", 30)),
+    }
+
+
+def _apply_sqlite_profile(target: Engine, url: str, profile: Dict[str, Any]) -> None:
+    pragmas = sqlite_pragmas(profile)
+    if not _is_file_sqlite(url):
+        # WAL and mmap don't apply to in-memory databases.
+        pragmas = [p for p in pragmas if "journal_mode" not in p and "mmap_size" not in p]
+
+    @event.listens_for(target, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _):
+        cur = dbapi_conn.cursor()
+        try:
+            for p in pragmas:
+                cur.execute(p)
+        finally:
+            cur.close()
+
+
+def create_sqlite_engine(url: str, profile: Dict[str, Any] | None = None) -> Engine:
+    """Sync SQLite engine with the tuned profile (settings.json "sqlite")."""
+    profile = settings["sqlite"] if profile is None else profile
+    connect_args = {}
+    if profile.get("busy_timeout_ms") is not None:
+        connect_args["timeout"] = int(profile["busy_timeout_ms"]) / 1000.0
+    eng = create_engine(url, future=True, connect_args=connect_args, **_engine_kwargs(url, profile))
+    _apply_sqlite_profile(eng, url, profile)
+    return eng
+
+
+def async_enabled() -> bool:
+    return os.getenv("DB_ASYNC", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _async_url(url: str) -> str:
+    u = make_url(url)
+    driver = _ASYNC_DRIVERS.get(u.drivername)
+    if driver is None:
+        if u.drivername in _ASYNC_DRIVERS.values():
+            return url
+        raise RuntimeError(f"No async driver configured for '{u.drivername}' (DB_ASYNC is set)")
+    return u.set(drivername=driver).render_as_string(hide_password=False)
+
+
 def init_engine() -> None:
-    global engine
+    global engine, async_engine
 
     # 1) Explicit override
     db_url = os.getenv("DB_URL")
-    if db_url:
-        engine = create_engine(db_url, future=True)
-        return
-
-    # 2) Prefer Azure SQL if Driver 18 is available
-    if _has_driver("ODBC Driver 18 for SQL Server"):
-        engine = create_engine(_build_mssql_url(), future=True)
+    if not db_url:
+        # 2) Prefer Azure SQL if Driver 18 is available
+        if _has_driver("ODBC Driver 18 for SQL Server"):
+            db_url = _build_mssql_url()
+        # 3) Fallback to local SQLite (no admin needed)
+        else:
+            db_url = _sqlite_url()
+
+    if make_url(db_url).get_backend_name() == "sqlite":
+        profile = settings["sqlite"]
+        engine = create_sqlite_engine(db_url, profile)
+        async_engine = None
+        if async_enabled():
+            async_engine = create_async_engine(_async_url(db_url), **_engine_kwargs(db_url, profile))
+            _apply_sqlite_profile(async_engine.sync_engine, db_url, profile)
         return
 
-    # 3) Fallback to local SQLite (no admin needed)
-    engine = create_engine(_sqlite_url(), future=True)
+    engine = create_engine(db_url, future=True)
+    async_engine = create_async_engine(_async_url(db_url)) if async_enabled() else None
 
 
 init_engine()
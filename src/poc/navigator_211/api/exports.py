@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+
+from . import db
+
+# Bulk exports for reporting. Rows are read from a streaming cursor
+# EXPORT_BATCH_SIZE at a time and written straight to the response, so
+# memory stays flat however many rows match (unlike GET /queues, which
+# builds the page in memory).
+router = APIRouter()
+
+EXPORT_BATCH_SIZE = 1000
+
+# Filter column per export. queue/status match the QueueItem row itself for
+# `queues`, as on GET /queues, and the intake's current queue row
+# (IntakeCurrentQueue) for the others, as on GET /intakes.
+_EXPORTS: Dict[str, Dict[str, str]] = {
+    "intakes": {
+        "select": "SELECT t.* FROM Intake t",
+        "id": "t.IntakeId",
+        "intake": "t.IntakeId",
+        "time": "t.CreatedAt",
+    },
+    "queues": {
+        "select": "SELECT t.* FROM QueueItem t",
+        "id": "t.QueueItemId",
+        "intake": "t.IntakeId",
+        "time": "t.CreatedAt",
+        "queue": "t.QueueName",
+        "status": "t.Status",
+    },
+    "rule-results": {
+        "select": "SELECT t.* FROM RuleResult t",
+        "id": "t.RuleResultId",
+        "intake": "t.IntakeId",
+        "time": "t.EvaluatedAt",
+    },
+}
+
+
+def _export_order(spec: Mapping[str, str], filters: Mapping[str, Any]) -> str:
+    """
+    ORDER BY that follows the index the filter seeks, so rows stream
+    straight off it and are never sorted (a sort of every match would
+    hold the whole export in temp storage before the first row):
+    - queue/status: IX_QueueItem_Queue/_Status (QueueItemId order) for
+      `queues`; otherwise IX_IntakeCurrentQueue_Queue/_Status (IntakeId
+      order), then IX_RuleResult_Intake (IntakeId, RuleResultId);
+    - since/until only: the timestamp index, (time, id) order;
+    - none: the primary key.
+    Other filters are checked on each row of that walk.
+    """
+    if filters.get("queue") or filters.get("status"):
+        if "queue" in spec:
+            return spec["id"]
+        return "c.IntakeId" if spec["id"] == spec["intake"] else f"c.IntakeId, {spec['id']}"
+    if filters.get("since") or filters.get("until"):
+        return f"{spec['time']}, {spec['id']}"
+    return spec["id"]
+
+
+def _export_sql(kind: str, filters: Mapping[str, Any]) -> Any:
+    spec = _EXPORTS[kind]
+    queue_col, status_col = spec.get("queue", "c.QueueName"), spec.get("status", "c.Status")
+    joins, where = [], []
+    if (filters.get("queue") or filters.get("status")) and "queue" not in spec:
+        joins.append(f"JOIN IntakeCurrentQueue c ON c.IntakeId = {spec['intake']}")
+    if filters.get("queue"):
+        where.append(f"{queue_col} = :queue")
+    if filters.get("status"):
+        where.append(f"{status_col} = :status")
+    if filters.get("since"):
+        where.append(f"{spec['time']} >= :since")
+    if filters.get("until"):
+        where.append(f"{spec['time']} < :until")
+    return text(
+        f"""
+        {spec['select']}
+        {' '.join(joins)}
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY {_export_order(spec, filters)}
+        """
+    )
+
+
+def _json_line(row: Mapping[str, Any]) -> str:
+    return json.dumps(dict(row), ensure_ascii=False, default=str) + "\n"
+
+
+def _stream_rows(kind: str, filters: Dict[str, Any], fmt: str) -> Iterator[bytes]:
+    """
+    Yield the encoded export one batch at a time. Runs in the threadpool
+    (StreamingResponse iterates sync generators there); the connection is
+    held until the last batch is sent or the client goes away.
+    """
+    with db.engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(_export_sql(kind, filters), filters)
+
+        if fmt == "ndjson":
+            for batch in result.mappings().partitions(EXPORT_BATCH_SIZE):
+                yield "".join(_json_line(r) for r in batch).encode("utf-8")
+            return
+
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(result.keys())
+        for batch in result.partitions(EXPORT_BATCH_SIZE):
+            writer.writerows(batch)
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue().encode("utf-8")
+
+
+@router.get("/exports/{kind}")
+def export_rows(
+    kind: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    queue: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Stream every matching Intake (`intakes`), QueueItem (`queues`) or
+    RuleResult (`rule-results`) row as NDJSON or CSV, in the order of the
+    index the filter seeks (see _export_order): by id, by timestamp for
+    since/until alone, by intake for queue/status. queue/status filter like GET /queues for `queues` (the item's own queue
+    and status) and like GET /intakes otherwise (the intake's current
+    queue); since (inclusive) / until (exclusive) on the row's timestamp.
+    """
+    if kind not in _EXPORTS:
+        raise HTTPException(status_code=404, detail="not found")
+    if db.engine is None:
+        raise HTTPException(status_code=500, detail="DB not configured")
+
+    filters = {
+        "queue": queue,
+        "status": status,
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+    }
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    return StreamingResponse(
+        _stream_rows(kind, filters, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'},
+    )
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Response path for the read endpoints. Rows are shaped into plain dicts
+# once (no per-row Mapping copies) and rendered to bytes in one call, with
+# orjson when it's installed; returning a Response from a route also skips
+# FastAPI's jsonable_encoder walk of the whole page.
+
+
+def _default(obj: Any) -> Any:
+    # Same conversions jsonable_encoder applies to the types our drivers
+    # return (pyodbc gives Decimal/datetime, SQLite gives text).
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode("utf-8", "replace")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON, as Starlette's JSONResponse renders it."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def is_raw_json(value: Any) -> bool:
+    """
+    True for an object or array literal. Only a shape check: callers must
+    already know the text is valid JSON (GET /intakes/{id} has the DB check
+    it with json_valid / ISJSON) before splicing it in verbatim.
+    """
+    if not isinstance(value, str) or len(value) < 2:
+        return False
+    return (value[0], value[-1]) in (("{", "}"), ("[", "]"))
+
+
+def dumps_with_raw(obj: Mapping[str, Any], raw: Mapping[str, str]) -> bytes:
+    """dumps(obj) with raw's JSON text appended as extra members, unparsed."""
+    body = dumps({k: v for k, v in obj.items() if k not in raw})
+    if not raw:
+        return body
+    members = b",".join(dumps(k) + b":" + v.encode("utf-8") for k, v in raw.items())
+    return body[:-1] + (b"," if len(body) > 2 else b"") + members + b"}"
+
+
+def shape_rows(
+    keys: Sequence[str], rows: Iterable[Sequence[Any]], bool_columns: Iterable[str] = (), to_bool=bool
+) -> List[Dict[str, Any]]:
+    """
+    Dicts from plain result tuples. Column positions are resolved once per
+    query, so per row the work is one zip plus the bool conversions.
+    """
+    keys = list(keys)
+    wanted = set(bool_columns)
+    bool_idx = [i for i, k in enumerate(keys) if k in wanted]
+    if not bool_idx:
+        return [dict(zip(keys, row)) for row in rows]
+
+    out = []
+    for row in rows:
+        values = list(row)
+        for i in bool_idx:
+            values[i] = to_bool(values[i])
+        out.append(dict(zip(keys, values)))
+    return out
+
@@ -0,0 +1,227 @@
+"""
+Live QueueItem feed for dashboards (Server-Sent Events).
+
+Writers call publish_after_commit(conn, event) inside their transaction.
+Events wait in conn.info until the transaction commits and the connection
+goes back to the pool, and are then handed to the in-process FeedHub,
+which fans each one out to every subscribed stream. Rolled-back work is
+never published. N open dashboards therefore cost one fan-out per change
+instead of N polling queries.
+
+GET /queues/feed?queue=Housing&after=<QueueItemId> first replays newer
+QueueItem rows from the database (keyset seek), then streams live events.
+The SSE id is the QueueItemId of each "queued" event, so a browser
+EventSource resumes from where it dropped via Last-Event-ID.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from . import db
+
+router = APIRouter()
+
+FEED_REPLAY_BATCH = 500
+FEED_SUBSCRIBER_BUFFER = 1000
+FEED_HEARTBEAT_S = 15.0
+
+_PENDING = "feed_pending"
+_COMMITTED = "feed_committed"
+
+
+class _Subscription:
+    def __init__(self, hub: "FeedHub", queue_name: Optional[str], maxsize: int) -> None:
+        self.hub = hub
+        self.queue_name = queue_name
+        self.loop = asyncio.get_running_loop()
+        self.events: asyncio.Queue = asyncio.Queue(maxsize)
+        # Set when the subscriber fell too far behind; the stream ends and
+        # the client reconnects with Last-Event-ID (replayed from the DB).
+        self.overflowed = False
+
+    def _offer(self, evt: Dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.events.put_nowait(evt)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def close(self) -> None:
+        self.hub._unsubscribe(self)
+
+
+class FeedHub:
+    """Thread-safe in-process broadcast of queue events to asyncio subscribers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subs: Set[_Subscription] = set()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+    def add_listener(self, fn: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """Call fn(events) synchronously on every publish (e.g. cache invalidation)."""
+        with self._lock:
+            self._listeners.append(fn)
+
+    def subscribe(self, queue_name: Optional[str] = None, maxsize: int = FEED_SUBSCRIBER_BUFFER) -> _Subscription:
+        """Must be called from the event loop that will consume the subscription."""
+        sub = _Subscription(self, queue_name, maxsize)
+        with self._lock:
+            self._subs.add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: _Subscription) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+    def publish(self, events: List[Dict[str, Any]]) -> None:
+        """Deliver events to matching subscribers; callable from any thread."""
+        with self._lock:
+            subs = list(self._subs)
+            listeners = list(self._listeners)
+        for fn in listeners:
+            fn(events)
+        for sub in subs:
+            matching = [e for e in events if sub.queue_name in (None, e.get("QueueName"))]
+            for evt in matching:
+                try:
+                    sub.loop.call_soon_threadsafe(sub._offer, evt)
+                except RuntimeError:
+                    # Subscriber's loop is closed; it will never read again.
+                    self._unsubscribe(sub)
+                    break
+
+
+hub = FeedHub()
+
+
+def publish_after_commit(conn, evt: Dict[str, Any]) -> None:
+    """Queue evt for the hub once conn's current transaction commits."""
+    conn.info.setdefault(_PENDING, []).append(evt)
+
+
+@event.listens_for(Engine, "commit")
+def _stage_committed(conn) -> None:
+    pending = conn.info.pop(_PENDING, None)
+    if pending:
+        conn.info.setdefault(_COMMITTED, []).extend(pending)
+
+
+@event.listens_for(Engine, "rollback")
+def _drop_pending(conn) -> None:
+    conn.info.pop(_PENDING, None)
+
+
+@event.listens_for(Pool, "checkin")
+def _flush_committed(dbapi_conn, record) -> None:
+    # The commit event fires just before the DBAPI commit; by checkin the
+    # transaction is durably over, so this is the earliest safe point.
+    if record is None:
+        return
+    record.info.pop(_PENDING, None)
+    committed = record.info.pop(_COMMITTED, None)
+    if committed:
+        hub.publish(committed)
+
+
+# -----------------------
+# SSE endpoint
+# -----------------------
+def _replay_sql(queue_name: Optional[str]) -> Any:
+    where = "QueueItemId > :after" + (" AND QueueName = :queue" if queue_name else "")
+    return text(
+        f"""
+        SELECT QueueItemId, IntakeId, QueueName, Status, Reason, CreatedAt
+        FROM QueueItem
+        WHERE {where}
+        ORDER BY QueueItemId
+        LIMIT :limit
+        """
+    )
+
+
+def _replay_batch(queue_name: Optional[str], after: int) -> List[Dict[str, Any]]:
+    with db.engine.connect() as conn:
+        rows = conn.execute(
+            _replay_sql(queue_name), {"after": after, "queue": queue_name, "limit": FEED_REPLAY_BATCH}
+        ).mappings().all()
+    return [{"type": "queued", **dict(r)} for r in rows]
+
+
+def _sse(evt: Dict[str, Any]) -> bytes:
+    lines = []
+    if evt.get("type") == "queued":
+        lines.append(f"id: {evt['QueueItemId']}")
+    lines.append(f"event: {evt.get('type', 'message')}")
+    lines.append("data: " + json.dumps(evt, ensure_ascii=False, default=str))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+async def feed_events(sub: _Subscription, after: Optional[int]) -> AsyncIterator[bytes]:
+    """Replay QueueItems after `after` (if given), then live events until overflow."""
+    try:
+        last_id = after
+        if after is not None:
+            while True:
+                batch = await run_in_threadpool(_replay_batch, sub.queue_name, last_id)
+                for evt in batch:
+                    yield _sse(evt)
+                    last_id = evt["QueueItemId"]
+                if len(batch) < FEED_REPLAY_BATCH:
+                    break
+
+        yield b"retry: 2000\n\n"
+        while not sub.overflowed:
+            try:
+                evt = await asyncio.wait_for(sub.events.get(), FEED_HEARTBEAT_S)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            # Subscribed before the replay, so skip what the replay already sent.
+            if evt.get("type") == "queued" and last_id is not None and evt["QueueItemId"] <= last_id:
+                continue
+            yield _sse(evt)
+    finally:
+        sub.close()
+
+
+@router.get("/queues/feed")
+async def queue_feed(
+    queue: Optional[str] = None,
+    after: Optional[int] = Query(None, ge=0, description="last QueueItemId seen"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Server-Sent Events: `queued` (new QueueItem) and `status` (claim/close)
+    events, optionally for one queue. Resume with ?after= or Last-Event-ID.
+    """
+    if after is None and last_event_id:
+        try:
+            after = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid Last-Event-ID")
+    if after is not None and db.engine is None:
+        raise HTTPException(status_code=500, detail="DB not configured")
+
+    sub = hub.subscribe(queue)
+    return StreamingResponse(
+        feed_events(sub, after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,163 @@
+"""
+GET /health and GET /health/details.
+
+A background HealthProber runs `SELECT 1` every health.probe_interval_s
+seconds and keeps the result; /health only reads it, so load balancer and
+monitoring polls never check out a pooled connection. /health/details adds
+the probe history and connection-pool counters.
+
+If the prober stops (or was never started, e.g. a bare TestClient), the
+cached result goes stale: /health probes inline once it is older than
+stale_after_s, so it never reports a state older than that.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter
+
+from . import db
+from .models import HealthResponse
+from .settings import settings
+
+log = logging.getLogger(__name__)
+
+router = APIRouter()
+
+VERSION = "0.1.0"
+
+
+def pool_stats(engine) -> Optional[Dict[str, Any]]:
+    """Checked-in/out and overflow counts for a QueuePool (None if no engine)."""
+    if engine is None:
+        return None
+    pool = engine.pool
+    stats: Dict[str, Any] = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            stats[name] = fn()
+    return stats
+
+
+class HealthProber:
+    """Daemon thread that probes the DB every interval_s and caches the result."""
+
+    def __init__(self, interval_s: float, stale_after_s: float) -> None:
+        self.interval_s = interval_s
+        self.stale_after_s = stale_after_s
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.db_status = "not_probed"
+        self.last_probe_at: Optional[float] = None  # time.time()
+        self.last_success_at: Optional[float] = None
+        self.last_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+        self.probes = 0
+
+    def probe(self) -> str:
+        """Run one probe now and return the DB status it recorded."""
+        engine = db.engine
+        if engine is None:
+            status, latency, error = "not_configured", None, None
+        else:
+            start = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.exec_driver_sql("SELECT 1")
+                status, error = "ok", None
+            except Exception as e:
+                status, error = f"error: {type(e).__name__}", str(e)
+            latency = (time.perf_counter() - start) * 1e3
+
+        now = time.time()
+        with self._lock:
+            self.db_status = status
+            self.last_probe_at = now
+            self.last_latency_ms = latency
+            self.last_error = error
+            self.probes += 1
+            if status == "ok":
+                self.last_success_at = now
+                self.consecutive_failures = 0
+            elif error is not None:
+                self.consecutive_failures += 1
+        return status
+
+    def current(self) -> str:
+        """The cached DB status, re-probed inline only if it is stale."""
+        last = self.last_probe_at
+        if last is None or time.time() - last > self.stale_after_s:
+            return self.probe()
+        return self.db_status
+
+    def start(self) -> None:
+        if self.interval_s <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self.probe()
+        self._thread = threading.Thread(target=self._run, name="health-probe", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.probe()
+            except Exception:
+                log.exception("health probe failed")
+
+    def details(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {
+                "db": self.db_status,
+                "interval_s": self.interval_s,
+                "running": self._thread is not None,
+                "probes": self.probes,
+                "last_probe_at": _iso(self.last_probe_at),
+                "last_success_at": _iso(self.last_success_at),
+                "seconds_since_success": now - self.last_success_at if self.last_success_at else None,
+                "last_latency_ms": self.last_latency_ms,
+                "consecutive_failures": self.consecutive_failures,
+                "last_error": self.last_error,
+            }
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.utcfromtimestamp(ts).isoformat() if ts is not None else None
+
+
+_cfg = settings["health"]
+prober = HealthProber(float(_cfg["probe_interval_s"]), float(_cfg["stale_after_s"]))
+
+
+@router.get("/health", response_model=HealthResponse)
+def health() -> HealthResponse:
+    return HealthResponse(status="ok", db=prober.current(), version=VERSION)
+
+
+@router.get("/health/details")
+def health_details() -> Dict[str, Any]:
+    """Last probe result and timings, plus connection-pool counters."""
+    probe = prober.details()
+    db_status = probe.pop("db")
+    return {
+        "status": "ok",
+        "db": db_status,
+        "version": VERSION,
+        "probe": probe,
+        "pool": pool_stats(db.engine),
+        "async_pool": pool_stats(db.async_engine.sync_engine) if db.async_engine is not None else None,
+    }
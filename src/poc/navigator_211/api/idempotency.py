@@ -0,0 +1,306 @@
+"""
+Idempotency-Key support for POST /intakes and POST /client/intake.
+
+A client that retries on timeout sends the same Idempotency-Key header
+each time; every repeat gets the original response (with
+`Idempotent-Replayed: true`) instead of a second intake, rule run and
+QueueItem. Keys are looked up in three places, cheapest first:
+
+- the in-memory LRU of recent responses;
+- the in-flight table: a repeat that arrives while the first request is
+  still running waits for it (up to wait_s, then 409) instead of doing the
+  work too. The waiting repeat holds a worker thread (the route's, or one
+  from the async routes' thread pool), so wait_s should stay a few seconds;
+- IdempotencyKey (migration 8), which survives restarts and is shared by
+  every app instance.
+
+The IdempotencyKey row is written in the same transaction as the intake,
+so a key is never recorded without its intake or the other way round. If
+another instance commits the same key first, the primary key rejects our
+row, our transaction rolls back and its response is replayed. If that row
+is gone again by the time we look (pruned, say), there is nothing to
+replay yet and the request gets the in-progress 409, to be retried.
+
+Reusing a key with a different request body is a 422; only successful
+responses are stored, so a failed request can be retried with its key.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from anyio import to_thread
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from .cache import LRUCache
+from .fastjson import dumps
+from .settings import settings
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+_SELECT_SQL = text(
+    "SELECT RequestHash, StatusCode, ResponseJson FROM IdempotencyKey WHERE Scope = :scope AND IdemKey = :key"
+)
+_INSERT_SQL = text(
+    """
+    INSERT INTO IdempotencyKey (Scope, IdemKey, RequestHash, StatusCode, ResponseJson, CreatedAt)
+    VALUES (:scope, :key, :hash, :status, :body, :at)
+    """
+)
+_PRUNE_SQL = text("DELETE FROM IdempotencyKey WHERE CreatedAt < :before")
+
+
+class Conflict(Exception):
+    """The key was recorded by another transaction after our lookup missed."""
+
+
+class Stored(NamedTuple):
+    request_hash: str
+    status_code: int
+    body: bytes
+
+
+def fingerprint(body: Any) -> str:
+    """sha256 of the request body (bytes or str), to spot a key reused for a different request."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return hashlib.sha256(body).hexdigest()
+
+
+def _check_key(key: str) -> str:
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH or not key.isprintable():
+        raise HTTPException(
+            status_code=400, detail=f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} printable characters"
+        )
+    return key
+
+
+def _respond(stored: Stored, request_hash: str, replayed: bool) -> Response:
+    if stored.request_hash != request_hash:
+        raise HTTPException(
+            status_code=422, detail=f"{IDEMPOTENCY_HEADER} was already used for a different request"
+        )
+    headers = {REPLAYED_HEADER: "true"} if replayed else None
+    return Response(stored.body, status_code=stored.status_code, media_type="application/json", headers=headers)
+
+
+def _from_row(row: Any) -> Optional[Stored]:
+    if row is None:
+        return None
+    body = row[2]
+    return Stored(row[0], int(row[1]), body.encode("utf-8") if isinstance(body, str) else bytes(body))
+
+
+class _Flight:
+    __slots__ = ("done",)
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class _Recorder:
+    """The `record(conn, body)` callback handed to a request's work function."""
+
+    def __init__(self, scope: str, key: str, request_hash: str) -> None:
+        self.scope = scope
+        self.key = key
+        self.request_hash = request_hash
+        self.stored: Optional[Stored] = None
+
+    def params(self, body: Any, status_code: int) -> Dict[str, Any]:
+        self.stored = Stored(self.request_hash, status_code, dumps(jsonable_encoder(body)))
+        return {
+            "scope": self.scope,
+            "key": self.key,
+            "hash": self.request_hash,
+            "status": status_code,
+            "body": self.stored.body.decode("utf-8"),
+            "at": datetime.utcnow().isoformat(),
+        }
+
+    def __call__(self, conn, body: Any, status_code: int = 200) -> None:
+        try:
+            conn.execute(_INSERT_SQL, self.params(body, status_code))
+        except IntegrityError as e:
+            raise Conflict(self.key) from e
+
+    async def record_async(self, conn, body: Any, status_code: int = 200) -> None:
+        try:
+            await conn.execute(_INSERT_SQL, self.params(body, status_code))
+        except IntegrityError as e:
+            raise Conflict(self.key) from e
+
+    def result(self, body: Any) -> Stored:
+        # Work that didn't call record() (no DB configured) is kept in memory only.
+        if self.stored is None:
+            self.stored = Stored(self.request_hash, 200, dumps(jsonable_encoder(body)))
+        return self.stored
+
+
+class IdempotencyStore:
+    def __init__(self, max_entries: int, ttl_s: float, wait_s: float) -> None:
+        self.wait_s = wait_s
+        self._responses = LRUCache(max_entries, ttl_s)
+        self._lock = threading.Lock()
+        self._flights: Dict[Tuple[str, str], _Flight] = {}
+        self.coalesced = 0
+
+    def _join(self, cache_key: Tuple[str, str]) -> Tuple[_Flight, bool]:
+        """The in-flight entry for cache_key and whether this request leads it."""
+        with self._lock:
+            flight = self._flights.get(cache_key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[cache_key] = _Flight()
+            return flight, True
+
+    def _leave(self, cache_key: Tuple[str, str], flight: _Flight) -> None:
+        with self._lock:
+            self._flights.pop(cache_key, None)
+        flight.done.set()
+
+    def _in_progress(self) -> HTTPException:
+        return HTTPException(
+            status_code=409, detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress; retry later"
+        )
+
+    def run(self, engine, scope: str, key: Optional[str], request_hash: str, work: Callable[..., Any]) -> Any:
+        """
+        Call work(record) at most once per (scope, key). work must call
+        record(conn, body) inside the transaction that does the writes;
+        its return value is the response body. Without a key, work runs
+        as usual (record does nothing) and its return value is returned.
+        A repeat of an in-flight key blocks this (threadpool) thread for up
+        to wait_s.
+        """
+        if key is None:
+            return work(lambda conn, body, status_code=200: None)
+        key = _check_key(key)
+        cache_key = (scope, key)
+
+        while True:
+            stored = self._responses.get(cache_key)
+            if stored is not None:
+                return _respond(stored, request_hash, replayed=True)
+
+            flight, leader = self._join(cache_key)
+            if not leader:
+                if not flight.done.wait(self.wait_s):
+                    raise self._in_progress()
+                continue  # the leader's response is cached now, or it failed and we retry
+
+            try:
+                token = self._responses.token()
+                replayed = True
+                stored = self._lookup(engine, scope, key)
+                if stored is None:
+                    recorder = _Recorder(scope, key, request_hash)
+                    try:
+                        stored, replayed = recorder.result(work(recorder)), False
+                    except Conflict:
+                        stored = self._lookup(engine, scope, key)
+                        if stored is None:
+                            raise self._in_progress()
+                self._responses.put(cache_key, stored, token)
+                return _respond(stored, request_hash, replayed)
+            finally:
+                self._leave(cache_key, flight)
+
+    async def run_async(
+        self, engine, scope: str, key: Optional[str], request_hash: str, work: Callable[..., Awaitable[Any]]
+    ) -> Any:
+        """run() for the async routes: engine is an AsyncEngine and work/record are awaited."""
+        if key is None:
+            async def no_record(conn, body, status_code=200) -> None:
+                return None
+
+            return await work(no_record)
+        key = _check_key(key)
+        cache_key = (scope, key)
+
+        while True:
+            stored = self._responses.get(cache_key)
+            if stored is not None:
+                return _respond(stored, request_hash, replayed=True)
+
+            flight, leader = self._join(cache_key)
+            if not leader:
+                if not await to_thread.run_sync(flight.done.wait, self.wait_s):
+                    raise self._in_progress()
+                continue
+
+            try:
+                token = self._responses.token()
+                replayed = True
+                stored = await self._lookup_async(engine, scope, key)
+                if stored is None:
+                    recorder = _Recorder(scope, key, request_hash)
+                    try:
+                        stored, replayed = recorder.result(await work(recorder.record_async)), False
+                    except Conflict:
+                        stored = await self._lookup_async(engine, scope, key)
+                        if stored is None:
+                            raise self._in_progress()
+                self._responses.put(cache_key, stored, token)
+                return _respond(stored, request_hash, replayed)
+            finally:
+                self._leave(cache_key, flight)
+
+    @staticmethod
+    def _lookup(engine, scope: str, key: str) -> Optional[Stored]:
+        if engine is None:
+            return None
+        with engine.connect() as conn:
+            return _from_row(conn.execute(_SELECT_SQL, {"scope": scope, "key": key}).first())
+
+    @staticmethod
+    async def _lookup_async(engine, scope: str, key: str) -> Optional[Stored]:
+        async with engine.connect() as conn:
+            return _from_row((await conn.execute(_SELECT_SQL, {"scope": scope, "key": key})).first())
+
+    def clear(self) -> None:
+        self._responses.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._flights)
+        return {**self._responses.stats(), "in_flight": in_flight, "coalesced": self.coalesced}
+
+
+def prune(engine, retention_h: float) -> int:
+    """Delete IdempotencyKey rows older than retention_h hours. Returns rows deleted."""
+    before = (datetime.utcnow() - timedelta(hours=retention_h)).isoformat()
+    with engine.begin() as conn:
+        return conn.execute(_PRUNE_SQL, {"before": before}).rowcount
+
+
+_cfg = settings["idempotency"]
+store = IdempotencyStore(int(_cfg["max_entries"]), float(_cfg["ttl_s"]), float(_cfg["wait_s"]))
+
+
+def main() -> None:
+    import argparse
+    import json
+
+    from . import db
+
+    parser = argparse.ArgumentParser(description="Delete expired Idempotency-Key records.")
+    parser.add_argument("--retention-h", type=float, default=float(_cfg["retention_h"]))
+    args = parser.parse_args()
+    if db.engine is None:
+        raise SystemExit("DB not configured")
+    print(json.dumps({"deleted": prune(db.engine, args.retention_h)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+In-process metrics, exposed in Prometheus text format on GET /metrics.
+
+- navigator_http_request_duration_seconds{method,route,status}: every
+  request, timed by MetricsMiddleware (route is the path template, e.g.
+  /intakes/{intake_id}, so ids don't explode the label set);
+- navigator_db_statement_duration_seconds{statement} and
+  navigator_db_statement_errors_total{statement}: every cursor execute on
+  an instrument_engine()'d engine, labelled "<VERB> <table>";
+- navigator_rules_evaluate_seconds{mode}: evaluate_rules_and_enqueue(_async);
+- navigator_rule_evaluations_total / _matches_total /
+  _evaluation_seconds_total{rule}: per routing rule.
+
+Recording is lock-free: each thread (the event loop is one) updates its
+own shard of plain dicts, and a scrape sums the shards. A scrape racing a
+write can see a histogram sample counted in _count but not yet in _sum;
+the next scrape is consistent again.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Sequence, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+from sqlalchemy import event
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds. Most routes and statements land in the low-millisecond buckets.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Distinct statement labels kept before new ones are folded into "other",
+# and SQL strings whose label is memoized.
+MAX_STATEMENT_LABELS = 200
+MAX_STATEMENT_CACHE = 2000
+
+_Key = Tuple[str, Tuple[str, ...]]
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: Dict[_Key, float] = {}
+        # [count per bucket (last is +Inf)..., sum]
+        self.histograms: Dict[_Key, List[float]] = {}
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[_Shard] = []
+        self._metrics: List[Any] = []
+
+    def shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> "Counter":
+        return self._add(Counter(self, name, help, tuple(labels)))
+
+    def histogram(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> "Histogram":
+        return self._add(Histogram(self, name, help, tuple(labels), tuple(buckets)))
+
+    def _add(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def _merged(self) -> Tuple[Dict[_Key, float], Dict[_Key, List[float]]]:
+        with self._lock:
+            shards = list(self._shards)
+        counters: Dict[_Key, float] = {}
+        histograms: Dict[_Key, List[float]] = {}
+        for shard in shards:
+            # list() of a dict is atomic under the GIL, so owners can keep writing.
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0.0) + value
+            for key, values in list(shard.histograms.items()):
+                total = histograms.get(key)
+                if total is None:
+                    histograms[key] = list(values)
+                else:
+                    for i, v in enumerate(values):
+                        total[i] += v
+        return counters, histograms
+
+    def render(self) -> str:
+        counters, histograms = self._merged()
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if metric.kind == "counter":
+                for (name, values), total in sorted(counters.items()):
+                    if name == metric.name:
+                        lines.append(f"{name}{_labels(metric.labels, values)} {_num(total)}")
+            else:
+                for (name, values), counts in sorted(histograms.items()):
+                    if name == metric.name:
+                        lines.extend(metric.sample_lines(values, counts))
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every metric (tests)."""
+        with self._lock:
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, registry: Registry, name: str, help: str, labels: Tuple[str, ...]) -> None:
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self.labels = labels
+
+    def inc(self, *label_values: str, value: float = 1.0) -> None:
+        counters = self._registry.shard().counters
+        key = (self.name, label_values)
+        counters[key] = counters.get(key, 0.0) + value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self, registry: Registry, name: str, help: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]
+    ) -> None:
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+
+    def observe(self, seconds: float, *label_values: str) -> None:
+        histograms = self._registry.shard().histograms
+        key = (self.name, label_values)
+        values = histograms.get(key)
+        if values is None:
+            values = histograms[key] = [0.0] * (len(self.buckets) + 2)
+        values[bisect_left(self.buckets, seconds)] += 1
+        values[-1] += seconds
+
+    def sample_lines(self, label_values: Tuple[str, ...], values: List[float]) -> List[str]:
+        lines = []
+        cumulative = 0.0
+        for le, count in zip(self.buckets + (float("inf"),), values):
+            cumulative += count
+            le_label = 'le="+Inf"' if le == float("inf") else f'le="{le!r}"'
+            lines.append(f"{self.name}_bucket{_labels(self.labels, label_values, le_label)} {_num(cumulative)}")
+        lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {_num(values[-1])}")
+        lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {_num(cumulative)}")
+        return lines
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "navigator_http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+db_statement_duration = registry.histogram(
+    "navigator_db_statement_duration_seconds", "Time per cursor execute, by statement kind and table.", ("statement",)
+)
+db_statement_errors = registry.counter(
+    "navigator_db_statement_errors_total", "Cursor executes that raised, by statement kind and table.", ("statement",)
+)
+rules_evaluate_duration = registry.histogram(
+    "navigator_rules_evaluate_seconds", "evaluate_rules_and_enqueue wall time (routing + enqueue).", ("mode",)
+)
+rule_evaluations = registry.counter(
+    "navigator_rule_evaluations_total", "Times each routing rule was checked.", ("rule",)
+)
+rule_matches = registry.counter("navigator_rule_matches_total", "Times each routing rule matched.", ("rule",))
+rule_seconds = registry.counter(
+    "navigator_rule_evaluation_seconds_total", "Time spent checking each routing rule.", ("rule",)
+)
+
+
+def observe_rule(rule: str, matched: bool, seconds: float) -> None:
+    rule_evaluations.inc(rule)
+    rule_seconds.inc(rule, value=seconds)
+    if matched:
+        rule_matches.inc(rule)
+
+
+# -----------------------
+# HTTP
+# -----------------------
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware request/response wrapping):
+    times each HTTP request to the end of its response body.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            http_request_duration.observe(time.perf_counter() - start, scope["method"], route, str(status))
+
+
+# -----------------------
+# DB
+# -----------------------
+_VERB_RE = re.compile(r"^\s*(\w+)")
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|MERGE)\s+([\w\[\]\".]+)", re.IGNORECASE)
+_statement_labels: Dict[str, str] = {}
+_known_labels: set = set()
+
+
+def statement_label(statement: str) -> str:
+    """"INSERT Intake", "SELECT QueueItem", ... for a SQL string (memoized)."""
+    label = _statement_labels.get(statement)
+    if label is not None:
+        return label
+
+    verb = _VERB_RE.match(statement)
+    label = verb.group(1).upper() if verb else "OTHER"
+    table = _TABLE_RE.search(statement)
+    if table:
+        label += " " + table.group(1).strip('[]"')
+    if label not in _known_labels:
+        if len(_known_labels) >= MAX_STATEMENT_LABELS:
+            label = "other"
+        else:
+            _known_labels.add(label)
+    if len(_statement_labels) < MAX_STATEMENT_CACHE:
+        _statement_labels[statement] = label
+    return label
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    start = getattr(context, "_metrics_start", None)
+    if start is not None:
+        db_statement_duration.observe(time.perf_counter() - start, statement_label(statement))
+
+
+def _handle_error(exception_context) -> None:
+    if exception_context.statement is not None:
+        db_statement_errors.inc(statement_label(exception_context.statement))
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement on engine (an Engine or AsyncEngine); idempotent."""
+    if engine is None:
+        return
+    target = getattr(engine, "sync_engine", engine)
+    if event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target, "handle_error", _handle_error)
+
+
+@router.get("/metrics")
+def metrics() -> Response:
+    return Response(registry.render(), media_type=CONTENT_TYPE)
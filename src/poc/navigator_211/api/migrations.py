@@ -0,0 +1,712 @@
+"""
+Versioned schema migrations for the SQLite and MSSQL stores.
+
+Each migration has one statement list per dialect and runs in its own
+transaction together with the SchemaVersion row that records it, so a
+database is always at exactly one version. Version 1 uses IF NOT EXISTS
+guards, so databases created by the old bootstrap scripts are adopted
+without changes.
+
+Add new schema (tables, indexes, triggers) as a new migration at the end
+of MIGRATIONS; never edit one that has shipped.
+
+Usage (from the project root):
+    python -m api.migrations              # upgrade to latest
+    python -m api.migrations --status
+    python -m api.migrations --target 2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from . import db
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    sqlite: List[str]
+    mssql: List[str]
+    # Run the MSSQL statements outside a transaction (full-text DDL refuses
+    # to run inside one). They must be idempotent: SchemaVersion is only
+    # written after the last one succeeds, so a failed run is retried whole.
+    mssql_autocommit: bool = False
+
+
+# Shared by both dialects: fill IntakeCurrentQueue from QueueItem history
+# unless it already has rows.
+_FILL_CURRENT_QUEUE = """
+    INSERT INTO IntakeCurrentQueue (IntakeId, QueueItemId, QueueName, Status, Reason, UpdatedAt)
+    SELECT q.IntakeId, q.QueueItemId, q.QueueName, q.Status, q.Reason, q.CreatedAt
+    FROM QueueItem q
+    JOIN (
+        SELECT IntakeId, MAX(QueueItemId) AS max_qid
+        FROM QueueItem
+        GROUP BY IntakeId
+    ) lq ON lq.max_qid = q.QueueItemId
+    WHERE NOT EXISTS (SELECT 1 FROM IntakeCurrentQueue)
+"""
+
+
+# Both dialects: seed QueueStat from the current assignments if empty.
+_FILL_QUEUE_STAT = """
+    INSERT INTO QueueStat (QueueName, Status, ItemCount, CrisisCount)
+    SELECT c.QueueName, c.Status, COUNT(*), SUM(CASE WHEN i.Crisis = 1 THEN 1 ELSE 0 END)
+    FROM IntakeCurrentQueue c
+    LEFT JOIN Intake i ON i.IntakeId = c.IntakeId
+    WHERE NOT EXISTS (SELECT 1 FROM QueueStat)
+    GROUP BY c.QueueName, c.Status
+"""
+
+
+# Top-level scalar members of each intake's AttributesJson object, one row
+# per (IntakeId, Name), as attributes.py writes them on insert. Seeds
+# IntakeAttribute for intakes that existed before migration 6.
+_FILL_INTAKE_ATTRIBUTE = {
+    "sqlite": """
+        INSERT INTO IntakeAttribute (IntakeId, Name, TextValue, NumValue)
+        SELECT i.IntakeId, j.key,
+               CASE j.type WHEN 'true' THEN 'true' WHEN 'false' THEN 'false' ELSE CAST(j.value AS TEXT) END,
+               CASE WHEN j.type IN ('integer', 'real') THEN j.value END
+        FROM Intake i, json_each(
+            CASE WHEN json_valid(i.AttributesJson) THEN
+                CASE WHEN json_type(i.AttributesJson) = 'object' THEN i.AttributesJson END
+            END) j
+        WHERE j.type IN ('text', 'integer', 'real', 'true', 'false')
+          AND length(j.key) <= 100 AND length(CAST(j.value AS TEXT)) <= 300
+          AND NOT EXISTS (SELECT 1 FROM IntakeAttribute)
+    """,
+    "mssql": """
+        INSERT INTO IntakeAttribute (IntakeId, Name, TextValue, NumValue)
+        SELECT i.IntakeId, j.[key], j.[value], CASE WHEN j.[type] = 2 THEN TRY_CAST(j.[value] AS FLOAT) END
+        FROM Intake i
+        CROSS APPLY OPENJSON(
+            CASE WHEN ISJSON(i.AttributesJson) = 1 AND LEFT(LTRIM(i.AttributesJson), 1) = '{'
+                 THEN i.AttributesJson END) j
+        WHERE j.[type] IN (1, 2, 3)
+          AND LEN(j.[key]) <= 100 AND LEN(j.[value]) <= 300
+          AND NOT EXISTS (SELECT 1 FROM IntakeAttribute)
+    """,
+}
+
+
+def _mssql_index(name: str, table: str, columns: str, include: str = "") -> str:
+    return (
+        f"IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{name}' AND object_id = OBJECT_ID('{table}')) "
+        f"CREATE INDEX {name} ON {table}({columns}){f' INCLUDE ({include})' if include else ''}"
+    )
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "base tables",
+        sqlite=[
+            """
+            CREATE TABLE IF NOT EXISTS Intake (
+              IntakeId INTEGER PRIMARY KEY AUTOINCREMENT,
+              CreatedAt TEXT NOT NULL,
+              CallerId TEXT,
+              Channel TEXT,
+              DomainModule TEXT,
+              Priority TEXT,
+              Crisis INTEGER,
+              Narrative TEXT,
+              AttributesJson TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS QueueItem (
+              QueueItemId INTEGER PRIMARY KEY AUTOINCREMENT,
+              IntakeId INTEGER NOT NULL,
+              QueueName TEXT NOT NULL,
+              Status TEXT NOT NULL,
+              Reason TEXT,
+              CreatedAt TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS Rule (
+              RuleId INTEGER PRIMARY KEY AUTOINCREMENT,
+              RuleName TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS RuleResult (
+              RuleResultId INTEGER PRIMARY KEY AUTOINCREMENT,
+              IntakeId INTEGER NOT NULL,
+              RuleId INTEGER NOT NULL,
+              Action TEXT NOT NULL,
+              OutcomeJson TEXT,
+              EvaluatedAt TEXT NOT NULL
+            )
+            """,
+        ],
+        mssql=[
+            """
+            IF OBJECT_ID('Intake', 'U') IS NULL
+            CREATE TABLE Intake (
+              IntakeId INT IDENTITY(1,1) PRIMARY KEY,
+              CreatedAt DATETIME2(7) NOT NULL,
+              CallerId NVARCHAR(100) NULL,
+              Channel NVARCHAR(50) NULL,
+              DomainModule NVARCHAR(100) NULL,
+              Priority NVARCHAR(20) NULL,
+              Crisis BIT NULL,
+              Narrative NVARCHAR(MAX) NULL,
+              AttributesJson NVARCHAR(MAX) NULL
+            )
+            """,
+            """
+            IF OBJECT_ID('QueueItem', 'U') IS NULL
+            CREATE TABLE QueueItem (
+              QueueItemId INT IDENTITY(1,1) PRIMARY KEY,
+              IntakeId INT NOT NULL,
+              QueueName NVARCHAR(100) NOT NULL,
+              Status NVARCHAR(20) NOT NULL,
+              Reason NVARCHAR(400) NULL,
+              CreatedAt DATETIME2(7) NOT NULL
+            )
+            """,
+            """
+            IF OBJECT_ID('Rule', 'U') IS NULL
+            CREATE TABLE [Rule] (
+              RuleId INT IDENTITY(1,1) PRIMARY KEY,
+              RuleName NVARCHAR(200) NOT NULL
+            )
+            """,
+            """
+            IF OBJECT_ID('RuleResult', 'U') IS NULL
+            CREATE TABLE RuleResult (
+              RuleResultId INT IDENTITY(1,1) PRIMARY KEY,
+              IntakeId INT NOT NULL,
+              RuleId INT NOT NULL,
+              Action NVARCHAR(50) NOT NULL,
+              OutcomeJson NVARCHAR(MAX) NULL,
+              EvaluatedAt DATETIME2(7) NOT NULL
+            )
+            """,
+        ],
+    ),
+    Migration(
+        2,
+        "indexes for paging and latest-queue lookups",
+        sqlite=[
+            "CREATE INDEX IF NOT EXISTS IX_Intake_CreatedAt ON Intake(CreatedAt)",
+            "CREATE INDEX IF NOT EXISTS IX_QueueItem_Intake ON QueueItem(IntakeId, QueueItemId)",
+            "CREATE INDEX IF NOT EXISTS IX_QueueItem_Queue ON QueueItem(QueueName, QueueItemId)",
+            "CREATE INDEX IF NOT EXISTS IX_QueueItem_Status ON QueueItem(Status, QueueItemId)",
+            "CREATE INDEX IF NOT EXISTS IX_RuleResult_Intake ON RuleResult(IntakeId, RuleResultId)",
+        ],
+        mssql=[
+            _mssql_index("IX_Intake_CreatedAt", "Intake", "CreatedAt"),
+            _mssql_index("IX_QueueItem_Intake", "QueueItem", "IntakeId, QueueItemId DESC"),
+            _mssql_index("IX_QueueItem_Queue", "QueueItem", "QueueName, QueueItemId DESC",
+                         "IntakeId, Status, Reason, CreatedAt"),
+            _mssql_index("IX_QueueItem_Status", "QueueItem", "Status, QueueItemId DESC",
+                         "IntakeId, QueueName, Reason, CreatedAt"),
+            _mssql_index("IX_RuleResult_Intake", "RuleResult", "IntakeId, RuleResultId"),
+        ],
+    ),
+    Migration(
+        3,
+        "IntakeCurrentQueue projection",
+        sqlite=[
+            """
+            CREATE TABLE IF NOT EXISTS IntakeCurrentQueue (
+              IntakeId INTEGER PRIMARY KEY,
+              QueueItemId INTEGER NOT NULL,
+              QueueName TEXT NOT NULL,
+              Status TEXT NOT NULL,
+              Reason TEXT,
+              UpdatedAt TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS IX_IntakeCurrentQueue_Queue ON IntakeCurrentQueue(QueueName, IntakeId)",
+            "CREATE INDEX IF NOT EXISTS IX_IntakeCurrentQueue_Status ON IntakeCurrentQueue(Status, IntakeId)",
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_QueueItem_Insert_Current AFTER INSERT ON QueueItem
+            BEGIN
+              INSERT INTO IntakeCurrentQueue (IntakeId, QueueItemId, QueueName, Status, Reason, UpdatedAt)
+              VALUES (NEW.IntakeId, NEW.QueueItemId, NEW.QueueName, NEW.Status, NEW.Reason, NEW.CreatedAt)
+              ON CONFLICT (IntakeId) DO UPDATE SET
+                QueueItemId = excluded.QueueItemId,
+                QueueName = excluded.QueueName,
+                Status = excluded.Status,
+                Reason = excluded.Reason,
+                UpdatedAt = excluded.UpdatedAt
+              WHERE excluded.QueueItemId > IntakeCurrentQueue.QueueItemId;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_QueueItem_Update_Current AFTER UPDATE OF Status, Reason ON QueueItem
+            BEGIN
+              UPDATE IntakeCurrentQueue SET Status = NEW.Status, Reason = NEW.Reason
+              WHERE QueueItemId = NEW.QueueItemId;
+            END
+            """,
+            # Databases that predate IntakeCurrentQueue: fill it from history.
+            _FILL_CURRENT_QUEUE,
+        ],
+        mssql=[
+            """
+            IF OBJECT_ID('IntakeCurrentQueue', 'U') IS NULL
+            CREATE TABLE IntakeCurrentQueue (
+              IntakeId INT NOT NULL PRIMARY KEY,
+              QueueItemId INT NOT NULL,
+              QueueName NVARCHAR(100) NOT NULL,
+              Status NVARCHAR(20) NOT NULL,
+              Reason NVARCHAR(400) NULL,
+              UpdatedAt DATETIME2(7) NOT NULL
+            )
+            """,
+            _mssql_index("IX_IntakeCurrentQueue_Queue", "IntakeCurrentQueue", "QueueName, IntakeId DESC"),
+            _mssql_index("IX_IntakeCurrentQueue_Status", "IntakeCurrentQueue", "Status, IntakeId DESC"),
+            """
+            CREATE OR ALTER TRIGGER TR_QueueItem_Current ON QueueItem
+            AFTER INSERT, UPDATE
+            AS
+            BEGIN
+                SET NOCOUNT ON;
+                MERGE IntakeCurrentQueue AS c
+                USING (
+                    SELECT i.IntakeId, i.QueueItemId, i.QueueName, i.Status, i.Reason, i.CreatedAt
+                    FROM inserted i
+                    WHERE i.QueueItemId = (SELECT MAX(x.QueueItemId) FROM inserted x WHERE x.IntakeId = i.IntakeId)
+                ) AS n
+                ON c.IntakeId = n.IntakeId
+                WHEN MATCHED AND n.QueueItemId >= c.QueueItemId THEN
+                    UPDATE SET QueueItemId = n.QueueItemId, QueueName = n.QueueName, Status = n.Status,
+                               Reason = n.Reason, UpdatedAt = n.CreatedAt
+                WHEN NOT MATCHED THEN
+                    INSERT (IntakeId, QueueItemId, QueueName, Status, Reason, UpdatedAt)
+                    VALUES (n.IntakeId, n.QueueItemId, n.QueueName, n.Status, n.Reason, n.CreatedAt);
+            END
+            """,
+            _FILL_CURRENT_QUEUE,
+        ],
+    ),
+    Migration(
+        4,
+        "queue item claims",
+        sqlite=[
+            "ALTER TABLE QueueItem ADD COLUMN ClaimedBy TEXT",
+            "ALTER TABLE QueueItem ADD COLUMN ClaimedAt TEXT",
+            "ALTER TABLE QueueItem ADD COLUMN LeaseExpiresAt TEXT",
+            "CREATE INDEX IF NOT EXISTS IX_QueueItem_Claim ON QueueItem(QueueName, Status, QueueItemId)",
+        ],
+        mssql=[
+            """
+            ALTER TABLE QueueItem ADD
+              ClaimedBy NVARCHAR(100) NULL,
+              ClaimedAt DATETIME2(7) NULL,
+              LeaseExpiresAt DATETIME2(7) NULL
+            """,
+            _mssql_index("IX_QueueItem_Claim", "QueueItem", "QueueName, Status, QueueItemId"),
+        ],
+    ),
+    Migration(
+        5,
+        "QueueStat counters",
+        sqlite=[
+            """
+            CREATE TABLE IF NOT EXISTS QueueStat (
+              QueueName TEXT NOT NULL,
+              Status TEXT NOT NULL,
+              ItemCount INTEGER NOT NULL DEFAULT 0,
+              CrisisCount INTEGER NOT NULL DEFAULT 0,
+              PRIMARY KEY (QueueName, Status)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS IX_IntakeCurrentQueue_Oldest ON IntakeCurrentQueue(QueueName, Status, QueueItemId)",
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_IntakeCurrentQueue_Insert_Stat AFTER INSERT ON IntakeCurrentQueue
+            BEGIN
+              INSERT INTO QueueStat (QueueName, Status, ItemCount, CrisisCount)
+              VALUES (NEW.QueueName, NEW.Status, 1,
+                      COALESCE((SELECT Crisis FROM Intake WHERE IntakeId = NEW.IntakeId), 0))
+              ON CONFLICT (QueueName, Status) DO UPDATE SET
+                ItemCount = ItemCount + 1,
+                CrisisCount = CrisisCount + excluded.CrisisCount;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_IntakeCurrentQueue_Update_Stat AFTER UPDATE OF QueueName, Status ON IntakeCurrentQueue
+            WHEN OLD.QueueName IS NOT NEW.QueueName OR OLD.Status IS NOT NEW.Status
+            BEGIN
+              UPDATE QueueStat SET
+                ItemCount = ItemCount - 1,
+                CrisisCount = CrisisCount - COALESCE((SELECT Crisis FROM Intake WHERE IntakeId = OLD.IntakeId), 0)
+              WHERE QueueName = OLD.QueueName AND Status = OLD.Status;
+              INSERT INTO QueueStat (QueueName, Status, ItemCount, CrisisCount)
+              VALUES (NEW.QueueName, NEW.Status, 1,
+                      COALESCE((SELECT Crisis FROM Intake WHERE IntakeId = NEW.IntakeId), 0))
+              ON CONFLICT (QueueName, Status) DO UPDATE SET
+                ItemCount = ItemCount + 1,
+                CrisisCount = CrisisCount + excluded.CrisisCount;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_IntakeCurrentQueue_Delete_Stat AFTER DELETE ON IntakeCurrentQueue
+            BEGIN
+              UPDATE QueueStat SET
+                ItemCount = ItemCount - 1,
+                CrisisCount = CrisisCount - COALESCE((SELECT Crisis FROM Intake WHERE IntakeId = OLD.IntakeId), 0)
+              WHERE QueueName = OLD.QueueName AND Status = OLD.Status;
+            END
+            """,
+            _FILL_QUEUE_STAT,
+        ],
+        mssql=[
+            """
+            IF OBJECT_ID('QueueStat', 'U') IS NULL
+            CREATE TABLE QueueStat (
+              QueueName NVARCHAR(100) NOT NULL,
+              Status NVARCHAR(20) NOT NULL,
+              ItemCount INT NOT NULL DEFAULT 0,
+              CrisisCount INT NOT NULL DEFAULT 0,
+              CONSTRAINT PK_QueueStat PRIMARY KEY (QueueName, Status)
+            )
+            """,
+            _mssql_index("IX_IntakeCurrentQueue_Oldest", "IntakeCurrentQueue", "QueueName, Status, QueueItemId"),
+            """
+            CREATE OR ALTER TRIGGER TR_IntakeCurrentQueue_Stat ON IntakeCurrentQueue
+            AFTER INSERT, UPDATE, DELETE
+            AS
+            BEGIN
+                SET NOCOUNT ON;
+                MERGE QueueStat AS s
+                USING (
+                    SELECT d.QueueName, d.Status, SUM(d.Items) AS Items, SUM(d.Crisis) AS Crisis
+                    FROM (
+                        SELECT n.QueueName, n.Status, 1 AS Items, CAST(COALESCE(i.Crisis, 0) AS INT) AS Crisis
+                        FROM inserted n LEFT JOIN Intake i ON i.IntakeId = n.IntakeId
+                        UNION ALL
+                        SELECT o.QueueName, o.Status, -1, -CAST(COALESCE(i.Crisis, 0) AS INT)
+                        FROM deleted o LEFT JOIN Intake i ON i.IntakeId = o.IntakeId
+                    ) d
+                    GROUP BY d.QueueName, d.Status
+                ) AS delta
+                ON s.QueueName = delta.QueueName AND s.Status = delta.Status
+                WHEN MATCHED THEN
+                    UPDATE SET ItemCount = s.ItemCount + delta.Items, CrisisCount = s.CrisisCount + delta.Crisis
+                WHEN NOT MATCHED THEN
+                    INSERT (QueueName, Status, ItemCount, CrisisCount)
+                    VALUES (delta.QueueName, delta.Status, delta.Items, delta.Crisis);
+            END
+            """,
+            _FILL_QUEUE_STAT,
+        ],
+    ),
+    Migration(
+        6,
+        "IntakeAttribute index",
+        sqlite=[
+            """
+            CREATE TABLE IF NOT EXISTS IntakeAttribute (
+              IntakeId INTEGER NOT NULL,
+              Name TEXT NOT NULL,
+              TextValue TEXT,
+              NumValue REAL,
+              PRIMARY KEY (IntakeId, Name)
+            ) WITHOUT ROWID
+            """,
+            "CREATE INDEX IF NOT EXISTS IX_IntakeAttribute_Text ON IntakeAttribute(Name, TextValue, IntakeId)",
+            "CREATE INDEX IF NOT EXISTS IX_IntakeAttribute_Num ON IntakeAttribute(Name, NumValue, IntakeId)",
+            _FILL_INTAKE_ATTRIBUTE["sqlite"],
+        ],
+        mssql=[
+            """
+            IF OBJECT_ID('IntakeAttribute', 'U') IS NULL
+            CREATE TABLE IntakeAttribute (
+              IntakeId INT NOT NULL,
+              Name NVARCHAR(100) NOT NULL,
+              TextValue NVARCHAR(300) NULL,
+              NumValue FLOAT NULL,
+              CONSTRAINT PK_IntakeAttribute PRIMARY KEY (IntakeId, Name)
+            )
+            """,
+            _mssql_index("IX_IntakeAttribute_Text", "IntakeAttribute", "Name, TextValue, IntakeId"),
+            _mssql_index("IX_IntakeAttribute_Num", "IntakeAttribute", "Name, NumValue, IntakeId"),
+            _FILL_INTAKE_ATTRIBUTE["mssql"],
+        ],
+    ),
+    Migration(
+        7,
+        "Narrative full-text search",
+        sqlite=[
+            # External-content FTS5 index over Intake.Narrative (rowid =
+            # IntakeId); the triggers keep it in step with Intake writes.
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS IntakeNarrativeFts USING fts5(
+              Narrative, content='Intake', content_rowid='IntakeId', tokenize='unicode61 remove_diacritics 2'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Intake_Fts_Insert AFTER INSERT ON Intake
+            WHEN NEW.Narrative IS NOT NULL
+            BEGIN
+              INSERT INTO IntakeNarrativeFts (rowid, Narrative) VALUES (NEW.IntakeId, NEW.Narrative);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Intake_Fts_Update AFTER UPDATE OF Narrative ON Intake
+            BEGIN
+              INSERT INTO IntakeNarrativeFts (IntakeNarrativeFts, rowid, Narrative)
+              SELECT 'delete', OLD.IntakeId, OLD.Narrative WHERE OLD.Narrative IS NOT NULL;
+              INSERT INTO IntakeNarrativeFts (rowid, Narrative)
+              SELECT NEW.IntakeId, NEW.Narrative WHERE NEW.Narrative IS NOT NULL;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Intake_Fts_Delete AFTER DELETE ON Intake
+            WHEN OLD.Narrative IS NOT NULL
+            BEGIN
+              INSERT INTO IntakeNarrativeFts (IntakeNarrativeFts, rowid, Narrative)
+              VALUES ('delete', OLD.IntakeId, OLD.Narrative);
+            END
+            """,
+            "INSERT INTO IntakeNarrativeFts (IntakeNarrativeFts) VALUES ('rebuild')",
+        ],
+        mssql=[
+            "IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'ftIntake') CREATE FULLTEXT CATALOG ftIntake",
+            # The key index is the (system-named) primary key. CHANGE_TRACKING
+            # AUTO populates new and edited narratives in the background.
+            """
+            IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('Intake'))
+            BEGIN
+                DECLARE @sql NVARCHAR(MAX) =
+                    N'CREATE FULLTEXT INDEX ON Intake(Narrative) KEY INDEX '
+                    + QUOTENAME((SELECT name FROM sys.indexes WHERE object_id = OBJECT_ID('Intake') AND is_primary_key = 1))
+                    + N' ON ftIntake WITH CHANGE_TRACKING AUTO';
+                EXEC sp_executesql @sql;
+            END
+            """,
+        ],
+        mssql_autocommit=True,
+    ),
+    Migration(
+        8,
+        "IdempotencyKey",
+        sqlite=[
+            """
+            CREATE TABLE IF NOT EXISTS IdempotencyKey (
+              Scope TEXT NOT NULL,
+              IdemKey TEXT NOT NULL,
+              RequestHash TEXT NOT NULL,
+              StatusCode INTEGER NOT NULL,
+              ResponseJson TEXT NOT NULL,
+              CreatedAt TEXT NOT NULL,
+              PRIMARY KEY (Scope, IdemKey)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS IX_IdempotencyKey_CreatedAt ON IdempotencyKey(CreatedAt)",
+        ],
+        mssql=[
+            """
+            IF OBJECT_ID('IdempotencyKey', 'U') IS NULL
+            CREATE TABLE IdempotencyKey (
+              Scope NVARCHAR(50) NOT NULL,
+              IdemKey NVARCHAR(255) NOT NULL,
+              RequestHash CHAR(64) NOT NULL,
+              StatusCode SMALLINT NOT NULL,
+              ResponseJson NVARCHAR(MAX) NOT NULL,
+              CreatedAt DATETIME2(7) NOT NULL,
+              CONSTRAINT PK_IdempotencyKey PRIMARY KEY (Scope, IdemKey)
+            )
+            """,
+            _mssql_index("IX_IdempotencyKey_CreatedAt", "IdempotencyKey", "CreatedAt"),
+        ],
+    ),
+    Migration(
+        9,
+        "time indexes for exports",
+        sqlite=[
+            "CREATE INDEX IF NOT EXISTS IX_QueueItem_CreatedAt ON QueueItem(CreatedAt)",
+            "CREATE INDEX IF NOT EXISTS IX_RuleResult_EvaluatedAt ON RuleResult(EvaluatedAt)",
+        ],
+        mssql=[
+            _mssql_index("IX_QueueItem_CreatedAt", "QueueItem", "CreatedAt"),
+            _mssql_index("IX_RuleResult_EvaluatedAt", "RuleResult", "EvaluatedAt"),
+        ],
+    ),
+    Migration(
+        10,
+        "IntakeCurrentQueue.Crisis for claims",
+        sqlite=[
+            "ALTER TABLE IntakeCurrentQueue ADD COLUMN Crisis INTEGER NOT NULL DEFAULT 0",
+            """
+            UPDATE IntakeCurrentQueue
+            SET Crisis = COALESCE((SELECT i.Crisis FROM Intake i WHERE i.IntakeId = IntakeCurrentQueue.IntakeId), 0)
+            """,
+            "CREATE INDEX IF NOT EXISTS IX_IntakeCurrentQueue_Claim ON IntakeCurrentQueue(QueueName, Status, Crisis DESC, QueueItemId)",
+            "DROP TRIGGER IF EXISTS TR_QueueItem_Insert_Current",
+            """
+            CREATE TRIGGER TR_QueueItem_Insert_Current AFTER INSERT ON QueueItem
+            BEGIN
+              INSERT INTO IntakeCurrentQueue (IntakeId, QueueItemId, QueueName, Status, Reason, UpdatedAt, Crisis)
+              VALUES (NEW.IntakeId, NEW.QueueItemId, NEW.QueueName, NEW.Status, NEW.Reason, NEW.CreatedAt,
+                      COALESCE((SELECT Crisis FROM Intake WHERE IntakeId = NEW.IntakeId), 0))
+              ON CONFLICT (IntakeId) DO UPDATE SET
+                QueueItemId = excluded.QueueItemId,
+                QueueName = excluded.QueueName,
+                Status = excluded.Status,
+                Reason = excluded.Reason,
+                UpdatedAt = excluded.UpdatedAt,
+                Crisis = excluded.Crisis
+              WHERE excluded.QueueItemId > IntakeCurrentQueue.QueueItemId;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TR_Intake_Update_CurrentCrisis AFTER UPDATE OF Crisis ON Intake
+            BEGIN
+              UPDATE IntakeCurrentQueue SET Crisis = COALESCE(NEW.Crisis, 0) WHERE IntakeId = NEW.IntakeId;
+            END
+            """,
+        ],
+        mssql=[
+            """
+            IF COL_LENGTH('IntakeCurrentQueue', 'Crisis') IS NULL
+            ALTER TABLE IntakeCurrentQueue ADD Crisis BIT NOT NULL
+              CONSTRAINT DF_IntakeCurrentQueue_Crisis DEFAULT 0
+            """,
+            """
+            UPDATE c SET Crisis = COALESCE(i.Crisis, 0)
+            FROM IntakeCurrentQueue c
+            JOIN Intake i ON i.IntakeId = c.IntakeId
+            """,
+            _mssql_index("IX_IntakeCurrentQueue_Claim", "IntakeCurrentQueue", "QueueName, Status, Crisis DESC, QueueItemId"),
+            """
+            CREATE OR ALTER TRIGGER TR_QueueItem_Current ON QueueItem
+            AFTER INSERT, UPDATE
+            AS
+            BEGIN
+                SET NOCOUNT ON;
+                MERGE IntakeCurrentQueue AS c
+                USING (
+                    SELECT n.IntakeId, n.QueueItemId, n.QueueName, n.Status, n.Reason, n.CreatedAt,
+                           COALESCE(i.Crisis, 0) AS Crisis
+                    FROM inserted n
+                    LEFT JOIN Intake i ON i.IntakeId = n.IntakeId
+                    WHERE n.QueueItemId = (SELECT MAX(x.QueueItemId) FROM inserted x WHERE x.IntakeId = n.IntakeId)
+                ) AS n
+                ON c.IntakeId = n.IntakeId
+                WHEN MATCHED AND n.QueueItemId >= c.QueueItemId THEN
+                    UPDATE SET QueueItemId = n.QueueItemId, QueueName = n.QueueName, Status = n.Status,
+                               Reason = n.Reason, UpdatedAt = n.CreatedAt, Crisis = n.Crisis
+                WHEN NOT MATCHED THEN
+                    INSERT (IntakeId, QueueItemId, QueueName, Status, Reason, UpdatedAt, Crisis)
+                    VALUES (n.IntakeId, n.QueueItemId, n.QueueName, n.Status, n.Reason, n.CreatedAt, n.Crisis);
+            END
+            """,
+            """
+            CREATE OR ALTER TRIGGER TR_Intake_CurrentCrisis ON Intake
+            AFTER UPDATE
+            AS
+            BEGIN
+                SET NOCOUNT ON;
+                IF UPDATE(Crisis)
+                    UPDATE c SET Crisis = COALESCE(n.Crisis, 0)
+                    FROM IntakeCurrentQueue c
+                    JOIN inserted n ON n.IntakeId = c.IntakeId;
+            END
+            """,
+        ],
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+_CREATE_SCHEMA_VERSION = {
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS SchemaVersion (
+          Version INTEGER PRIMARY KEY,
+          Name TEXT NOT NULL,
+          AppliedAt TEXT NOT NULL
+        )
+    """,
+    "mssql": """
+        IF OBJECT_ID('SchemaVersion', 'U') IS NULL
+        CREATE TABLE SchemaVersion (
+          Version INT NOT NULL PRIMARY KEY,
+          Name NVARCHAR(200) NOT NULL,
+          AppliedAt DATETIME2(7) NOT NULL
+        )
+    """,
+}
+
+_INSERT_SCHEMA_VERSION = text("INSERT INTO SchemaVersion (Version, Name, AppliedAt) VALUES (:v, :n, :at)")
+
+
+def _dialect(conn: Connection) -> str:
+    name = conn.dialect.name
+    if name not in _CREATE_SCHEMA_VERSION:
+        raise RuntimeError(f"No migrations for dialect {name!r}")
+    return name
+
+
+def applied_versions(conn: Connection) -> List[int]:
+    conn.exec_driver_sql(_CREATE_SCHEMA_VERSION[_dialect(conn)])
+    return [int(v) for v in conn.execute(text("SELECT Version FROM SchemaVersion ORDER BY Version")).scalars()]
+
+
+def migrate(engine: Optional[Engine] = None, target: Optional[int] = None) -> List[int]:
+    """Apply pending migrations up to target (default: latest). Returns versions applied."""
+    engine = engine if engine is not None else db.engine
+    if engine is None:
+        return []
+    target = LATEST_VERSION if target is None else target
+
+    with engine.begin() as conn:
+        done = set(applied_versions(conn))
+
+    applied = []
+    for m in MIGRATIONS:
+        if m.version > target or m.version in done:
+            continue
+        stmts: List[str] = getattr(m, engine.dialect.name)
+        if m.mssql_autocommit and engine.dialect.name == "mssql":
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for stmt in stmts:
+                    conn.exec_driver_sql(stmt)
+            stmts = []
+        with engine.begin() as conn:
+            for stmt in stmts:
+                conn.exec_driver_sql(stmt)
+            conn.execute(_INSERT_SCHEMA_VERSION, {"v": m.version, "n": m.name, "at": datetime.utcnow().isoformat()})
+        applied.append(m.version)
+    return applied
+
+
+def status(engine: Optional[Engine] = None) -> Dict[str, object]:
+    engine = engine if engine is not None else db.engine
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+    return {
+        "current": max(done, default=0),
+        "latest": LATEST_VERSION,
+        "pending": [m.version for m in MIGRATIONS if m.version not in done],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Apply schema migrations.")
+    parser.add_argument("--target", type=int, help="stop at this version (default: latest)")
+    parser.add_argument("--status", action="store_true", help="show current/pending versions and exit")
+    args = parser.parse_args(argv)
+
+    if db.engine is None:
+        raise SystemExit("DB not configured")
+    if not args.status:
+        print(json.dumps({"applied": migrate(target=args.target)}))
+    print(json.dumps(status(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -31,3 +31,12 @@ class HealthResponse(BaseModel):
     status: str
     db: str
     version: str
+
+
+class ClaimRequest(BaseModel):
+    worker: str = Field(..., min_length=1, max_length=100, description="caseworker / tool id")
+    lease_seconds: int = Field(300, ge=1, le=86400, description="claim expires (and is re-offered) after this")
+
+
+class CloseRequest(BaseModel):
+    worker: str = Field(..., min_length=1, max_length=100)
@@ -0,0 +1,195 @@
+"""
+Per-queue counters for GET /queues/stats.
+
+QueueStat holds ItemCount and CrisisCount per (QueueName, Status) of the
+intakes' current assignments. Triggers on IntakeCurrentQueue (migration 5)
+adjust it in the same transaction as every enqueue, requeue, claim and
+close, so reading stats is O(queues x statuses) no matter how much
+history QueueItem holds. reconcile() recounts from the base tables to
+correct drift (e.g. an Intake's Crisis flag edited by hand); the app runs
+it every queue_stats.reconcile_interval_s seconds.
+
+Usage (from the project root):
+    python -m api.queue_stats           # reconcile once and print the corrections
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter
+from sqlalchemy import text
+
+from . import db
+from .settings import settings
+
+log = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Statuses that still need a caseworker.
+OPEN_STATUSES = ("New", "Open", "InProgress")
+
+# Per (queue, status): the counters plus the CreatedAt of the oldest current
+# item, found with a MIN seek on IX_IntakeCurrentQueue_Oldest.
+_STATS_SQL = text(
+    """
+    SELECT
+        s.QueueName,
+        s.Status,
+        s.ItemCount,
+        s.CrisisCount,
+        (SELECT q.CreatedAt FROM QueueItem q
+         WHERE q.QueueItemId = (
+             SELECT MIN(c.QueueItemId) FROM IntakeCurrentQueue c
+             WHERE c.QueueName = s.QueueName AND c.Status = s.Status
+         )) AS OldestCreatedAt
+    FROM QueueStat s
+    WHERE s.ItemCount <> 0 OR s.CrisisCount <> 0
+    ORDER BY s.QueueName, s.Status
+    """
+)
+
+_RECOUNT_SQL = text(
+    """
+    SELECT c.QueueName, c.Status, COUNT(*) AS ItemCount,
+           SUM(CASE WHEN i.Crisis = 1 THEN 1 ELSE 0 END) AS CrisisCount
+    FROM IntakeCurrentQueue c
+    LEFT JOIN Intake i ON i.IntakeId = c.IntakeId
+    GROUP BY c.QueueName, c.Status
+    """
+)
+
+Counts = Dict[Tuple[str, str], Tuple[int, int]]
+
+
+def _parse_ts(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def read_stats(conn, now: Optional[datetime] = None) -> Dict[str, Any]:
+    now = now or datetime.utcnow()
+    queues: Dict[str, Dict[str, Any]] = {}
+    for r in conn.execute(_STATS_SQL).mappings():
+        q = queues.setdefault(
+            r["QueueName"],
+            {"queue": r["QueueName"], "total": 0, "open": 0, "crisis": 0, "crisis_open": 0,
+             "by_status": {}, "oldest_open_created_at": None, "oldest_open_age_s": None},
+        )
+        count, crisis = int(r["ItemCount"]), int(r["CrisisCount"] or 0)
+        q["by_status"][r["Status"]] = count
+        q["total"] += count
+        q["crisis"] += crisis
+        if r["Status"] in OPEN_STATUSES:
+            q["open"] += count
+            q["crisis_open"] += crisis
+            oldest = _parse_ts(r["OldestCreatedAt"])
+            if oldest is not None and (q["oldest_open_created_at"] is None or oldest < q["oldest_open_created_at"]):
+                q["oldest_open_created_at"] = oldest
+
+    for q in queues.values():
+        if q["oldest_open_created_at"] is not None:
+            q["oldest_open_age_s"] = max(0.0, (now - q["oldest_open_created_at"]).total_seconds())
+            q["oldest_open_created_at"] = q["oldest_open_created_at"].isoformat()
+
+    return {"generated_at": now.isoformat(), "queues": list(queues.values())}
+
+
+def reconcile(conn) -> List[Dict[str, Any]]:
+    """
+    Recount QueueStat from IntakeCurrentQueue + Intake on conn's transaction
+    and return the rows that had drifted ({queue, status, was, now}).
+    """
+    stored: Counts = {
+        (r[0], r[1]): (int(r[2]), int(r[3]))
+        for r in conn.execute(text("SELECT QueueName, Status, ItemCount, CrisisCount FROM QueueStat"))
+    }
+    actual: Counts = {(r[0], r[1]): (int(r[2]), int(r[3] or 0)) for r in conn.execute(_RECOUNT_SQL)}
+
+    drift = []
+    for key in sorted(stored.keys() | actual.keys()):
+        was, now = stored.get(key, (0, 0)), actual.get(key, (0, 0))
+        if was != now:
+            drift.append({"queue": key[0], "status": key[1],
+                          "was": {"items": was[0], "crisis": was[1]},
+                          "now": {"items": now[0], "crisis": now[1]}})
+
+    if drift:
+        conn.execute(text("DELETE FROM QueueStat"))
+        conn.execute(
+            text("INSERT INTO QueueStat (QueueName, Status, ItemCount, CrisisCount) VALUES (:q, :s, :n, :c)"),
+            [{"q": q, "s": s, "n": n, "c": c} for (q, s), (n, c) in actual.items()],
+        )
+    return drift
+
+
+def reconcile_once() -> List[Dict[str, Any]]:
+    if db.engine is None:
+        return []
+    with db.engine.begin() as conn:
+        return reconcile(conn)
+
+
+class Reconciler:
+    """Daemon thread that runs reconcile_once() every interval_s seconds."""
+
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval_s <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="queue-stats-reconcile", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                drift = reconcile_once()
+            except Exception:
+                log.exception("queue stats reconcile failed")
+                continue
+            if drift:
+                log.warning("queue stats drift corrected: %s", drift)
+
+
+reconciler = Reconciler(float(settings["queue_stats"]["reconcile_interval_s"]))
+
+
+@router.get("/queues/stats")
+def queue_stats():
+    """Counts per queue and status, crisis counts and the oldest open item's age."""
+    if db.engine is None:
+        return {"generated_at": datetime.utcnow().isoformat(), "queues": []}
+
+    with db.engine.connect() as conn:
+        return read_stats(conn)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argparse.ArgumentParser(description="Recount QueueStat from the base tables.").parse_args(argv)
+    if db.engine is None:
+        raise SystemExit("DB not configured")
+    print(json.dumps({"corrected": reconcile_once()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,37 @@
 from __future__ import annotations
 
+import base64
+import binascii
 from datetime import datetime
-from typing import Any, Dict, List, Mapping
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple, Union
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy import text
+from sqlalchemy.engine import Connection
 
+from .attributes import AttrFilter, attr_condition, attr_exists, attr_params, insert_attributes, parse_attr_filters
+from .cache import intake_detail_cache
 from .db import engine
-from .models import HealthResponse, IntakeCreate, IntakeResponse
+from .fastjson import FastJSONResponse, dumps, dumps_with_raw, is_raw_json, shape_rows
+from .idempotency import IDEMPOTENCY_HEADER, Conflict as IdempotencyConflict, fingerprint
+from .idempotency import store as idempotency_store
+from .models import IntakeCreate, IntakeResponse
 from .rules_engine import evaluate_rules_and_enqueue
 
 router = APIRouter()
 
+# POST /intakes:bulk commits this many records per transaction by default.
+BULK_CHUNK_SIZE = 500
+BULK_MAX_CHUNK_SIZE = 5000
+BULK_MAX_LINE_BYTES = 1 << 20
+
+# GET /intakes and GET /queues page size.
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
 
 # -----------------------
 # Helpers
@@ -56,90 +76,460 @@ def _safe_json(obj: Any) -> str:
     return json.dumps(obj, ensure_ascii=False)
 
 
-def _shape_intake_list_row(row: Mapping[str, Any]) -> Dict[str, Any]:
-    d = dict(row)
-    if "crisis" in d:
-        d["crisis"] = _to_bool(d["crisis"])
-    return d
+def _shape_intake_list_rows(keys: List[str], rows: List[Any]) -> List[Dict[str, Any]]:
+    return shape_rows(keys, rows, ("crisis",), _to_bool)
 
 
-def _shape_intake_detail_row(row: Mapping[str, Any]) -> Dict[str, Any]:
+def _render_intake_detail(row: Mapping[str, Any]) -> bytes:
+    """
+    JSON body for GET /intakes/{id}. Stored AttributesJson that the query
+    found valid (AttributesJsonValid) is copied into the body as-is rather
+    than parsed and re-serialized; it comes last in the object.
+    """
     d = dict(row)
+    valid = d.pop("AttributesJsonValid", None)
     if "Crisis" in d:
         d["Crisis"] = _to_bool(d["Crisis"])
+    attrs = d.get("AttributesJson")
+    if valid and is_raw_json(attrs):
+        return dumps_with_raw(d, {"AttributesJson": attrs})
     if "AttributesJson" in d:
-        d["AttributesJson"] = _parse_json(d["AttributesJson"])
-    return d
+        d["AttributesJson"] = _parse_json(attrs)
+    return dumps(d)
 
 
 # -----------------------
-# Health check
+# SQL (shared with routes_async.py)
 # -----------------------
-@router.get("/health", response_model=HealthResponse)
-def health() -> HealthResponse:
-    if engine is None:
-        return HealthResponse(status="ok", db="not_configured", version="0.1.0")
-
+INSERT_INTAKE_SQL = text(
+    """
+    INSERT INTO Intake
+    (CreatedAt, CallerId, Channel, DomainModule, Priority, Crisis, Narrative, AttributesJson)
+    VALUES
+    (:CreatedAt, :CallerId, :Channel, :DomainModule, :Priority, :Crisis, :Narrative, :AttributesJson)
+    """
+)
+
+# Same INSERT, returning the new id in the same statement.
+INSERT_INTAKE_RETURNING_SQL = text(
+    """
+    INSERT INTO Intake
+    (CreatedAt, CallerId, Channel, DomainModule, Priority, Crisis, Narrative, AttributesJson)
+    VALUES
+    (:CreatedAt, :CallerId, :Channel, :DomainModule, :Priority, :Crisis, :Narrative, :AttributesJson)
+    RETURNING IntakeId
+    """
+)
+
+INSERT_INTAKE_OUTPUT_SQL = text(
+    """
+    INSERT INTO Intake
+    (CreatedAt, CallerId, Channel, DomainModule, Priority, Crisis, Narrative, AttributesJson)
+    OUTPUT INSERTED.IntakeId
+    VALUES
+    (:CreatedAt, :CallerId, :Channel, :DomainModule, :Priority, :Crisis, :Narrative, :AttributesJson)
+    """
+)
+
+# Fallback for SQLite < 3.35 (no RETURNING)
+LAST_INSERT_ID_SQL = text("SELECT last_insert_rowid()")
+
+INTAKE_EXISTS_SQL = text("SELECT 1 FROM Intake WHERE IntakeId = :id")
+
+# Keyset pages, newest first. The cursor is the last id of the previous
+# page, so each page is a seek on the primary key (or on the
+# IX_QueueItem_* / IX_IntakeCurrentQueue_* indexes when filtering by
+# queue/status) no matter how deep the client has paged.
+def _driving_attr(attrs: List[AttrFilter], ordered_walk: bool) -> Optional[int]:
+    """
+    Index of the attr filter to drive the walk from, if any. An equality
+    seeks IX_IntakeAttribute_Text and yields IntakeIds in order. A range
+    (IX_IntakeAttribute_Num) or `in` (IX_IntakeAttribute_Text) seek yields
+    them by value, so its matches are sorted before the LIMIT; it only
+    drives when no queue/status index gives an ordered walk instead.
+    """
+    eq = next((n for n, f in enumerate(attrs) if f.op == "eq"), None)
+    if eq is not None or ordered_walk:
+        return eq
+    return 0 if attrs else None
+
+
+def _list_intakes_sql(filters: Mapping[str, Any]) -> Any:
+    # With a queue/status filter the walk is driven from the projection's
+    # index, so order on its IntakeId to avoid a sort. The driving attr
+    # filter (see _driving_attr) joins IntakeAttribute instead; any other
+    # attr filters are PK probes per candidate.
+    attrs = filters.get("attrs") or []
+    projected = bool(filters.get("queue") or filters.get("status"))
+    drive = _driving_attr(attrs, projected)
+    joins = []
+    if drive is not None:
+        key = f"a{drive}.IntakeId"
+        joins.append(
+            f"JOIN IntakeAttribute a{drive} ON a{drive}.IntakeId = i.IntakeId "
+            f"AND {attr_condition(drive, attrs[drive], f'a{drive}')}"
+        )
+    elif projected:
+        key = "c.IntakeId"
+    else:
+        key = "i.IntakeId"
+    where = [attr_exists(n, f, "i.IntakeId") for n, f in enumerate(attrs) if n != drive]
+    if filters.get("after") is not None:
+        where.append(f"{key} < :after")
+    if filters.get("since"):
+        where.append("i.CreatedAt >= :since")
+    if filters.get("until"):
+        where.append("i.CreatedAt < :until")
+    if filters.get("queue"):
+        where.append("c.QueueName = :queue")
+    if filters.get("status"):
+        where.append("c.Status = :status")
+    return text(
+        f"""
+        SELECT
+            i.IntakeId      AS intake_id,
+            i.CreatedAt     AS created_at,
+            i.DomainModule  AS domain_module,
+            i.Priority      AS priority,
+            i.Crisis        AS crisis,
+            c.QueueName     AS queue,
+            c.Reason        AS reason,
+            c.Status        AS queue_status
+        FROM Intake i
+        {" ".join(joins)}
+        LEFT JOIN IntakeCurrentQueue c
+            ON c.IntakeId = i.IntakeId
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY {key} DESC
+        LIMIT :limit
+        """
+    )
+
+
+def _list_queues_sql(filters: Mapping[str, Any]) -> Any:
+    # Without a queue/status filter (IX_QueueItem_Queue/_Status walks), an
+    # attr filter drives: its intakes' items come from IX_QueueItem_Intake
+    # and are sorted on QueueItemId before the LIMIT.
+    attrs = filters.get("attrs") or []
+    drive = None if filters.get("queue") or filters.get("status") else _driving_attr(attrs, False)
+    joins = []
+    if drive is not None:
+        joins.append(
+            f"JOIN IntakeAttribute a{drive} ON a{drive}.IntakeId = q.IntakeId "
+            f"AND {attr_condition(drive, attrs[drive], f'a{drive}')}"
+        )
+    where = [attr_exists(n, f, "q.IntakeId") for n, f in enumerate(attrs) if n != drive]
+    if filters.get("after") is not None:
+        where.append("q.QueueItemId < :after")
+    if filters.get("queue"):
+        where.append("q.QueueName = :queue")
+    if filters.get("status"):
+        where.append("q.Status = :status")
+    if filters.get("since"):
+        where.append("q.CreatedAt >= :since")
+    if filters.get("until"):
+        where.append("q.CreatedAt < :until")
+    return text(
+        f"""
+        SELECT q.* FROM QueueItem q
+        {" ".join(joins)}
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY q.QueueItemId DESC
+        LIMIT :limit
+        """
+    )
+
+
+def _encode_cursor(kind: str, last_id: int) -> str:
+    raw = f"{kind}:{last_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(kind: str, cursor: Optional[str]) -> Optional[int]:
+    """Last id from an `after` cursor minted by _encode_cursor(kind, ...)."""
+    if not cursor:
+        return None
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        return HealthResponse(status="ok", db="ok", version="0.1.0")
-    except Exception as e:
-        return HealthResponse(status="ok", db=f"error: {type(e).__name__}", version="0.1.0")
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        prefix, _, last_id = raw.partition(":")
+        if prefix != kind:
+            raise ValueError(prefix)
+        return int(last_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+def _page_params(
+    kind: str,
+    limit: int,
+    after: Optional[str],
+    queue: Optional[str],
+    status: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    query: Optional[Mapping[str, str]] = None,
+) -> Dict[str, Any]:
+    # CreatedAt is stored as datetime.isoformat() text, so compare the same way.
+    # One extra row tells us whether there is a next page. `query` is the
+    # request's query string, for the attr.* filters (attributes.py).
+    attrs = parse_attr_filters(query or {})
+    return {
+        "after": _decode_cursor(kind, after),
+        "queue": queue,
+        "status": status,
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+        "limit": limit + 1,
+        "attrs": attrs,
+        **attr_params(attrs),
+    }
+
+
+def _page(kind: str, id_key: str, rows: List[Dict[str, Any]], limit: int) -> Dict[str, Any]:
+    items = rows[:limit]
+    next_cursor = _encode_cursor(kind, items[-1][id_key]) if len(rows) > limit else None
+    return {"count": len(items), "items": items, "next_cursor": next_cursor}
+
+# Current queue row per intake comes from the IntakeCurrentQueue projection
+# (see current_queue.py), not from the QueueItem history. AttributesJsonValid
+# lets _render_intake_detail pass the stored text through unparsed only
+# when the DB has checked it is JSON.
+_GET_INTAKE_SQL = """
+    SELECT
+        i.*,
+        {valid} AS AttributesJsonValid,
+        c.QueueName AS queue,
+        c.Reason    AS reason,
+        c.Status    AS queue_status
+    FROM Intake i
+    LEFT JOIN IntakeCurrentQueue c
+        ON c.IntakeId = i.IntakeId
+    WHERE i.IntakeId = :id
+"""
+GET_INTAKE_SQL = {
+    "sqlite": text(_GET_INTAKE_SQL.format(valid="json_valid(i.AttributesJson)")),
+    "mssql": text(_GET_INTAKE_SQL.format(valid="ISJSON(i.AttributesJson)")),
+}
+
+
+def _get_intake_sql(dialect) -> Any:
+    """GET_INTAKE_SQL with the dialect's JSON check."""
+    return GET_INTAKE_SQL["mssql" if dialect.name == "mssql" else "sqlite"]
+
+
+def _intake_params(payload: IntakeCreate, created_at: datetime) -> Dict[str, Any]:
+    return {
+        "CreatedAt": created_at.isoformat(),
+        "CallerId": payload.caller_id,
+        "Channel": payload.channel,
+        "DomainModule": payload.domain_module,
+        "Priority": payload.priority,
+        "Crisis": 1 if payload.crisis else 0,
+        "Narrative": payload.narrative,
+        "AttributesJson": _safe_json(payload.attributes),
+    }
+
+
+def _routing_fields(payload: IntakeCreate) -> Dict[str, Any]:
+    """The intake columns the rules engine reads, straight from the payload."""
+    return {"Crisis": payload.crisis, "Priority": payload.priority, "DomainModule": payload.domain_module}
+
+
+def _insert_intake_returning_sql(dialect) -> Any:
+    """INSERT that yields the new IntakeId itself, or None if the dialect can't."""
+    if dialect.name == "mssql":
+        return INSERT_INTAKE_OUTPUT_SQL
+    if getattr(dialect, "insert_returning", False):
+        return INSERT_INTAKE_RETURNING_SQL
+    return None
+
+
+def _insert_intake(conn: Connection, payload: IntakeCreate, created_at: datetime) -> int:
+    params = _intake_params(payload, created_at)
+    stmt = _insert_intake_returning_sql(conn.dialect)
+    if stmt is not None:
+        intake_id = int(conn.execute(stmt, params).scalar_one())
+    else:
+        conn.execute(INSERT_INTAKE_SQL, params)
+        intake_id = int(conn.execute(LAST_INSERT_ID_SQL).scalar_one())
+
+    insert_attributes(conn, intake_id, payload.attributes, params["AttributesJson"])
+    return intake_id
 
 
 # -----------------------
 # Create intake (insert + run rules_engine)
 # -----------------------
 @router.post("/intakes", response_model=IntakeResponse)
-def create_intake(payload: IntakeCreate) -> IntakeResponse:
+def create_intake(
+    payload: IntakeCreate, idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
+) -> IntakeResponse:
+    """
+    With an Idempotency-Key header, a repeat of the same request returns the
+    first response instead of creating another intake (see idempotency.py).
+    """
     if engine is None:
         raise HTTPException(status_code=500, detail="DB not configured")
 
+    def work(record) -> IntakeResponse:
+        return _create_intake(payload, record)
+
+    return idempotency_store.run(
+        engine, "POST /intakes", idempotency_key, fingerprint(payload.model_dump_json()), work
+    )
+
+
+def _create_intake(payload: IntakeCreate, record) -> IntakeResponse:
     created_at = datetime.utcnow()
 
     try:
         with engine.begin() as conn:
             # 1) Insert intake
-            conn.execute(
-                text(
-                    """
-                    INSERT INTO Intake
-                    (CreatedAt, CallerId, Channel, DomainModule, Priority, Crisis, Narrative, AttributesJson)
-                    VALUES
-                    (:CreatedAt, :CallerId, :Channel, :DomainModule, :Priority, :Crisis, :Narrative, :AttributesJson)
-                    """
-                ),
-                {
-                    "CreatedAt": created_at.isoformat(),
-                    "CallerId": payload.caller_id,
-                    "Channel": payload.channel,
-                    "DomainModule": payload.domain_module,
-                    "Priority": payload.priority,
-                    "Crisis": 1 if payload.crisis else 0,
-                    "Narrative": payload.narrative,
-                    "AttributesJson": _safe_json(payload.attributes),
-                },
+            intake_id = _insert_intake(conn, payload, created_at)
+
+            # 2) Run rules + enqueue (writes QueueItem row); the payload already
+            #    has the routing fields, so the engine doesn't re-read the row
+            queue, reason, applied = evaluate_rules_and_enqueue(conn, intake_id, _routing_fields(payload))
+
+            response = IntakeResponse(
+                intake_id=intake_id,
+                created_at=created_at,
+                domain_module=payload.domain_module,
+                priority=payload.priority,
+                crisis=payload.crisis,
+                queue=queue,
+                reason=reason or "",
+                rules_applied=applied,
             )
+            # 3) Idempotency-Key row, committed with the intake
+            record(conn, response)
+        return response
 
-            intake_id = int(conn.execute(text("SELECT last_insert_rowid()")).scalar_one())
+    except IdempotencyConflict:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-            # 2) Run rules + enqueue (writes QueueItem row)
-            queue, reason, applied = evaluate_rules_and_enqueue(conn, intake_id)
 
-        return IntakeResponse(
-            intake_id=intake_id,
-            created_at=created_at,
-            domain_module=payload.domain_module,
-            priority=payload.priority,
-            crisis=payload.crisis,
-            queue=queue,
-            reason=reason or "",
-            rules_applied=applied,
-        )
+# -----------------------
+# Bulk create (NDJSON in, NDJSON out, one transaction per chunk)
+# -----------------------
+BulkLine = Tuple[int, Union[IntakeCreate, str]]
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'body'}: {err['msg']}" for err in e.errors()
+    )
 
+
+def _parse_bulk_line(line_no: int, raw: bytes) -> BulkLine:
+    try:
+        return line_no, IntakeCreate.model_validate_json(raw)
+    except ValidationError as e:
+        return line_no, _validation_message(e)
+
+
+async def _iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[BulkLine]:
+    """
+    Yield (line_no, IntakeCreate | error) per non-blank line of an NDJSON
+    body as it arrives. Only the current partial line is buffered; lines
+    longer than BULK_MAX_LINE_BYTES are skipped with an error.
+    """
+    buf = b""
+    line_no = 0
+    skipping = False
+
+    async for data in stream:
+        buf += data
+        start = 0
+        while True:
+            nl = buf.find(b"\n", start)
+            if nl < 0:
+                break
+            raw, start = buf[start:nl], nl + 1
+            line_no += 1
+            if skipping:
+                skipping = False
+                yield line_no, f"line exceeds {BULK_MAX_LINE_BYTES} bytes"
+            elif raw.strip():
+                yield _parse_bulk_line(line_no, raw)
+        buf = buf[start:]
+
+        if len(buf) > BULK_MAX_LINE_BYTES:
+            buf = b""
+            skipping = True
+
+    if skipping:
+        yield line_no + 1, f"line exceeds {BULK_MAX_LINE_BYTES} bytes"
+    elif buf.strip():
+        yield _parse_bulk_line(line_no + 1, buf)
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator is still reading the request.
+    The stock class also listens for http.disconnect on receive(), which
+    would steal request body messages from request.stream(); disconnects
+    surface through request.stream() instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _commit_bulk_chunk(chunk: List[BulkLine]) -> bytes:
+    """
+    Insert + route every valid record of a chunk in one transaction and
+    return one NDJSON result line per input line.
+    """
+    results: List[Dict[str, Any]] = []
+    try:
+        with engine.begin() as conn:
+            for line_no, item in chunk:
+                if isinstance(item, str):
+                    results.append({"line": line_no, "error": item})
+                    continue
+                intake_id = _insert_intake(conn, item, datetime.utcnow())
+                queue, _, _ = evaluate_rules_and_enqueue(conn, intake_id, _routing_fields(item))
+                results.append({"line": line_no, "intake_id": intake_id, "queue": queue})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        # Whole chunk rolled back: report every line, not just the bad one.
+        results = [
+            {"line": line_no, "error": item if isinstance(item, str) else f"chunk rolled back: {e}"}
+            for line_no, item in chunk
+        ]
+
+    return b"".join((_safe_json(r) + "\n").encode("utf-8") for r in results)
+
+
+@router.post("/intakes:bulk")
+async def bulk_create_intakes(
+    request: Request,
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=BULK_MAX_CHUNK_SIZE),
+):
+    """
+    Body: one IntakeCreate JSON object per line (application/x-ndjson).
+    Records are validated as they stream in and committed chunk_size rows per
+    transaction; a result line ({line, intake_id, queue} or {line, error}) is
+    streamed back for every input line once its chunk commits.
+    """
+    if engine is None:
+        raise HTTPException(status_code=500, detail="DB not configured")
+
+    async def results() -> AsyncIterator[bytes]:
+        chunk: List[BulkLine] = []
+        async for line in _iter_ndjson(request.stream()):
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield await run_in_threadpool(_commit_bulk_chunk, chunk)
+                chunk = []
+        if chunk:
+            yield await run_in_threadpool(_commit_bulk_chunk, chunk)
+
+    return _DuplexStreamingResponse(results(), media_type="application/x-ndjson")
 
 
 # -----------------------
@@ -153,10 +543,7 @@ def requeue_intake(intake_id: int):
     try:
         with engine.begin() as conn:
             # Ensure intake exists
-            exists = conn.execute(
-                text("SELECT 1 FROM Intake WHERE IntakeId = :id"),
-                {"id": intake_id},
-            ).scalar()
+            exists = conn.execute(INTAKE_EXISTS_SQL, {"id": intake_id}).scalar()
 
             if not exists:
                 raise HTTPException(status_code=404, detail="not found")
@@ -180,42 +567,30 @@ def requeue_intake(intake_id: int):
 # Step F: List intakes showing the LATEST queue row per intake
 # -----------------------
 @router.get("/intakes")
-def list_intakes(limit: int = 50):
+def list_intakes(
+    request: Request,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    queue: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Newest first. Pass the previous page's next_cursor as `after` to get the
+    next page; queue/status filter on the intake's latest queue row,
+    since/until on CreatedAt (since inclusive, until exclusive), and
+    attr.<name>[.op]=value on AttributesJson members (see attributes.py).
+    """
+    params = _page_params("i", limit, after, queue, status, since, until, request.query_params)
     if engine is None:
-        return {"count": 0, "items": []}
-
-    # Latest QueueItem per IntakeId = row with max QueueItemId
-    with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                """
-                WITH latest_q AS (
-                    SELECT IntakeId, MAX(QueueItemId) AS max_qid
-                    FROM QueueItem
-                    GROUP BY IntakeId
-                )
-                SELECT
-                    i.IntakeId      AS intake_id,
-                    i.CreatedAt     AS created_at,
-                    i.DomainModule  AS domain_module,
-                    i.Priority      AS priority,
-                    i.Crisis        AS crisis,
-                    q.QueueName     AS queue,
-                    q.Reason        AS reason
-                FROM Intake i
-                LEFT JOIN latest_q lq
-                    ON lq.IntakeId = i.IntakeId
-                LEFT JOIN QueueItem q
-                    ON q.QueueItemId = lq.max_qid
-                ORDER BY i.IntakeId DESC
-                LIMIT :limit
-                """
-            ),
-            {"limit": limit},
-        ).mappings().all()
-
-    items = [_shape_intake_list_row(r) for r in rows]
-    return {"count": len(items), "items": items}
+        return {"count": 0, "items": [], "next_cursor": None}
+
+    with engine.connect() as conn:
+        result = conn.execute(_list_intakes_sql(params), params)
+        items = _shape_intake_list_rows(list(result.keys()), result.all())
+
+    return FastJSONResponse(_page("i", "intake_id", items, limit))
 
 
 # -----------------------
@@ -226,48 +601,51 @@ def get_intake(intake_id: int):
     if engine is None:
         raise HTTPException(status_code=500, detail="DB not configured")
 
-    with engine.begin() as conn:
-        row = conn.execute(
-            text(
-                """
-                WITH latest_q AS (
-                    SELECT IntakeId, MAX(QueueItemId) AS max_qid
-                    FROM QueueItem
-                    WHERE IntakeId = :id
-                    GROUP BY IntakeId
-                )
-                SELECT
-                    i.*,
-                    q.QueueName AS queue,
-                    q.Reason    AS reason,
-                    q.Status    AS queue_status
-                FROM Intake i
-                LEFT JOIN latest_q lq
-                    ON lq.IntakeId = i.IntakeId
-                LEFT JOIN QueueItem q
-                    ON q.QueueItemId = lq.max_qid
-                WHERE i.IntakeId = :id
-                """
-            ),
-            {"id": intake_id},
-        ).mappings().first()
-
-    if not row:
-        raise HTTPException(status_code=404, detail="not found")
-
-    return _shape_intake_detail_row(row)
+    # Rendered bodies are cached (cache.py), so hits skip the query, the
+    # JSON parse of AttributesJson and serialization alike.
+    body = intake_detail_cache.get(intake_id)
+    if body is None:
+        token = intake_detail_cache.token()
+        with engine.begin() as conn:
+            row = conn.execute(_get_intake_sql(conn.dialect), {"id": intake_id}).mappings().first()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="not found")
+
+        body = _render_intake_detail(row)
+        intake_detail_cache.put(intake_id, body, token)
+
+    return Response(body, media_type="application/json")
+
+
+# -----------------------
+# Cache stats
+# -----------------------
+@router.get("/cache/stats")
+def cache_stats():
+    return {"intake_detail": intake_detail_cache.stats()}
 
 
 # -----------------------
 # List queues (history)
 # -----------------------
 @router.get("/queues")
-def list_queues() -> List[Dict[str, Any]]:
+def list_queues(
+    request: Request,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    queue: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """QueueItem history, newest first, paged and filtered like GET /intakes."""
+    params = _page_params("q", limit, after, queue, status, since, until, request.query_params)
     if engine is None:
-        return []
+        return {"count": 0, "items": [], "next_cursor": None}
 
     with engine.connect() as conn:
-        rows = conn.execute(
-            text("SELECT * FROM QueueItem ORDER BY QueueItemId DESC")
-        ).mappings().all()
-        return [dict(r) for r in rows]
+        result = conn.execute(_list_queues_sql(params), params)
+        items = shape_rows(list(result.keys()), result.all())
+
+    return FastJSONResponse(_page("q", "QueueItemId", items, limit))
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import Response
+
+from . import db
+from .attributes import insert_attributes_sql
+from .cache import intake_detail_cache
+from .fastjson import FastJSONResponse
+from .idempotency import IDEMPOTENCY_HEADER, Conflict as IdempotencyConflict, fingerprint
+from .idempotency import store as idempotency_store
+from .models import IntakeCreate, IntakeResponse
+from .routes import (
+    INSERT_INTAKE_SQL,
+    INTAKE_EXISTS_SQL,
+    LAST_INSERT_ID_SQL,
+    MAX_PAGE_SIZE,
+    PAGE_SIZE,
+    _insert_intake_returning_sql,
+    _intake_params,
+    _list_intakes_sql,
+    _page,
+    _get_intake_sql,
+    _page_params,
+    _render_intake_detail,
+    _routing_fields,
+    _shape_intake_list_rows,
+)
+from .rules_engine import evaluate_rules_and_enqueue_async
+
+# Async versions of the hot routes, served instead of the sync ones in
+# routes.py when DB_ASYNC is enabled (app.py registers this router first).
+# Handlers await the async engine instead of holding a threadpool worker
+# for the duration of each DB call.
+router = APIRouter()
+
+
+def _require_async_engine():
+    if db.async_engine is None:
+        raise HTTPException(status_code=500, detail="DB not configured")
+    return db.async_engine
+
+
+# -----------------------
+# Create intake (insert + run rules_engine)
+# -----------------------
+@router.post("/intakes", response_model=IntakeResponse)
+async def create_intake(
+    payload: IntakeCreate, idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
+) -> IntakeResponse:
+    engine = _require_async_engine()
+
+    async def work(record) -> IntakeResponse:
+        return await _create_intake(engine, payload, record)
+
+    return await idempotency_store.run_async(
+        engine, "POST /intakes", idempotency_key, fingerprint(payload.model_dump_json()), work
+    )
+
+
+async def _create_intake(engine, payload: IntakeCreate, record) -> IntakeResponse:
+    created_at = datetime.utcnow()
+
+    try:
+        async with engine.begin() as conn:
+            params = _intake_params(payload, created_at)
+            stmt = _insert_intake_returning_sql(conn.dialect)
+            if stmt is not None:
+                intake_id = int((await conn.execute(stmt, params)).scalar_one())
+            else:
+                await conn.execute(INSERT_INTAKE_SQL, params)
+                intake_id = int((await conn.execute(LAST_INSERT_ID_SQL)).scalar_one())
+            attrs_stmt = insert_attributes_sql(conn.dialect, payload.attributes)
+            if attrs_stmt is not None:
+                await conn.execute(attrs_stmt, {"id": intake_id, "attributes": params["AttributesJson"]})
+
+            queue, reason, applied = await evaluate_rules_and_enqueue_async(conn, intake_id, _routing_fields(payload))
+
+            response = IntakeResponse(
+                intake_id=intake_id,
+                created_at=created_at,
+                domain_module=payload.domain_module,
+                priority=payload.priority,
+                crisis=payload.crisis,
+                queue=queue,
+                reason=reason or "",
+                rules_applied=applied,
+            )
+            await record(conn, response)
+        return response
+
+    except IdempotencyConflict:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# -----------------------
+# Requeue an existing intake
+# -----------------------
+@router.post("/intakes/{intake_id}/requeue")
+async def requeue_intake(intake_id: int):
+    engine = _require_async_engine()
+
+    try:
+        async with engine.begin() as conn:
+            exists = (await conn.execute(INTAKE_EXISTS_SQL, {"id": intake_id})).scalar()
+
+            if not exists:
+                raise HTTPException(status_code=404, detail="not found")
+
+            queue, reason, applied = await evaluate_rules_and_enqueue_async(conn, intake_id)
+
+        return {
+            "intake_id": intake_id,
+            "queue": queue,
+            "reason": reason,
+            "rules_applied": applied,
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# -----------------------
+# List intakes (latest queue row per intake)
+# -----------------------
+@router.get("/intakes")
+async def list_intakes(
+    request: Request,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    queue: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    params = _page_params("i", limit, after, queue, status, since, until, request.query_params)
+    if db.async_engine is None:
+        return {"count": 0, "items": [], "next_cursor": None}
+
+    async with db.async_engine.connect() as conn:
+        result = await conn.execute(_list_intakes_sql(params), params)
+        items = _shape_intake_list_rows(list(result.keys()), result.all())
+
+    return FastJSONResponse(_page("i", "intake_id", items, limit))
+
+
+# -----------------------
+# Get single intake
+# -----------------------
+@router.get("/intakes/{intake_id}")
+async def get_intake(intake_id: int):
+    engine = _require_async_engine()
+
+    body = intake_detail_cache.get(intake_id)
+    if body is None:
+        token = intake_detail_cache.token()
+        async with engine.connect() as conn:
+            row = (await conn.execute(_get_intake_sql(conn.dialect), {"id": intake_id})).mappings().first()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="not found")
+
+        body = _render_intake_detail(row)
+        intake_detail_cache.put(intake_id, body, token)
+
+    return Response(body, media_type="application/json")
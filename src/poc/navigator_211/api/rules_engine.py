@@ -1,53 +1,154 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Mapping, Tuple
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
 
+from . import metrics
+from .feed import publish_after_commit
 
-def evaluate_rules_and_enqueue(conn, intake_id: int) -> Tuple[str, str | None, List[Dict[str, Any]]]:
+_SELECT_ROUTING_FIELDS = text("SELECT Crisis, Priority, DomainModule FROM Intake WHERE IntakeId = :id")
+
+_INSERT_QUEUE_ITEM = text(
+    """
+    INSERT INTO QueueItem (IntakeId, QueueName, Status, Reason, CreatedAt)
+    VALUES (:IntakeId, :QueueName, 'New', :Reason, :CreatedAt)
+    """
+)
+
+_INSERT_QUEUE_ITEM_RETURNING = text(
+    """
+    INSERT INTO QueueItem (IntakeId, QueueName, Status, Reason, CreatedAt)
+    VALUES (:IntakeId, :QueueName, 'New', :Reason, :CreatedAt)
+    RETURNING QueueItemId
+    """
+)
+
+# QueueItem has triggers, which rules out OUTPUT on MSSQL; the trigger's
+# own insert has no identity column, so SCOPE_IDENTITY() is still ours.
+_LAST_QUEUE_ITEM_ID = {
+    "mssql": text("SELECT CAST(SCOPE_IDENTITY() AS INT)"),
+    "sqlite": text("SELECT last_insert_rowid()"),
+}
+
+
+def evaluate_rules_and_enqueue(
+    conn, intake_id: int, intake: Mapping[str, Any] | None = None
+) -> Tuple[str, str | None, List[Dict[str, Any]]]:
     """
     Minimal rules evaluator (SQLite-safe):
     - If Intake.Crisis = 1 => queue 'Crisis'
     - Else if Priority in ('High','Critical') => queue 'Priority'
     - Else => queue = DomainModule (default_domain)
     Writes QueueItem row and returns (queue, reason, rules_applied)
+    Pass `intake` (Crisis/Priority/DomainModule) when the caller already has
+    it, e.g. right after the INSERT; otherwise the row is read by id.
     """
-    row = conn.execute(
-        text("SELECT Crisis, Priority, DomainModule FROM Intake WHERE IntakeId = :id"),
-        {"id": intake_id},
-    ).mappings().first()
+    start = time.perf_counter()
+    try:
+        row = intake
+        if row is None:
+            row = conn.execute(_SELECT_ROUTING_FIELDS, {"id": intake_id}).mappings().first()
 
-    if not row:
-        return ("General", "Intake not found", [])
+        if not row:
+            return ("General", "Intake not found", [])
 
+        queue, reason, applied = route_intake(row)
+        enqueue(conn, intake_id, queue, reason)
+
+        return (queue, reason, applied)
+    finally:
+        metrics.rules_evaluate_duration.observe(time.perf_counter() - start, "sync")
+
+
+async def evaluate_rules_and_enqueue_async(
+    conn: AsyncConnection, intake_id: int, intake: Mapping[str, Any] | None = None
+) -> Tuple[str, str | None, List[Dict[str, Any]]]:
+    """Async twin of evaluate_rules_and_enqueue for the DB_ASYNC routes."""
+    start = time.perf_counter()
+    try:
+        row = intake
+        if row is None:
+            row = (await conn.execute(_SELECT_ROUTING_FIELDS, {"id": intake_id})).mappings().first()
+
+        if not row:
+            return ("General", "Intake not found", [])
+
+        queue, reason, applied = route_intake(row)
+        params = _queue_item_params(intake_id, queue, reason)
+        if _returning(conn.dialect):
+            queue_item_id = (await conn.execute(_INSERT_QUEUE_ITEM_RETURNING, params)).scalar_one()
+        else:
+            await conn.execute(_INSERT_QUEUE_ITEM, params)
+            queue_item_id = (await conn.execute(_LAST_QUEUE_ITEM_ID[conn.dialect.name])).scalar_one()
+        publish_after_commit(conn, _queued_event(int(queue_item_id), params))
+
+        return (queue, reason, applied)
+    finally:
+        metrics.rules_evaluate_duration.observe(time.perf_counter() - start, "async")
+
+
+def route_intake(row: Mapping[str, Any]) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """
+    Pure routing decision for an intake row with Crisis/Priority/DomainModule.
+    No DB access, so callers can evaluate without writing (e.g. dry runs).
+    """
     crisis = bool(row["Crisis"])
     priority = (row["Priority"] or "").strip()
     domain = (row["DomainModule"] or "").strip() or "General"
 
-    if crisis:
-        queue = "Crisis"
-        reason = "Crisis flag is true"
-        applied = [{"rule": "crisis_flag", "action": "route", "queue": queue}]
-    elif priority.lower() in ("high", "critical"):
-        queue = "Priority"
-        reason = f"Priority is {priority}"
-        applied = [{"rule": "priority_high", "action": "route", "queue": queue}]
+    # First match wins; each check is counted and timed per rule (metrics.py).
+    for rule, check in _ROUTING_RULES:
+        start = time.perf_counter()
+        decision = check(crisis, priority, domain)
+        metrics.observe_rule(rule, decision is not None, time.perf_counter() - start)
+        if decision is not None:
+            queue, reason = decision
+            return (queue, reason, [{"rule": rule, "action": "route", "queue": queue}])
+    raise AssertionError("default_domain always matches")
+
+
+def _crisis_flag(crisis: bool, priority: str, domain: str) -> Tuple[str, str] | None:
+    return ("Crisis", "Crisis flag is true") if crisis else None
+
+
+def _priority_high(crisis: bool, priority: str, domain: str) -> Tuple[str, str] | None:
+    return ("Priority", f"Priority is {priority}") if priority.lower() in ("high", "critical") else None
+
+
+def _default_domain(crisis: bool, priority: str, domain: str) -> Tuple[str, str] | None:
+    return (domain, "Auto-routed")
+
+
+_ROUTING_RULES = (
+    ("crisis_flag", _crisis_flag),
+    ("priority_high", _priority_high),
+    ("default_domain", _default_domain),
+)
+
+
+def enqueue(conn, intake_id: int, queue: str, reason: str | None) -> int:
+    """Insert a 'New' QueueItem and return its id; the feed hears of it on commit."""
+    params = _queue_item_params(intake_id, queue, reason)
+    if _returning(conn.dialect):
+        queue_item_id = conn.execute(_INSERT_QUEUE_ITEM_RETURNING, params).scalar_one()
     else:
-        queue = domain
-        reason = "Auto-routed"
-        applied = [{"rule": "default_domain", "action": "route", "queue": queue}]
+        conn.execute(_INSERT_QUEUE_ITEM, params)
+        queue_item_id = conn.execute(_LAST_QUEUE_ITEM_ID[conn.dialect.name]).scalar_one()
+    publish_after_commit(conn, _queued_event(int(queue_item_id), params))
+    return int(queue_item_id)
 
-    created_at = datetime.utcnow().isoformat()
 
-    conn.execute(
-        text(
-            """
-            INSERT INTO QueueItem (IntakeId, QueueName, Status, Reason, CreatedAt)
-            VALUES (:IntakeId, :QueueName, 'New', :Reason, :CreatedAt)
-            """
-        ),
-        {"IntakeId": intake_id, "QueueName": queue, "Reason": reason, "CreatedAt": created_at},
-    )
-
-    return (queue, reason, applied)
+def _returning(dialect) -> bool:
+    return dialect.name != "mssql" and getattr(dialect, "insert_returning", False)
+
+
+def _queued_event(queue_item_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "queued", "QueueItemId": queue_item_id, "Status": "New", **params}
+
+
+def _queue_item_params(intake_id: int, queue: str, reason: str | None) -> Dict[str, Any]:
+    created_at = datetime.utcnow().isoformat()
+    return {"IntakeId": intake_id, "QueueName": queue, "Reason": reason, "CreatedAt": created_at}
@@ -0,0 +1,170 @@
+"""
+Full-text search over Intake.Narrative.
+
+SQLite answers from the FTS5 index IntakeNarrativeFts and MSSQL from the
+full-text index on Intake (migration 7), so a search reads the posting
+lists for its terms instead of every narrative as LIKE '%...%' does.
+
+    GET /intakes/search?q=kealoha "kam hwy"&domain=Housing&since=2025-01-01
+
+Words must all appear (any order); "quoted words" must appear as a phrase
+and a trailing * matches a prefix (evic*). Results are ranked best first
+among the newest SEARCH_RANK_WINDOW matches (MSSQL: the top ones by RANK),
+so a common word costs a bounded amount of scoring, not one per match.
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import bindparam, text
+
+from . import db
+from .fastjson import FastJSONResponse, shape_rows
+from .routes import _to_bool
+
+router = APIRouter()
+
+SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 100
+MAX_SEARCH_OFFSET = 1000
+MAX_SEARCH_TERMS = 16
+SEARCH_RANK_WINDOW = 5000
+
+_TERM_RE = re.compile(r'"([^"]*)"?|(\S+)')
+
+
+def parse_terms(q: str) -> List[Tuple[str, bool]]:
+    """(phrase, prefix) per search term. Quotes group words into a phrase."""
+    terms = []
+    for quoted, word in _TERM_RE.findall(q or ""):
+        phrase = quoted if quoted else word
+        prefix = not quoted and phrase.endswith("*")
+        phrase = " ".join(re.sub(r'["*]', " ", phrase).split())
+        if phrase:
+            terms.append((phrase, prefix))
+    if len(terms) > MAX_SEARCH_TERMS:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_SEARCH_TERMS} search terms")
+    return terms
+
+
+def fts5_query(terms: List[Tuple[str, bool]]) -> str:
+    # Every term is a quoted string, so FTS5 operators and column filters
+    # typed by the caller are treated as plain words.
+    return " ".join(f'"{phrase}"' + ("*" if prefix else "") for phrase, prefix in terms)
+
+
+def contains_query(terms: List[Tuple[str, bool]]) -> str:
+    return " AND ".join(f'"{phrase}*"' if prefix else f'"{phrase}"' for phrase, prefix in terms)
+
+
+def _filters_sql(filters: Mapping[str, Any]) -> str:
+    where = []
+    if filters.get("domain"):
+        where.append("i.DomainModule = :domain")
+    if filters.get("since"):
+        where.append("i.CreatedAt >= :since")
+    if filters.get("until"):
+        where.append("i.CreatedAt < :until")
+    return "".join(f" AND {w}" for w in where)
+
+
+def _search_sql(dialect, filters: Mapping[str, Any]) -> Any:
+    if dialect.name == "mssql":
+        return text(
+            f"""
+            SELECT
+                i.IntakeId      AS intake_id,
+                i.CreatedAt     AS created_at,
+                i.DomainModule  AS domain_module,
+                i.Priority      AS priority,
+                i.Crisis        AS crisis,
+                LEFT(i.Narrative, 200) AS snippet,
+                CAST(ct.[RANK] AS FLOAT) AS score
+            FROM CONTAINSTABLE(Intake, Narrative, :q, :window) ct
+            JOIN Intake i ON i.IntakeId = ct.[KEY]
+            WHERE 1 = 1{_filters_sql(filters)}
+            ORDER BY ct.[RANK] DESC, i.IntakeId DESC
+            OFFSET :offset ROWS FETCH NEXT :limit ROWS ONLY
+            """
+        )
+    # The inner query walks matches newest first and stops after :window,
+    # so bm25() (lower is better; negated so both dialects sort score DESC)
+    # only runs for those. Scoring every match of a common word is what
+    # makes an unbounded ORDER BY bm25() slow.
+    return text(
+        f"""
+        SELECT
+            i.IntakeId      AS intake_id,
+            i.CreatedAt     AS created_at,
+            i.DomainModule  AS domain_module,
+            i.Priority      AS priority,
+            i.Crisis        AS crisis,
+            NULL            AS snippet,
+            m.score         AS score
+        FROM (
+            SELECT f.rowid AS IntakeId, -bm25(IntakeNarrativeFts) AS score
+            FROM IntakeNarrativeFts f
+            JOIN Intake i ON i.IntakeId = f.rowid
+            WHERE IntakeNarrativeFts MATCH :q{_filters_sql(filters)}
+            ORDER BY f.rowid DESC
+            LIMIT :window
+        ) m
+        JOIN Intake i ON i.IntakeId = m.IntakeId
+        ORDER BY m.score DESC, i.IntakeId DESC
+        LIMIT :limit OFFSET :offset
+        """
+    )
+
+
+# Snippets for the returned page only (snippet() re-tokenizes each narrative).
+_SNIPPETS_SQL = text(
+    """
+    SELECT rowid, snippet(IntakeNarrativeFts, 0, '[', ']', '...', 16)
+    FROM IntakeNarrativeFts
+    WHERE IntakeNarrativeFts MATCH :q AND rowid IN :ids
+    """
+).bindparams(bindparam("ids", expanding=True))
+
+
+def search_intakes(conn, q: str, filters: Mapping[str, Any], limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+    terms = parse_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="q must contain at least one word")
+    match = contains_query(terms) if conn.dialect.name == "mssql" else fts5_query(terms)
+    params = {**filters, "q": match, "limit": limit, "offset": offset, "window": SEARCH_RANK_WINDOW}
+    result = conn.execute(_search_sql(conn.dialect, filters), params)
+    items = shape_rows(list(result.keys()), result.all(), ("crisis",), _to_bool)
+    if items and conn.dialect.name != "mssql":
+        snippets = dict(conn.execute(_SNIPPETS_SQL, {"q": match, "ids": [r["intake_id"] for r in items]}).all())
+        for r in items:
+            r["snippet"] = snippets.get(r["intake_id"])
+    return items
+
+
+@router.get("/intakes/search")
+def search(
+    q: str = Query(..., min_length=1, max_length=500),
+    domain: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
+):
+    """
+    Intakes whose Narrative matches q, best match first. domain filters on
+    DomainModule and since/until on CreatedAt, as on GET /intakes.
+    """
+    if db.engine is None:
+        raise HTTPException(status_code=500, detail="DB not configured")
+
+    filters = {
+        "domain": domain,
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+    }
+    with db.engine.connect() as conn:
+        items = search_intakes(conn, q, filters, limit, offset)
+    return FastJSONResponse({"count": len(items), "offset": offset, "items": items})
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SETTINGS_PATH = PROJECT_ROOT / "config" / "settings.json"
+
+# Used for any key missing from config/settings.json (or if it's absent).
+DEFAULTS: Dict[str, Any] = {
+    "project": "Navigator 211 POC",
+    "default_queue": "General",
+    "rules_enabled": True,
+    # Applied to every SQLite connection (sync and aiosqlite) on connect.
+    "sqlite": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout_ms": 5000,
+        "cache_size_kib": 65536,
+        "mmap_size_mb": 256,
+        "temp_store": "MEMORY",
+        "pool_size": 8,
+        "max_overflow": 8,
+        "pool_timeout_s": 30,
+    },
+    # GET /intakes/{id} response cache (cache.py); max_entries 0 disables it.
+    "intake_cache": {
+        "max_entries": 1024,
+        "ttl_s": 30,
+    },
+    # GET /queues/stats counters (queue_stats.py); 0 disables reconciliation.
+    "queue_stats": {
+        "reconcile_interval_s": 300,
+    },
+    # Idempotency-Key replay (idempotency.py): recent responses kept in
+    # memory; IdempotencyKey rows older than retention_h are removed by
+    # `python -m api.idempotency`. A repeat of an in-flight request holds a
+    # threadpool worker for up to wait_s before getting a 409.
+    "idempotency": {
+        "max_entries": 10000,
+        "ttl_s": 600,
+        "wait_s": 5,
+        "retention_h": 72,
+    },
+    # GET /health serves the last background probe (health.py); it probes
+    # inline instead once the cached result is older than stale_after_s.
+    "health": {
+        "probe_interval_s": 5,
+        "stale_after_s": 30,
+    },
+}
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    out = copy.deepcopy(base)
+    for k, v in override.items():
+        if isinstance(v, dict) and isinstance(out.get(k), dict):
+            out[k] = _merge(out[k], v)
+        else:
+            out[k] = v
+    return out
+
+
+def load_settings(path: Path = SETTINGS_PATH) -> Dict[str, Any]:
+    try:
+        raw = path.read_text(encoding="utf-8-sig").strip()
+        data = json.loads(raw) if raw else {}
+    except (OSError, ValueError):
+        data = {}
+    return _merge(DEFAULTS, data if isinstance(data, dict) else {})
+
+
+settings = load_settings()
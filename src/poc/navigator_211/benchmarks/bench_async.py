@@ -0,0 +1,145 @@
+"""
+Concurrent request throughput: sync routes (threadpool) vs DB_ASYNC routes.
+
+Each mode runs in its own process against a fresh SQLite file, driving the
+app in-process through httpx's ASGI transport with --concurrency requests in
+flight. The request mix is POST /intakes, GET /intakes and GET
+/intakes/{id}. --threadpool caps the anyio worker threads that sync handlers
+run on (Starlette's default is 40), which is the limit that async mode
+removes. --latency-ms adds a fixed delay to every statement to stand in for
+the network round trip to Azure SQL; on a local SQLite file async mode pays
+aiosqlite's thread hop without anything to overlap, so expect it to lose
+there.
+
+Usage (from the project root):
+    python -m benchmarks.bench_async --requests 2000 --concurrency 200
+    python -m benchmarks.bench_async --out async_vs_sync.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+
+def _run_worker(args: argparse.Namespace) -> Dict[str, Any]:
+    os.environ["DB_URL"] = f"sqlite:///{args.db}"
+    os.environ["DB_ASYNC"] = "1" if args.mode == "async" else "0"
+
+    import anyio.to_thread
+    import httpx
+    from sqlalchemy import event
+
+    from api import db
+    from api.app import app
+    from api.sqlite_bootstrap import bootstrap_sqlite
+
+    bootstrap_sqlite()
+
+    if args.latency_ms:
+        def _network_delay(*_):
+            time.sleep(args.latency_ms / 1000.0)
+
+        target = db.async_engine.sync_engine if db.async_engine is not None else db.engine
+        event.listen(target, "before_cursor_execute", _network_delay)
+
+    async def main() -> Dict[str, Any]:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = args.threadpool
+        transport = httpx.ASGITransport(app=app)
+        latencies: List[float] = []
+        errors = 0
+        created: List[int] = []
+        sem = asyncio.Semaphore(args.concurrency)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Seed a few rows so the read requests have something to return.
+            for i in range(20):
+                r = await client.post("/intakes", json={"domain_module": "Food", "narrative": f"seed {i}"})
+                created.append(r.json()["intake_id"])
+
+            async def one(i: int) -> None:
+                nonlocal errors
+                async with sem:
+                    start = time.perf_counter()
+                    kind = i % 4
+                    if kind in (0, 1):
+                        r = await client.post(
+                            "/intakes",
+                            json={"domain_module": "Housing", "priority": "High" if i % 3 else "Normal",
+                                  "narrative": "bench", "attributes": {"i": i}},
+                        )
+                    elif kind == 2:
+                        r = await client.get("/intakes", params={"limit": 20})
+                    else:
+                        r = await client.get(f"/intakes/{created[i % len(created)]}")
+                    latencies.append(time.perf_counter() - start)
+                    if r.status_code != 200:
+                        errors += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(args.requests)))
+            elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        return {
+            "mode": args.mode,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "threadpool": args.threadpool,
+            "latency_ms": args.latency_ms,
+            "errors": errors,
+            "elapsed_s": elapsed,
+            "throughput_rps": args.requests / elapsed,
+            "p50_ms": statistics.median(latencies) * 1e3,
+            "p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1e3,
+        }
+
+    return asyncio.run(main())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--threadpool", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated per-statement DB latency")
+    parser.add_argument("--out", help="write JSON results here")
+    parser.add_argument("--mode", choices=["sync", "async"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_worker(args)))
+        return 0
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-async-") as tmp:
+        for mode in ("sync", "async"):
+            cmd = [
+                sys.executable, "-m", "benchmarks.bench_async",
+                "--mode", mode, "--db", os.path.join(tmp, f"{mode}.db"),
+                "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+                "--threadpool", str(args.threadpool), "--latency-ms", str(args.latency_ms),
+            ]
+            out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print(f"{'mode':<6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>7}")
+    for r in results:
+        print(f"{r['mode']:<6} {r['throughput_rps']:>10.1f} {r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f} {r['errors']:>7}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+GET /intakes response path: the previous per-row dict copies +
+jsonable_encoder + JSONResponse vs fastjson (columns mapped once, one
+orjson call, no encoder walk).
+
+Both paths run the same keyset query against a seeded SQLite file and
+produce the response body; the handler is called directly so pages larger
+than MAX_PAGE_SIZE can be measured too. Also times the detail body with
+AttributesJson parsed + re-serialized vs passed through.
+
+Usage (from the project root):
+    python -m benchmarks.bench_json
+    python -m benchmarks.bench_json --sizes 50 500 5000 --repeat 50 --out json_path.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+
+def _seed(engine, rows: int) -> None:
+    from sqlalchemy import text
+
+    start = datetime(2024, 1, 1)
+    intakes = [
+        {
+            "CreatedAt": (start + timedelta(seconds=i)).isoformat(),
+            "DomainModule": "Housing",
+            "Priority": "High" if i % 3 else "Normal",
+            "Crisis": int(i % 17 == 0),
+            "Narrative": f"bench narrative {i}",
+            "AttributesJson": json.dumps({"zip": "96819", "risk_days": i % 30, "household": [1, 2, 3]}),
+        }
+        for i in range(rows)
+    ]
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO Intake (CreatedAt, DomainModule, Priority, Crisis, Narrative, AttributesJson) "
+                "VALUES (:CreatedAt, :DomainModule, :Priority, :Crisis, :Narrative, :AttributesJson)"
+            ),
+            intakes,
+        )
+        conn.execute(
+            text(
+                "INSERT INTO QueueItem (IntakeId, QueueName, Reason, Status, CreatedAt) "
+                "SELECT IntakeId, 'Housing', 'bench', 'New', CreatedAt FROM Intake"
+            )
+        )
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"median_ms": statistics.median(samples) * 1e3, "min_ms": min(samples) * 1e3}
+
+
+def run(sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from api import routes
+    from api.db import engine
+    from api.sqlite_bootstrap import bootstrap_sqlite
+
+    bootstrap_sqlite()
+    _seed(engine, max(sizes))
+
+    def before(limit: int) -> bytes:
+        params = routes._page_params("i", limit, None, None, None, None, None)
+        with engine.connect() as conn:
+            rows = conn.execute(routes._list_intakes_sql(params), params).mappings().all()
+        items = []
+        for r in rows:
+            d = dict(r)
+            d["crisis"] = routes._to_bool(d["crisis"])
+            items.append(d)
+        return JSONResponse(jsonable_encoder(routes._page("i", "intake_id", items, limit))).body
+
+    def after(limit: int) -> bytes:
+        request = SimpleNamespace(query_params={})
+        return routes.list_intakes(request, limit=limit, after=None, queue=None, status=None, since=None, until=None).body
+
+    results = []
+    for n in sizes:
+        assert json.loads(before(n)) == json.loads(after(n))
+        old, new = _time(lambda: before(n), repeat), _time(lambda: after(n), repeat)
+        results.append({"case": f"list_intakes[{n}]", "before": old, "after": new,
+                        "speedup": old["median_ms"] / new["median_ms"]})
+
+    with engine.connect() as conn:
+        row = conn.execute(routes._get_intake_sql(conn.dialect), {"id": 1}).mappings().first()
+
+    def detail_before() -> bytes:
+        d = dict(row)
+        del d["AttributesJsonValid"]
+        d["Crisis"] = routes._to_bool(d["Crisis"])
+        d["AttributesJson"] = routes._parse_json(d["AttributesJson"])
+        return JSONResponse(jsonable_encoder(d)).body
+
+    assert json.loads(detail_before()) == json.loads(routes._render_intake_detail(row))
+    old = _time(detail_before, repeat * 20)
+    new = _time(lambda: routes._render_intake_detail(row), repeat * 20)
+    results.append({"case": "intake_detail", "before": old, "after": new,
+                    "speedup": old["median_ms"] / new["median_ms"]})
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--out", help="write JSON results here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-json-") as tmp:
+        os.environ["DB_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        results = run(args.sizes, args.repeat)
+
+    print(f"{'case':<20} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for r in results:
+        print(f"{r['case']:<20} {r['before']['median_ms']:>10.3f} {r['after']['median_ms']:>10.3f} {r['speedup']:>7.2f}x")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Narrative search: LIKE '%...%' vs the FTS5 index behind GET /intakes/search.
+
+Seeds --rows synthetic intakes (default 1M) into a fresh SQLite file
+through the migrated schema, so IntakeNarrativeFts is filled by its insert
+trigger exactly as in production, then times each query both ways. LIKE
+returns the newest 20 matches (it can't rank); FTS returns the 20 best by
+bm25, so for very common words it does more work than LIKE's early exit.
+
+Usage (from the project root):
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --rows 100000 --repeat 5 --out search.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+_DOMAINS = ["Housing", "Food", "Utilities", "Legal", "Health"]
+_WORDS = (
+    "rent late landlord notice eviction locks changed deposit repairs mold heater water bill shutoff "
+    "electric company food kids school pantry benefits snap medical clinic appointment insurance "
+    "court hearing lawyer lease neighbor unsafe shelter car sleeping job hours cut family help"
+).split()
+_STREETS = ["Kam Hwy", "King St", "Beretania St", "Kapiolani Blvd", "Farrington Hwy", "Ala Moana Blvd"]
+_SURNAMES = ["Kealoha", "Nakamura", "Santos", "Kahananui", "Pham", "Tanaka", "Reyes", "Kalani"]
+
+# (label, FTS query, LIKE pattern, filters)
+_CASES = [
+    ("rare name", "kealoha", "%kealoha%", {}),
+    ("rare name + domain", "kealoha", "%kealoha%", {"domain": "Housing"}),
+    ("address phrase", '"farrington hwy"', "%farrington hwy%", {}),
+    ("two words", "mold heater", None, {}),
+    ("prefix", "evic*", "%evic%", {}),
+    ("common word", "rent", "%rent%", {}),
+]
+
+
+def _narrative(rng: random.Random, i: int) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(8, 30))
+    if i % 20000 == 0:
+        words.insert(rng.randrange(len(words)), "landlord Kealoha")
+    elif rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), f"landlord {rng.choice(_SURNAMES[1:])}{rng.randint(1, 500)}")
+    if rng.random() < 0.2:
+        words.append(f"at {rng.randint(1, 9999)} {rng.choice(_STREETS)}")
+    return " ".join(words).capitalize() + "."
+
+
+def _seed(engine, rows: int, batch: int = 20000) -> float:
+    from sqlalchemy import text
+
+    rng = random.Random(211)
+    start_at = datetime(2023, 1, 1)
+    insert = text(
+        "INSERT INTO Intake (CreatedAt, DomainModule, Priority, Crisis, Narrative) "
+        "VALUES (:CreatedAt, :DomainModule, 'Normal', 0, :Narrative)"
+    )
+    start = time.perf_counter()
+    for lo in range(0, rows, batch):
+        chunk = [
+            {
+                "CreatedAt": (start_at + timedelta(seconds=30 * i)).isoformat(),
+                "DomainModule": _DOMAINS[i % len(_DOMAINS)],
+                "Narrative": _narrative(rng, i),
+            }
+            for i in range(lo, min(rows, lo + batch))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert, chunk)
+    return time.perf_counter() - start
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    result = fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"median_ms": statistics.median(samples) * 1e3, "rows": len(result)}
+
+
+def run(rows: int, repeat: int) -> Dict[str, Any]:
+    from sqlalchemy import text
+
+    from api.db import engine
+    from api.migrations import migrate
+    from api.search import search_intakes
+
+    migrate(engine)
+    seed_s = _seed(engine, rows)
+
+    def like(pattern: str, filters: Dict[str, Any]) -> Callable[[], List[Any]]:
+        where = " AND DomainModule = :domain" if filters.get("domain") else ""
+        stmt = text(
+            f"SELECT IntakeId FROM Intake WHERE Narrative LIKE :p{where} ORDER BY IntakeId DESC LIMIT 20"
+        )
+
+        def go() -> List[Any]:
+            with engine.connect() as conn:
+                return conn.execute(stmt, {"p": pattern, **filters}).all()
+
+        return go
+
+    def fts(q: str, filters: Dict[str, Any]) -> Callable[[], List[Any]]:
+        def go() -> List[Any]:
+            with engine.connect() as conn:
+                return search_intakes(conn, q, {"since": None, "until": None, **filters}, limit=20)
+
+        return go
+
+    results = []
+    for label, q, pattern, filters in _CASES:
+        entry: Dict[str, Any] = {"case": label, "q": q, "fts": _time(fts(q, filters), repeat)}
+        if pattern is not None:
+            entry["like"] = _time(like(pattern, filters), repeat)
+        results.append(entry)
+    return {"rows": rows, "seed_s": seed_s, "results": results}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="write JSON results here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-search-") as tmp:
+        os.environ["DB_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        report = run(args.rows, args.repeat)
+
+    print(f"{report['rows']} intakes seeded in {report['seed_s']:.1f}s")
+    print(f"{'case':<20} {'LIKE ms':>10} {'FTS ms':>10} {'hits':>5}")
+    for r in report["results"]:
+        like = f"{r['like']['median_ms']:.1f}" if "like" in r else "-"
+        print(f"{r['case']:<20} {like:>10} {r['fts']['median_ms']:>10.1f} {r['fts']['rows']:>5}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
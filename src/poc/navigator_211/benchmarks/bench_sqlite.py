@@ -0,0 +1,114 @@
+"""
+Parallel SQLite writers: the stock engine vs the settings.json "sqlite"
+profile (WAL, synchronous=NORMAL, busy_timeout, sized pool).
+
+The baseline is what db.py built before the profile existed,
+create_engine(url) with pysqlite's defaults (rollback journal, 5 s busy
+timeout). Each run starts --writers threads doing read-then-write
+transactions against a fresh file while one thread reads in a loop, and
+reports writes/s and any "database is locked" errors.
+
+Usage (from the project root):
+    python -m benchmarks.bench_sqlite
+    python -m benchmarks.bench_sqlite --writers 16 --writes 200 --out sqlite.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+
+def _prepare(engine) -> None:
+    from sqlalchemy import text
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS W (Id INTEGER PRIMARY KEY AUTOINCREMENT, Thread INTEGER, Body TEXT)"))
+
+
+def hammer(engine, writers: int, writes: int) -> Dict[str, Any]:
+    """writers threads x writes transactions plus one reader; throughput and errors."""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    errors: List[str] = []
+    written: List[int] = []
+    stop = threading.Event()
+
+    def writer(n: int) -> None:
+        for _ in range(writes):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO W (Thread, Body) VALUES (:t, :b)"), {"t": n, "b": "x" * 200})
+                    conn.execute(text("SELECT COUNT(*) FROM W WHERE Thread = :t"), {"t": n}).scalar()
+                written.append(1)
+            except OperationalError as e:
+                errors.append(str(e))
+
+    def reader() -> None:
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT COUNT(*) FROM W")).scalar()
+            except OperationalError as e:
+                errors.append(str(e))
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    r = threading.Thread(target=reader)
+    r.start()
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    r.join()
+    return {"writes_per_s": len(written) / elapsed, "written": len(written), "errors": len(errors)}
+
+
+def run(tmp: str, writers: int, writes: int) -> Dict[str, Dict[str, Any]]:
+    from sqlalchemy import create_engine
+
+    from api.db import create_sqlite_engine
+    from api.settings import settings
+
+    results = {}
+    for name, engine in (
+        ("default", create_engine(f"sqlite:///{os.path.join(tmp, 'default.db')}")),
+        ("tuned", create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'tuned.db')}", settings["sqlite"])),
+    ):
+        _prepare(engine)
+        results[name] = hammer(engine, writers, writes)
+        engine.dispose()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=50, help="transactions per writer")
+    parser.add_argument("--out", help="write JSON results here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-sqlite-") as tmp:
+        results = run(tmp, args.writers, args.writes)
+
+    print(f"{args.writers} writers x {args.writes} transactions")
+    print(f"{'engine':<10} {'writes/s':>10} {'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['writes_per_s']:>10.0f} {r['errors']:>8}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
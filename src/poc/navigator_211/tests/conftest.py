@@ -0,0 +1,31 @@
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway SQLite file before api.db creates its engine.
+_DB_DIR = tempfile.mkdtemp(prefix="navigator211-tests-")
+os.environ["DB_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+
+    from api import idempotency
+    from api.app import app
+    from api.cache import intake_detail_cache
+    from api.db import engine
+    from api.sqlite_bootstrap import bootstrap_sqlite
+
+    bootstrap_sqlite()
+    with engine.begin() as conn:
+        for table in (
+            "RuleResult", "IntakeCurrentQueue", "QueueItem", "IntakeAttribute", "Intake", "QueueStat", "IdempotencyKey"
+        ):
+            conn.execute(text(f"DELETE FROM {table}"))
+    intake_detail_cache.clear()
+    idempotency.store.clear()
+
+    return TestClient(app)
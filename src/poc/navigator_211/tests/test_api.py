@@ -0,0 +1,236 @@
+import json
+
+
+def _intake(**overrides):
+    body = {
+        "caller_id": "test-001",
+        "channel": "phone",
+        "domain_module": "Housing",
+        "priority": "Normal",
+        "crisis": False,
+        "narrative": "Behind on rent.",
+        "attributes": {"risk_days": 7},
+    }
+    body.update(overrides)
+    return body
+
+
+def test_create_intake_routes_crisis(client):
+    r = client.post("/intakes", json=_intake(crisis=True))
+    assert r.status_code == 200
+    body = r.json()
+    assert body["queue"] == "Crisis"
+
+    detail = client.get(f"/intakes/{body['intake_id']}").json()
+    assert detail["queue"] == "Crisis"
+    assert detail["Crisis"] is True
+    assert detail["AttributesJson"] == {"risk_days": 7}
+
+
+def test_bulk_create_intakes_streams_results_per_line(client):
+    lines = [
+        json.dumps(_intake(domain_module="Food")),
+        json.dumps(_intake(priority="High")),
+        "",
+        "{not json",
+        json.dumps({"channel": "web"}),
+        json.dumps(_intake(crisis=True)),
+    ]
+    body = "\n".join(lines)  # no trailing newline on the last record
+
+    r = client.post("/intakes:bulk?chunk_size=2", content=body.encode("utf-8"),
+                    headers={"Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200
+    results = [json.loads(line) for line in r.text.splitlines()]
+
+    assert [res["line"] for res in results] == [1, 2, 4, 5, 6]
+    assert [res.get("queue") for res in results] == ["Food", "Priority", None, None, "Crisis"]
+    assert "error" in results[2] and "domain_module" in results[3]["error"]
+
+    listed = client.get("/intakes").json()
+    assert listed["count"] == 3
+
+
+def test_async_routes_match_sync(client, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from api import db
+    from api.routes_async import router as async_router
+
+    monkeypatch.setattr(db, "async_engine", create_async_engine(db._async_url(str(db.engine.url))))
+    async_app = FastAPI()
+    async_app.include_router(async_router)
+
+    with TestClient(async_app) as aclient:
+        created = aclient.post("/intakes", json=_intake(priority="Critical")).json()
+        assert created["queue"] == "Priority"
+
+        requeued = aclient.post(f"/intakes/{created['intake_id']}/requeue").json()
+        assert requeued["queue"] == "Priority"
+        assert aclient.post("/intakes/999999/requeue").status_code == 404
+
+        assert aclient.get(f"/intakes/{created['intake_id']}").json() == client.get(f"/intakes/{created['intake_id']}").json()
+        assert aclient.get("/intakes").json() == client.get("/intakes").json()
+
+
+def test_create_intake_is_insert_returning_plus_enqueue(client):
+    from sqlalchemy import event
+
+    from api.db import engine
+
+    statements = []
+
+    def _capture(conn, cursor, statement, *args):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        r = client.post("/intakes", json=_intake(domain_module="Utilities"))
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    assert r.json()["queue"] == "Utilities"
+    assert len(statements) == 3
+    assert statements[0].startswith("INSERT INTO Intake ") and statements[0].endswith("RETURNING IntakeId")
+    # The attribute index is filled from the JSON in one INSERT ... SELECT.
+    assert statements[1].startswith("INSERT INTO IntakeAttribute")
+    assert statements[2].startswith("INSERT INTO QueueItem")
+
+    # Callers with only an id still work (the engine reads the row).
+    assert client.post(f"/intakes/{r.json()['intake_id']}/requeue").json()["queue"] == "Utilities"
+
+
+def test_list_intakes_pages_with_cursor_and_filters(client):
+    ids = [client.post("/intakes", json=_intake(crisis=(n % 3 == 0))).json()["intake_id"] for n in range(7)]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"after": cursor} if cursor else {})}
+        page = client.get("/intakes", params=params).json()
+        seen += [i["intake_id"] for i in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(ids, reverse=True)
+
+    crisis = client.get("/intakes", params={"queue": "Crisis"}).json()
+    assert [i["intake_id"] for i in crisis["items"]] == [ids[6], ids[3], ids[0]]
+    assert crisis["next_cursor"] is None
+
+    assert client.get("/intakes", params={"until": "2000-01-01T00:00:00"}).json()["count"] == 0
+    assert client.get("/intakes", params={"after": "not-a-cursor"}).status_code == 400
+
+
+def test_list_queues_pages_with_cursor(client):
+    for n in range(5):
+        client.post("/intakes", json=_intake(domain_module="Food" if n % 2 else "Housing"))
+
+    first = client.get("/queues", params={"limit": 2}).json()
+    assert first["count"] == 2 and first["next_cursor"]
+    rest = client.get("/queues", params={"limit": 10, "after": first["next_cursor"]}).json()
+    assert rest["next_cursor"] is None
+    ids = [q["QueueItemId"] for q in first["items"] + rest["items"]]
+    assert len(ids) == 5 and ids == sorted(ids, reverse=True)
+
+    food = client.get("/queues", params={"queue": "Food", "status": "New"}).json()
+    assert food["count"] == 2 and {q["QueueName"] for q in food["items"]} == {"Food"}
+
+    # An /intakes cursor isn't valid for /queues.
+    cursor = client.get("/intakes", params={"limit": 1}).json()["next_cursor"]
+    assert client.get("/queues", params={"after": cursor}).status_code == 400
+
+
+def test_exports_stream_ndjson_and_csv_with_filters(client, monkeypatch):
+    import csv
+    import io
+
+    from sqlalchemy import text
+
+    from api import exports
+    from api.db import engine
+
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    ids = [client.post("/intakes", json=_intake(crisis=(n == 2))).json()["intake_id"] for n in range(5)]
+
+    r = client.get("/exports/intakes")
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["IntakeId"] for row in rows] == ids
+    assert json.loads(rows[0]["AttributesJson"]) == {"risk_days": 7}
+
+    r = client.get("/exports/queues", params={"format": "csv", "queue": "Housing"})
+    assert r.headers["content-type"].startswith("text/csv")
+    table = list(csv.DictReader(io.StringIO(r.text)))
+    assert [int(row["IntakeId"]) for row in table] == [i for n, i in enumerate(ids) if n != 2]
+
+    # A requeued intake: its old Housing row is history, the Crisis row is
+    # its own; /exports/queues filters on each row like GET /queues does.
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE Intake SET Crisis = 1 WHERE IntakeId = :id"), {"id": ids[0]})
+    client.post(f"/intakes/{ids[0]}/requeue")
+    exported = client.get("/exports/queues", params={"queue": "Crisis"}).text.splitlines()
+    listed = client.get("/queues", params={"queue": "Crisis"}).json()["items"]
+    assert sorted(json.loads(line)["QueueItemId"] for line in exported) == sorted(i["QueueItemId"] for i in listed)
+    assert {json.loads(line)["QueueName"] for line in exported} == {"Crisis"}
+    housing = [json.loads(line) for line in client.get("/exports/queues", params={"queue": "Housing"}).text.splitlines()]
+    assert [row["IntakeId"] for row in housing] == [i for n, i in enumerate(ids) if n != 2]
+
+    empty = client.get("/exports/rule-results", params={"format": "csv"})
+    assert empty.status_code == 200 and empty.text.startswith("RuleResultId,")
+    assert client.get("/exports/nope").status_code == 404
+    assert client.get("/exports/intakes", params={"format": "xml"}).status_code == 422
+
+
+def test_intake_detail_cache_is_byte_identical_and_invalidated(client):
+    from sqlalchemy import text
+
+    from api.cache import intake_detail_cache
+    from api.db import engine
+
+    intake_id = client.post("/intakes", json=_intake(attributes={"note": "café", "n": 1.5})).json()["intake_id"]
+
+    before = intake_detail_cache.stats()
+    miss = client.get(f"/intakes/{intake_id}")
+    hit = client.get(f"/intakes/{intake_id}")
+    assert miss.content == hit.content
+    assert hit.headers["content-type"] == "application/json"
+    stats = client.get("/cache/stats").json()["intake_detail"]
+    assert (stats["misses"] - before["misses"], stats["hits"] - before["hits"]) == (1, 1)
+
+    # Requeue after an out-of-band edit: the committed requeue drops the entry.
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE Intake SET Crisis = 1 WHERE IntakeId = :id"), {"id": intake_id})
+    assert client.get(f"/intakes/{intake_id}").json()["queue"] == "Housing"
+    client.post(f"/intakes/{intake_id}/requeue")
+    assert client.get(f"/intakes/{intake_id}").json()["queue"] == "Crisis"
+
+    client.post("/queues/Crisis/claim", json={"worker": "w1"})
+    assert client.get(f"/intakes/{intake_id}").json()["queue_status"] == "InProgress"
+    assert client.get("/intakes/999999").status_code == 404
+
+
+def test_intake_detail_passes_stored_attributes_through(client):
+    import json
+
+    from sqlalchemy import text
+
+    from api.db import engine
+
+    attrs = {"zip": "96819", "risk_days": 3, "tags": ["ü", None]}
+    intake_id = client.post("/intakes", json=_intake(attributes=attrs)).json()["intake_id"]
+    body = client.get(f"/intakes/{intake_id}").content
+    assert json.loads(body)["AttributesJson"] == attrs
+    assert body.endswith(b',"AttributesJson":' + json.dumps(attrs, ensure_ascii=False).encode("utf-8") + b"}")
+    assert "AttributesJsonValid" not in json.loads(body)
+
+    # Legacy rows with plain text, bracketed text that isn't JSON, or no
+    # attributes still render (and the body stays valid JSON).
+    for stored, expected in (
+        ("not json", "not json"), ("{not json}", "{not json}"), ("[1, 2}]", "[1, 2}]"), (None, None), ("", None)
+    ):
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE Intake SET AttributesJson = :a WHERE IntakeId = :id"), {"a": stored, "id": intake_id})
+        client.post(f"/intakes/{intake_id}/requeue")
+        assert client.get(f"/intakes/{intake_id}").json()["AttributesJson"] == expected
@@ -0,0 +1,40 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from api import fastjson
+
+_SAMPLE = {
+    "id": 7,
+    "created_at": datetime(2024, 5, 1, 9, 30, 15, 123456),
+    "score": Decimal("1.5"),
+    "crisis": True,
+    "note": "café  ",
+    "attrs": {"zip": "96819", "days": [1, 2]},
+    "missing": None,
+}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_dumps_matches_jsonresponse(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(fastjson, "orjson", None)
+    elif fastjson.orjson is None:
+        pytest.skip("orjson not installed")
+    assert fastjson.dumps(_SAMPLE) == JSONResponse(jsonable_encoder(_SAMPLE)).body
+
+
+def test_dumps_with_raw_splices_members():
+    assert fastjson.dumps_with_raw({"a": 1, "raw": "ignored"}, {"raw": '{"x": [1]}'}) == b'{"a":1,"raw":{"x": [1]}}'
+    assert fastjson.dumps_with_raw({}, {"raw": "[]"}) == b'{"raw":[]}'
+    assert not fastjson.is_raw_json("plain")
+    assert fastjson.is_raw_json('{"a":1}')
+
+
+def test_shape_rows_resolves_columns_once():
+    rows = fastjson.shape_rows(["id", "crisis"], [(1, 0), (2, "1")], ("crisis",), lambda v: bool(int(v)))
+    assert rows == [{"id": 1, "crisis": False}, {"id": 2, "crisis": True}]
+    assert fastjson.shape_rows(["id"], [(3,)]) == [{"id": 3}]
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+from sqlalchemy import text
+
+
+def _parse(chunk: bytes):
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().splitlines() if ": " in line)
+    return fields.get("event"), json.loads(fields["data"]) if "data" in fields else None
+
+
+def test_hub_gets_events_only_after_commit(client):
+    from api.db import engine
+    from api.feed import hub
+    from api.rules_engine import enqueue
+
+    async def scenario():
+        sub = hub.subscribe("Food")
+        try:
+            intake_id = client.post("/intakes", json={"domain_module": "Food"}).json()["intake_id"]
+            client.post("/intakes", json={"domain_module": "Legal"})  # other queue: filtered out
+
+            # A rolled-back enqueue never reaches subscribers.
+            with engine.connect() as conn:
+                with conn.begin() as tx:
+                    enqueue(conn, intake_id, "Food", "rolled back")
+                    tx.rollback()
+
+            evt = await asyncio.wait_for(sub.events.get(), 2)
+            assert evt["type"] == "queued" and evt["IntakeId"] == intake_id and evt["QueueName"] == "Food"
+
+            claimed = client.post("/queues/Food/claim", json={"worker": "w1"}).json()
+            evt = await asyncio.wait_for(sub.events.get(), 2)
+            assert evt == {"type": "status", **claimed}
+            await asyncio.sleep(0.05)
+            assert sub.events.empty()
+        finally:
+            sub.close()
+
+    asyncio.run(scenario())
+    assert hub.subscriber_count == 0
+
+
+def test_feed_replays_from_last_seen_then_streams_live(client):
+    from api import feed
+    from api.db import engine
+
+    ids = [client.post("/intakes", json={"domain_module": "Housing"}).json()["intake_id"] for _ in range(3)]
+    with engine.connect() as conn:
+        qids = [r[0] for r in conn.execute(text("SELECT QueueItemId FROM QueueItem ORDER BY QueueItemId"))]
+
+    async def scenario():
+        sub = feed.hub.subscribe("Housing")
+        stream = feed.feed_events(sub, after=qids[0])
+        got = [_parse(await stream.__anext__()) for _ in range(2)]
+        assert [e["IntakeId"] for _, e in got] == ids[1:]
+        assert await stream.__anext__() == b"retry: 2000\n\n"
+
+        await asyncio.to_thread(client.post, "/intakes", json={"domain_module": "Housing"})
+        kind, live = _parse(await asyncio.wait_for(stream.__anext__(), 2))
+        assert kind == "queued" and live["QueueItemId"] > qids[-1]
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    assert feed.hub.subscriber_count == 0
+
+
+def test_feed_endpoint_rejects_bad_last_event_id(client):
+    assert client.get("/queues/feed", headers={"Last-Event-ID": "abc"}).status_code == 400
@@ -0,0 +1,81 @@
+import time
+
+from sqlalchemy import event
+
+
+def _count_selects(engine):
+    seen = []
+
+    def _capture(conn, cursor, statement, *args):
+        if statement.strip() == "SELECT 1":
+            seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    return seen, lambda: event.remove(engine, "before_cursor_execute", _capture)
+
+
+def test_health_serves_cached_probe(client, monkeypatch):
+    from api.db import engine
+    from api.health import HealthProber
+    from api import health
+
+    prober = HealthProber(interval_s=60, stale_after_s=60)
+    monkeypatch.setattr(health, "prober", prober)
+
+    seen, remove = _count_selects(engine)
+    try:
+        for _ in range(5):
+            r = client.get("/health")
+            assert r.json() == {"status": "ok", "db": "ok", "version": "0.1.0"}
+    finally:
+        remove()
+    # Only the first call (nothing cached yet) touched the DB.
+    assert len(seen) == 1
+
+    details = client.get("/health/details").json()
+    assert details["db"] == "ok"
+    assert details["probe"]["probes"] == 1
+    assert details["probe"]["consecutive_failures"] == 0
+    assert details["probe"]["last_latency_ms"] >= 0
+    assert details["probe"]["seconds_since_success"] < 60
+    assert details["pool"]["checkedout"] == 0
+    assert {"size", "checkedin", "overflow"} <= set(details["pool"])
+
+
+def test_stale_result_is_reprobed(client, monkeypatch):
+    from api import health
+    from api.health import HealthProber
+
+    prober = HealthProber(interval_s=60, stale_after_s=0.05)
+    monkeypatch.setattr(health, "prober", prober)
+
+    client.get("/health")
+    time.sleep(0.1)
+    client.get("/health")
+    assert prober.probes == 2
+
+
+def test_prober_records_failures(monkeypatch):
+    from api import db
+    from api.health import HealthProber
+
+    class Broken:
+        def connect(self):
+            raise ConnectionError("login timeout")
+
+    prober = HealthProber(interval_s=0.02, stale_after_s=60)
+    assert prober.probe() == "ok"
+    monkeypatch.setattr(db, "engine", Broken())
+    prober.start()
+    try:
+        deadline = time.monotonic() + 2
+        while prober.consecutive_failures < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        prober.stop()
+
+    details = prober.details()
+    assert prober.current() == "error: ConnectionError"
+    assert details["consecutive_failures"] >= 2
+    assert details["last_error"] == "login timeout"
+    assert details["last_success_at"] is not None
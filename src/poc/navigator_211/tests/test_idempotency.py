@@ -0,0 +1,207 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+
+def _intake(**overrides):
+    payload = {
+        "caller_id": "idem-1",
+        "channel": "phone",
+        "domain_module": "Housing",
+        "priority": "Normal",
+        "crisis": False,
+        "narrative": "retrying client",
+        "attributes": {"zip": "96819"},
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _count(table):
+    from api.db import engine
+
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar_one()
+
+
+def test_repeat_with_same_key_replays_first_response(client):
+    from api.idempotency import store
+
+    headers = {"Idempotency-Key": "call-123"}
+    first = client.post("/intakes", json=_intake(), headers=headers)
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+
+    again = client.post("/intakes", json=_intake(), headers=headers)
+    assert again.status_code == 200
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert again.json() == first.json()
+
+    # After a restart the durable row answers.
+    store.clear()
+    durable = client.post("/intakes", json=_intake(), headers=headers)
+    assert durable.headers["Idempotent-Replayed"] == "true"
+    assert durable.json() == first.json()
+
+    assert _count("Intake") == 1
+    assert _count("QueueItem") == 1
+
+    # No key, or another key, is a new intake.
+    assert client.post("/intakes", json=_intake()).json()["intake_id"] != first.json()["intake_id"]
+    assert client.post("/intakes", json=_intake(), headers={"Idempotency-Key": "call-124"}).status_code == 200
+    assert _count("Intake") == 3
+
+
+def test_key_reused_for_different_request_is_rejected(client):
+    headers = {"Idempotency-Key": "call-9"}
+    assert client.post("/intakes", json=_intake(), headers=headers).status_code == 200
+
+    r = client.post("/intakes", json=_intake(priority="Critical"), headers=headers)
+    assert r.status_code == 422
+    assert client.post("/intakes", json=_intake(), headers={"Idempotency-Key": " "}).status_code == 400
+    assert _count("Intake") == 1
+
+
+def test_failed_request_is_not_recorded(client, monkeypatch):
+    from api import routes
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("rules unavailable")
+
+    headers = {"Idempotency-Key": "call-500"}
+    monkeypatch.setattr(routes, "evaluate_rules_and_enqueue", boom)
+    assert client.post("/intakes", json=_intake(), headers=headers).status_code == 500
+    monkeypatch.undo()
+
+    r = client.post("/intakes", json=_intake(), headers=headers)
+    assert r.status_code == 200 and "Idempotent-Replayed" not in r.headers
+    assert _count("Intake") == 1
+
+
+def test_key_committed_by_another_instance_is_replayed(client):
+    from api.db import engine
+    from api.idempotency import fingerprint, store
+
+    headers = {"Idempotency-Key": "call-77"}
+    first = client.post("/intakes", json=_intake(), headers=headers).json()
+    store.clear()
+
+    # Our lookup misses (the other instance hadn't committed yet); the
+    # IdempotencyKey insert then hits its row and our intake rolls back.
+    original = store._lookup
+    calls = []
+
+    def late_lookup(*args):
+        calls.append(args)
+        return None if len(calls) == 1 else original(*args)
+
+    store._lookup = late_lookup
+    try:
+        again = client.post("/intakes", json=_intake(), headers=headers)
+    finally:
+        del store._lookup
+
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert again.json() == first
+    assert _count("Intake") == 1
+    with engine.connect() as conn:
+        hash_ = conn.execute(text("SELECT RequestHash FROM IdempotencyKey")).scalar_one()
+    assert len(calls) == 2 and hash_ == fingerprint(_intake_json())
+
+
+def test_conflict_with_vanished_row_is_retryable(client):
+    from fastapi import HTTPException
+
+    from api.db import engine
+    from api.idempotency import Conflict, IdempotencyStore
+
+    store = IdempotencyStore(max_entries=100, ttl_s=60, wait_s=1)
+    runs = []
+
+    def pruned(record):
+        # Another instance's row made our insert fail, then was pruned.
+        runs.append(1)
+        raise Conflict("k1")
+
+    with pytest.raises(HTTPException) as e:
+        store.run(engine, "POST /intakes", "k1", "h", pruned)
+    assert e.value.status_code == 409 and runs == [1]
+
+    response = store.run(engine, "POST /intakes", "k1", "h", lambda record: {"ok": True})
+    assert response.body == b'{"ok":true}' and "Idempotent-Replayed" not in response.headers
+    assert store.stats()["in_flight"] == 0
+
+
+def _intake_json():
+    from api.models import IntakeCreate
+
+    return IntakeCreate(**_intake()).model_dump_json()
+
+
+def test_concurrent_requests_with_same_key_run_once():
+    from api.idempotency import IdempotencyStore
+
+    store = IdempotencyStore(max_entries=100, ttl_s=60, wait_s=5)
+    started = threading.Event()
+    runs = []
+
+    def work(record):
+        runs.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"case_id": len(runs)}
+
+    results = []
+
+    def call():
+        results.append(store.run(None, "POST /client/intake", "k1", "h", work))
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    threads[0].start()
+    started.wait(2)
+    for t in threads[1:]:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    assert len(runs) == 1
+    assert {r.body for r in results} == {b'{"case_id":1}'}
+    assert sorted(r.headers.get("Idempotent-Replayed", "") for r in results) == ["", "true", "true", "true", "true"]
+    assert store.stats()["coalesced"] == 4
+
+
+def test_client_intake_honours_key(client):
+    headers = {"Idempotency-Key": "web-1"}
+    body = {"description": "need food", "consent": True}
+    first = client.post("/client/intake", json=body, headers=headers)
+    again = client.post("/client/intake", json=body, headers=headers)
+    assert again.json() == first.json() and again.headers["Idempotent-Replayed"] == "true"
+    assert _count("IdempotencyKey") == 1
+    assert client.post("/client/intake", json={**body, "consent": False}, headers={"Idempotency-Key": "web-2"}).status_code == 400
+
+
+def test_async_create_intake_replays(client, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from api import db
+    from api.routes_async import router as async_router
+
+    monkeypatch.setattr(db, "async_engine", create_async_engine(db._async_url(str(db.engine.url))))
+    async_app = FastAPI()
+    async_app.include_router(async_router)
+
+    headers = {"Idempotency-Key": "async-1"}
+    with TestClient(async_app) as aclient:
+        first = aclient.post("/intakes", json=_intake(), headers=headers)
+        again = aclient.post("/intakes", json=_intake(), headers=headers)
+    # The sync route shares the key table.
+    sync = client.post("/intakes", json=_intake(), headers=headers)
+
+    assert first.status_code == 200
+    assert again.json() == first.json() == sync.json()
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert _count("Intake") == 1
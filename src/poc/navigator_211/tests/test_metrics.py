@@ -0,0 +1,95 @@
+import threading
+
+
+def _intake(**overrides):
+    payload = {"domain_module": "Food", "priority": "Normal", "crisis": False, "narrative": "metrics"}
+    payload.update(overrides)
+    return payload
+
+
+def _samples(text):
+    """{'name{labels}': value} for every sample line."""
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            key, value = line.rsplit(" ", 1)
+            out[key] = float(value)
+    return out
+
+
+def test_metrics_endpoint_reports_routes_db_and_rules(client):
+    from api import metrics
+
+    metrics.registry.reset()
+    created = client.post("/intakes", json=_intake()).json()
+    client.post("/intakes", json=_intake(crisis=True))
+    client.get(f"/intakes/{created['intake_id']}")
+    client.get("/intakes/999999")
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE navigator_http_request_duration_seconds histogram" in r.text
+    s = _samples(r.text)
+
+    http = 'navigator_http_request_duration_seconds_count{method="POST",route="/intakes",status="200"}'
+    assert s[http] == 2
+    # Path templates, not raw paths, so ids don't create new series.
+    assert s['navigator_http_request_duration_seconds_count{method="GET",route="/intakes/{intake_id}",status="200"}'] == 1
+    assert s['navigator_http_request_duration_seconds_count{method="GET",route="/intakes/{intake_id}",status="404"}'] == 1
+    assert s['navigator_http_request_duration_seconds_bucket{method="POST",route="/intakes",status="200",le="+Inf"}'] == 2
+
+    assert s['navigator_db_statement_duration_seconds_count{statement="INSERT Intake"}'] == 2
+    assert s['navigator_db_statement_duration_seconds_count{statement="INSERT QueueItem"}'] == 2
+    assert s['navigator_rules_evaluate_seconds_count{mode="sync"}'] == 2
+
+    assert s['navigator_rule_evaluations_total{rule="crisis_flag"}'] == 2
+    assert s['navigator_rule_matches_total{rule="crisis_flag"}'] == 1
+    assert s['navigator_rule_evaluations_total{rule="default_domain"}'] == 1
+    assert s['navigator_rule_matches_total{rule="default_domain"}'] == 1
+    assert s['navigator_rule_evaluation_seconds_total{rule="crisis_flag"}'] > 0
+
+
+def test_histogram_buckets_are_cumulative():
+    from api.metrics import Registry
+
+    registry = Registry()
+    h = registry.histogram("t_seconds", "test", ("op",), buckets=(0.01, 0.1))
+    for v in (0.005, 0.05, 0.05, 3.0):
+        h.observe(v, 'a"b')
+
+    s = _samples(registry.render())
+    assert s['t_seconds_bucket{op="a\\"b",le="0.01"}'] == 1
+    assert s['t_seconds_bucket{op="a\\"b",le="0.1"}'] == 3
+    assert s['t_seconds_bucket{op="a\\"b",le="+Inf"}'] == 4
+    assert s['t_seconds_count{op="a\\"b"}'] == 4
+    assert abs(s['t_seconds_sum{op="a\\"b"}'] - 3.105) < 1e-9
+
+
+def test_per_thread_shards_sum_on_scrape():
+    from api.metrics import Registry
+
+    registry = Registry()
+    c = registry.counter("t_total", "test", ("k",))
+
+    def work():
+        for _ in range(1000):
+            c.inc("x")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert _samples(registry.render())['t_total{k="x"}'] == 8000
+
+
+def test_statement_labels():
+    from api.metrics import statement_label
+
+    assert statement_label("INSERT INTO Intake (CreatedAt) VALUES (?)") == "INSERT Intake"
+    assert statement_label("  SELECT c.QueueName FROM IntakeCurrentQueue c JOIN Intake i ON 1") == "SELECT IntakeCurrentQueue"
+    assert statement_label("UPDATE [QueueItem] SET Status = ?") == "UPDATE QueueItem"
+    assert statement_label("DELETE FROM QueueStat") == "DELETE QueueStat"
+    assert statement_label("PRAGMA journal_mode=WAL") == "PRAGMA"
@@ -0,0 +1,138 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from api.migrations import LATEST_VERSION, migrate, status
+
+_PAGE = {"after": None, "queue": None, "status": None, "since": None, "until": None, "limit": 51}
+
+
+def test_migrate_is_versioned_and_idempotent(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'm.db'}")
+    assert migrate(engine, target=1) == [1]
+    assert status(engine)["pending"] == list(range(2, LATEST_VERSION + 1))
+
+    # Pre-projection history is carried into IntakeCurrentQueue by its migration.
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO Intake (IntakeId, CreatedAt) VALUES (1, 'x')"))
+        conn.execute(text(
+            "INSERT INTO QueueItem (IntakeId, QueueName, Status, CreatedAt) VALUES (1, 'Food', 'New', 'x'), (1, 'Crisis', 'New', 'y')"
+        ))
+
+    assert migrate(engine) == list(range(2, LATEST_VERSION + 1))
+    assert migrate(engine) == []
+    assert status(engine) == {"current": LATEST_VERSION, "latest": LATEST_VERSION, "pending": []}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT QueueName FROM IntakeCurrentQueue WHERE IntakeId = 1")).scalar_one() == "Crisis"
+
+
+_SORT = ("USE TEMP B-TREE FOR ORDER BY",)
+
+
+def _route_queries():
+    from sqlalchemy.dialects import sqlite
+
+    from api.attributes import attr_params, parse_attr_filters
+    from api.backfill import _select_ids_sql
+    from api.claims import CLAIM_SQLITE_SQL, CLOSE_SQL
+    from api.exports import _export_sql
+    from api.queue_stats import _STATS_SQL
+    from api.routes import GET_INTAKE_SQL, INTAKE_EXISTS_SQL, _list_intakes_sql, _list_queues_sql
+    from api.rules_engine import _SELECT_ROUTING_FIELDS
+    from api.search import _search_sql
+
+    # (name, statement, params, first_page, allow); a first page (no cursor)
+    # may walk the primary key in ORDER BY order, since LIMIT stops it early.
+    # allow lists plan-line prefixes expected for that query, e.g. _SORT for
+    # one that sorts its (index-seeked) matches for ORDER BY.
+    cases = [
+        ("get_intake", GET_INTAKE_SQL["sqlite"], {"id": 1}, False, ()),
+        ("intake_exists", INTAKE_EXISTS_SQL, {"id": 1}, False, ()),
+        ("routing_fields", _SELECT_ROUTING_FIELDS, {"id": 1}, False, ()),
+    ]
+    filters = [
+        {},
+        {"after": 100},
+        {"after": 100, "queue": "Food"},
+        {"after": 100, "status": "New"},
+        {"after": 100, "queue": "Food", "status": "New"},
+        {"after": 100, "since": "2025-01-01", "until": "2025-02-01"},
+        {"queue": "Food"},
+    ]
+    for f in filters:
+        params = {**_PAGE, **f}
+        first = params["after"] is None and not (f.get("queue") or f.get("status"))
+        cases.append((f"list_intakes {f}", _list_intakes_sql(params), params, first, ()))
+        cases.append((f"list_queues {f}", _list_queues_sql(params), params, first, ()))
+    # attr.* filters: without a queue/status walk one filter drives from
+    # IX_IntakeAttribute_Text/_Num (ranges and `in` too), the rest probe the
+    # (IntakeId, Name) primary key. Only an equality on /intakes comes out
+    # in key order; the other driven walks sort their matches.
+    for query, f in (
+        ({"attr.zip": "96819"}, {}),
+        ({"attr.risk_days.lte": "7"}, {}),
+        ({"attr.lang.in": "es,vi"}, {}),
+        ({"attr.zip": "96819", "attr.risk_days.lte": "7"}, {"after": 100}),
+        ({"attr.zip": "96819"}, {"queue": "Food"}),
+        ({"attr.lang.in": "es,vi"}, {"status": "New"}),
+        ({"attr.risk_days.gt": "3", "attr.lang.in": "es,vi"}, {}),
+        ({"attr.risk_days.gt": "3", "attr.lang.in": "es,vi"}, {"after": 100}),
+    ):
+        attrs = parse_attr_filters(query)
+        params = {**_PAGE, **f, "attrs": attrs, **attr_params(attrs)}
+        walk = bool(f.get("queue") or f.get("status"))
+        eq = any(a.op == "eq" for a in attrs)
+        intakes_allow = () if eq or walk else _SORT
+        cases.append((f"list_intakes {query} {f}", _list_intakes_sql(params), params, False, intakes_allow))
+        cases.append((f"list_queues {query} {f}", _list_queues_sql(params), params, False, () if walk else _SORT))
+    for f in ({}, {"domain": "Food", "since": "2025-01-01"}, {"queue": "Food"}):
+        cases.append((f"backfill {f}", text(_select_ids_sql(f)), {**f, "after": 0, "limit": 500}, False, ()))
+
+    # Search: the FTS5 MATCH (a virtual-table scan) fills a window of at
+    # most SEARCH_RANK_WINDOW rows, which is then read and sorted by score.
+    search_params = {"q": '"rent"', "window": 200, "limit": 20, "offset": 0}
+    for f in ({}, {"domain": "Food", "since": "2025-01-01", "until": "2025-02-01"}):
+        allow = ("SCAN f VIRTUAL TABLE INDEX", "SCAN m", "MATERIALIZE m") + _SORT
+        cases.append((f"search {f}", _search_sql(sqlite.dialect(), f), {**search_params, **f}, False, allow))
+
+    # Claim: merges one ordered IX_IntakeCurrentQueue_Claim seek per
+    # eligible status; only the merged (at most one row) result is read.
+    claim = {"queue": "Food", "worker": "w1", "now": "2025-01-01", "lease_expires": "2025-01-02"}
+    cases.append(("claim", CLAIM_SQLITE_SQL, claim, False, ("SCAN (subquery-",)))
+    cases.append(("close", CLOSE_SQL, {"id": 1, "queue": "Food", "worker": "w1"}, False, ()))
+
+    # Exports stream straight off the index the filter seeks, never sorted:
+    # unfiltered is a full walk in id order.
+    for kind in ("intakes", "queues", "rule-results"):
+        for f in (
+            {},
+            {"queue": "Food"},
+            {"status": "New"},
+            {"queue": "Food", "status": "New"},
+            {"since": "2025-01-01"},
+            {"since": "2025-01-01", "until": "2025-02-01"},
+            {"queue": "Food", "since": "2025-01-01"},
+        ):
+            params = {"queue": None, "status": None, "since": None, "until": None, **f}
+            cases.append((f"export {kind} {f}", _export_sql(kind, f), params, not f, ()))
+
+    # Queue stats read QueueStat whole (one row per queue and status); the
+    # oldest item per row is a MIN seek.
+    cases.append(("stats", _STATS_SQL, {}, False, ("SCAN s USING INDEX sqlite_autoindex_QueueStat_1",)))
+    return [pytest.param(*case[1:], id=case[0]) for case in cases]
+
+
+@pytest.mark.parametrize("stmt,params,first_page,allow", _route_queries())
+def test_route_queries_use_indexes(tmp_path, stmt, params, first_page, allow):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plan.db'}")
+    migrate(engine)
+    with engine.connect() as conn:
+        plan = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {stmt.text}"), params)]
+
+    rest = [p for p in plan if not p.startswith(allow)]
+    assert not [p for p in rest if "TEMP B-TREE" in p], plan
+    scans = [p for p in rest if p.startswith("SCAN")]
+    if first_page:
+        # Only a bare primary-key walk is allowed, no index or subquery scans.
+        assert all(" " not in p[len("SCAN "):] for p in scans), plan
+    else:
+        assert not scans, plan
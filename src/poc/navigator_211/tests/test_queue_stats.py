@@ -0,0 +1,58 @@
+from sqlalchemy import text
+
+
+def _stats(client):
+    return {q["queue"]: q for q in client.get("/queues/stats").json()["queues"]}
+
+
+def test_counters_follow_enqueue_requeue_claim_and_close(client):
+    from api.db import engine
+
+    food = [client.post("/intakes", json={"domain_module": "Food"}).json()["intake_id"] for _ in range(3)]
+    client.post("/intakes", json={"domain_module": "Legal"})
+
+    stats = _stats(client)
+    assert stats["Food"]["by_status"] == {"New": 3}
+    assert stats["Food"]["open"] == 3
+    assert stats["Legal"]["total"] == 1
+    assert stats["Food"]["oldest_open_age_s"] >= 0
+
+    # Requeue moves the current assignment, it doesn't add one.
+    client.post(f"/intakes/{food[0]}/requeue")
+    assert _stats(client)["Food"]["total"] == 3
+
+    item = client.post("/queues/Food/claim", json={"worker": "w1"}).json()["QueueItemId"]
+    assert _stats(client)["Food"]["by_status"] == {"New": 2, "InProgress": 1}
+
+    client.post(f"/queues/Food/items/{item}/close", json={"worker": "w1"})
+    food_stats = _stats(client)["Food"]
+    assert food_stats["by_status"] == {"New": 2, "Closed": 1}
+    assert food_stats["open"] == 2
+
+    # The counters match a recount from the base tables.
+    from api.queue_stats import reconcile
+
+    with engine.begin() as conn:
+        assert reconcile(conn) == []
+
+
+def test_reconcile_corrects_drift(client):
+    from api.db import engine
+    from api.queue_stats import reconcile_once
+
+    intake_id = client.post("/intakes", json={"domain_module": "Housing"}).json()["intake_id"]
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE QueueStat SET ItemCount = 40 WHERE QueueName = 'Housing'"))
+        # Crisis edited by hand bypasses the triggers.
+        conn.execute(text("UPDATE Intake SET Crisis = 1 WHERE IntakeId = :id"), {"id": intake_id})
+
+    assert _stats(client)["Housing"]["total"] == 40
+
+    drift = reconcile_once()
+    assert drift == [
+        {"queue": "Housing", "status": "New", "was": {"items": 40, "crisis": 0}, "now": {"items": 1, "crisis": 1}}
+    ]
+    housing = _stats(client)["Housing"]
+    assert housing["total"] == 1
+    assert housing["crisis_open"] == 1
+    assert reconcile_once() == []
@@ -0,0 +1,96 @@
+import json
+
+from sqlalchemy import text
+
+
+def test_route_intake_decisions():
+    from api.rules_engine import route_intake
+
+    assert route_intake({"Crisis": 1, "Priority": "Low", "DomainModule": "Food"})[0] == "Crisis"
+    assert route_intake({"Crisis": 0, "Priority": " critical ", "DomainModule": "Food"})[0] == "Priority"
+    assert route_intake({"Crisis": 0, "Priority": None, "DomainModule": " "})[0] == "General"
+
+
+def test_backfill_dry_run_then_resume(client, tmp_path):
+    from api.backfill import run_backfill
+    from api.db import engine
+
+    ids = [client.post("/intakes", json={"domain_module": "Food", "priority": p}).json()["intake_id"]
+           for p in ("Normal", "Normal", "Normal", "Normal", "Normal")]
+
+    # Simulate a rule change: two Food intakes should now be Priority.
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE Intake SET Priority = 'High' WHERE IntakeId IN (:a, :b)"),
+                     {"a": ids[1], "b": ids[3]})
+
+    filters = {"since": None, "until": None, "domain": "Food", "queue": "Food"}
+    checkpoint = tmp_path / "backfill.json"
+
+    report = run_backfill(filters, workers=2, batch_size=2, checkpoint=checkpoint, dry_run=True)
+    assert report["processed"] == 5
+    assert report["moves"] == [{"from": "Food", "to": "Priority", "count": 2}]
+    assert not checkpoint.exists()
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM QueueItem")).scalar_one() == 5
+
+    # Pretend a previous run committed everything up to ids[2].
+    checkpoint.write_text(json.dumps({"filters": filters, "last_intake_id": ids[2], "processed": 3}))
+    report = run_backfill(filters, workers=2, batch_size=1, checkpoint=checkpoint)
+    assert report["processed"] == 2
+    assert report["moved"] == 1
+    assert json.loads(checkpoint.read_text())["last_intake_id"] == ids[4]
+
+    listed = {i["intake_id"]: i["queue"] for i in client.get("/intakes").json()["items"]}
+    assert [listed[i] for i in ids] == ["Food", "Food", "Food", "Priority", "Food"]
+
+
+def test_backfill_rerun_writes_nothing_and_keeps_closed_items(client):
+    from api.backfill import process_batch
+    from api.db import engine
+
+    ids = [client.post("/intakes", json={"domain_module": "Food"}).json()["intake_id"] for _ in range(2)]
+    item = client.post("/queues/Food/claim", json={"worker": "w1"}).json()["QueueItemId"]
+    client.post(f"/queues/Food/items/{item}/close", json={"worker": "w1"})
+
+    def history():
+        with engine.connect() as conn:
+            return conn.execute(
+                text("SELECT IntakeId, QueueName, Status FROM QueueItem ORDER BY QueueItemId")
+            ).all()
+
+    before = history()
+    assert process_batch(ids, False) == (2, {}, 0)
+    assert history() == before
+
+    # A rule change that would move both: the open one moves, the closed one stays.
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE Intake SET Priority = 'High'"))
+    assert process_batch(ids, False) == (2, {("Food", "Priority"): 1}, 1)
+    assert history()[len(before):] == [(ids[1], "Priority", "New")]
+    assert client.get(f"/intakes/{ids[0]}").json()["queue"] == "Food"
+
+
+def test_current_queue_projection_follows_requeue_and_rebuilds(client):
+    from api.current_queue import rebuild
+    from api.db import engine
+
+    intake_id = client.post("/intakes", json={"domain_module": "Food"}).json()["intake_id"]
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE Intake SET Crisis = 1 WHERE IntakeId = :id"), {"id": intake_id})
+    client.post(f"/intakes/{intake_id}/requeue")
+
+    def current():
+        with engine.connect() as conn:
+            return conn.execute(
+                text("SELECT QueueItemId, QueueName FROM IntakeCurrentQueue WHERE IntakeId = :id"), {"id": intake_id}
+            ).one()
+
+    latest = current()
+    assert latest.QueueName == "Crisis"
+    assert client.get(f"/intakes/{intake_id}").json()["queue"] == "Crisis"
+    assert client.get("/intakes", params={"queue": "Crisis"}).json()["items"][0]["intake_id"] == intake_id
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE IntakeCurrentQueue SET QueueName = 'Stale'"))
+        assert rebuild(conn) == {"intakes": 1}
+    assert current() == latest
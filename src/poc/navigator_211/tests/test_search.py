@@ -0,0 +1,73 @@
+import pytest
+
+
+def _create(client, narrative, domain="Housing", **extra):
+    body = {"domain_module": domain, "narrative": narrative, **extra}
+    return client.post("/intakes", json=body).json()["intake_id"]
+
+
+def _search(client, **params):
+    r = client.get("/intakes/search", params=params)
+    assert r.status_code == 200, r.text
+    return [item["intake_id"] for item in r.json()["items"]]
+
+
+def test_search_ranks_and_filters(client):
+    a = _create(client, "Landlord Kealoha changed the locks at 94-123 Kam Hwy.")
+    b = _create(client, "Kealoha again. Kealoha says rent is late; Kealoha wants eviction.")
+    c = _create(client, "Needs food for three kids", domain="Food")
+    d = _create(client, "Utility shutoff notice from the electric company", domain="Utilities")
+
+    assert _search(client, q="kealoha") == [b, a]
+    assert _search(client, q="KEALOHA locks") == [a]
+    assert _search(client, q='"kam hwy"') == [a]
+    assert _search(client, q='"hwy kam"') == []
+    assert _search(client, q="evict*") == [b]
+    assert _search(client, q="kids", domain="Food") == [c]
+    assert _search(client, q="kids", domain="Housing") == []
+    assert _search(client, q="shutoff", since="2000-01-01T00:00:00") == [d]
+    assert _search(client, q="shutoff", until="2000-01-01T00:00:00") == []
+
+    item = client.get("/intakes/search", params={"q": "locks"}).json()["items"][0]
+    assert "[locks]" in item["snippet"]
+    assert item["score"] > 0
+    assert item["crisis"] is False
+    assert _search(client, q="kealoha", limit=1, offset=1) == [a]
+
+
+def test_search_tracks_updates_and_deletes(client):
+    from sqlalchemy import text
+
+    from api.db import engine
+
+    intake_id = _create(client, "Mold in the bathroom")
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE Intake SET Narrative = 'Broken heater' WHERE IntakeId = :id"), {"id": intake_id})
+    assert _search(client, q="mold") == []
+    assert _search(client, q="heater") == [intake_id]
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM IntakeCurrentQueue WHERE IntakeId = :id"), {"id": intake_id})
+        conn.execute(text("DELETE FROM QueueItem WHERE IntakeId = :id"), {"id": intake_id})
+        conn.execute(text("DELETE FROM Intake WHERE IntakeId = :id"), {"id": intake_id})
+    assert _search(client, q="heater") == []
+
+
+@pytest.mark.parametrize("q", ['NEAR(a b)', 'narrative:rent', 'a OR', '"unclosed', '^start', "rent -late"])
+def test_search_treats_operators_as_words(client, q):
+    _create(client, "rent is late, start NEAR the narrative")
+    assert client.get("/intakes/search", params={"q": q}).status_code == 200
+
+
+def test_search_requires_words(client):
+    assert client.get("/intakes/search", params={"q": "* \"\""}).status_code == 400
+    assert client.get("/intakes/search").status_code == 422
+
+
+def test_query_builders():
+    from api.search import contains_query, fts5_query, parse_terms
+
+    terms = parse_terms('Kealoha "94-123 kam" evic*')
+    assert terms == [("Kealoha", False), ("94-123 kam", False), ("evic", True)]
+    assert fts5_query(terms) == '"Kealoha" "94-123 kam" "evic"*'
+    assert contains_query(terms) == '"Kealoha" AND "94-123 kam" AND "evic*"'
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+SQLITE_DBO_SCHEMA = (Path(__file__).resolve().parents[1] / "sql" / "schema.sqlite.sql").read_text(encoding="utf-8")
+
+
+def create_dbo_schema(conn):
+    for stmt in SQLITE_DBO_SCHEMA.split(";\n\n"):
+        lines = [l for l in stmt.strip().splitlines() if not l.startswith("--")]
+        if lines:
+            conn.exec_driver_sql("\n".join(lines).rstrip(";") + ";")
+
+
+@pytest.fixture
+def dbo_engine():
+    from api.rules_engine import rule_cache
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, future=True)
+
+    @event.listens_for(engine, "connect")
+    def _attach_dbo(dbapi_conn, _):
+        dbapi_conn.execute("ATTACH DATABASE ':memory:' AS dbo")
+
+    with engine.begin() as conn:
+        create_dbo_schema(conn)
+
+    rule_cache.invalidate()
+    yield engine
+    rule_cache.invalidate()
+    engine.dispose()
@@ -37,3 +37,45 @@ def test_create_intake_housing_crisis():
     assert r.status_code == 200
     body = r.json()
     assert body["queue"] in ["HousingEscalation", "General"]  # depends on seed rules
+
+
+def test_app_imports_and_serves_without_db():
+    from api.app import app
+    from api.db import engine
+
+    paths = set(app.openapi()["paths"])
+    assert {"/health", "/health/details", "/outbox/lag", "/intakes", "/queues"} <= paths
+
+    if engine is None:
+        # Entering the client runs the lifespan (background workers).
+        with TestClient(app) as client:
+            assert client.get("/health").json()["db"] == "not_configured"
+            assert client.get("/health/details").json()["db"] == "not_configured"
+            assert client.get("/outbox/lag").status_code == 500
+
+
+def test_list_queues_pages_with_cursor(dbo_engine, monkeypatch):
+    from sqlalchemy import text
+
+    from api import routes
+
+    with dbo_engine.begin() as conn:
+        for n in range(5):
+            conn.execute(text("INSERT INTO dbo.Intake (DomainModule) VALUES ('Housing')"))
+            conn.execute(text(
+                "INSERT INTO dbo.QueueItem (IntakeId, QueueName, Status) VALUES (:id, :q, 'Open')"
+            ), {"id": n + 1, "q": "Housing" if n % 2 else "Food"})
+    monkeypatch.setattr(routes, "engine", dbo_engine)
+
+    seen, cursor = [], None
+    while True:
+        page = routes.list_queues(limit=2, after=cursor, queue=None, status=None, since=None, until=None)
+        assert page["count"] <= 2
+        seen += [item["QueueItemId"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [5, 4, 3, 2, 1]
+
+    housing = routes.list_queues(limit=50, after=None, queue="Housing", status=None, since=None, until=None)
+    assert [item["QueueItemId"] for item in housing["items"]] == [4, 2]
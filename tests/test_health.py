@@ -0,0 +1,58 @@
+import time
+
+from sqlalchemy import event
+
+
+def test_prober_caches_and_reports(dbo_engine):
+    from api.health import HealthProber
+
+    selects = []
+    event.listen(dbo_engine, "before_cursor_execute", lambda *args: selects.append(args[2]))
+
+    prober = HealthProber(dbo_engine, interval_s=60, stale_after_s=60)
+    assert [prober.current() for _ in range(5)] == ["ok"] * 5
+    assert selects == ["SELECT 1"]
+
+    details = prober.details()
+    assert details["consecutive_failures"] == 0 and details["seconds_since_success"] < 60
+    assert details["last_latency_ms"] >= 0
+    assert details["pool"]["class"] == "StaticPool"
+
+
+def test_prober_thread_tracks_failures():
+    from api.health import HealthProber
+
+    class Broken:
+        pool = object()
+
+        def connect(self):
+            raise ConnectionError("login timeout")
+
+    prober = HealthProber(Broken(), interval_s=0.02, stale_after_s=60)
+    prober.start()
+    try:
+        deadline = time.monotonic() + 2
+        while prober.consecutive_failures < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        prober.stop()
+
+    assert prober.current() == "error: ConnectionError"
+    details = prober.details()
+    assert details["consecutive_failures"] >= 3
+    assert details["last_error"] == "login timeout"
+    assert details["seconds_since_success"] is None
+
+
+def test_health_details_route(dbo_engine, monkeypatch):
+    from api import routes
+    from api.health import HealthProber
+
+    monkeypatch.setattr(routes, "prober", HealthProber(dbo_engine, interval_s=60, stale_after_s=60))
+    routes.prober.probe()
+
+    body = routes.health_details()
+    assert body["db"] == "ok"
+    assert body["pool"]["class"] == "StaticPool"
+    assert "db" not in body["probe"] and "pool" not in body["probe"]
+    assert body["probe"]["consecutive_failures"] == 0
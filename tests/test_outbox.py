@@ -0,0 +1,146 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from conftest import create_dbo_schema
+from test_rules import _insert_intake, _insert_rule
+
+
+def _seed(conn):
+    _insert_rule(conn, "housing", {"all": [{"field": "DomainModule", "op": "eq", "value": "Housing"}]},
+                 params={"queue": "Housing", "reason": "housing"})
+    _insert_rule(conn, "crisis", {"all": [{"field": "Crisis", "op": "eq", "value": 1}]},
+                 action="flag_crisis", order=200)
+    return [_insert_intake(conn, crisis=i % 2) for i in range(5)]
+
+
+def _rule_results(conn):
+    return conn.execute(text(
+        "SELECT IntakeId, RuleId, Action, OutcomeJson FROM dbo.RuleResult ORDER BY IntakeId, RuleId"
+    )).all()
+
+
+def test_outbox_mode_defers_rule_results(dbo_engine, monkeypatch):
+    from api import outbox
+    from api.rules_engine import evaluate_rules_and_enqueue, evaluate_rules_and_enqueue_many
+
+    with dbo_engine.begin() as conn:
+        ids = _seed(conn)
+        evaluate_rules_and_enqueue_many(conn, ids)
+        expected = _rule_results(conn)
+        conn.execute(text("DELETE FROM dbo.RuleResult"))
+        conn.execute(text("UPDATE dbo.Intake SET CreatedAt = CreatedAt"))
+
+    monkeypatch.setattr(outbox, "ENABLED", True)
+    with dbo_engine.begin() as conn:
+        decisions = [evaluate_rules_and_enqueue(conn, ids[0])]
+        decisions += evaluate_rules_and_enqueue_many(conn, ids[1:])
+        assert _rule_results(conn) == []
+        # One outbox row per intake, however many rules matched.
+        assert conn.execute(text("SELECT COUNT(*) FROM dbo.RuleResultOutbox")).scalar_one() == len(ids)
+        assert [d[0] for d in decisions] == ["Housing"] * len(ids)
+
+    with dbo_engine.begin() as conn:
+        assert outbox.drain_once(conn, batch_size=2) == 2
+        assert outbox.drain_once(conn, batch_size=100) == 3
+        assert outbox.drain_once(conn) == 0
+        assert _rule_results(conn) == expected
+        assert outbox.lag(conn)["pending"] == 0
+
+
+def test_drain_keeps_evaluation_time(dbo_engine, monkeypatch):
+    from api import outbox
+    from api.rules_engine import evaluate_rules_and_enqueue
+
+    monkeypatch.setattr(outbox, "ENABLED", True)
+    with dbo_engine.begin() as conn:
+        intake_id = _seed(conn)[0]
+        evaluate_rules_and_enqueue(conn, intake_id)
+        conn.execute(text("UPDATE dbo.RuleResultOutbox SET CreatedAt = '2025-01-02 03:04:05'"))
+
+    with dbo_engine.begin() as conn:
+        outbox.drain_once(conn)
+        assert conn.execute(text("SELECT DISTINCT EvaluatedAt FROM dbo.RuleResult")).scalars().all() == [
+            "2025-01-02 03:04:05"
+        ]
+
+
+def test_failed_drain_loses_nothing(dbo_engine, monkeypatch):
+    from api import outbox
+    from api.rules_engine import evaluate_rules_and_enqueue_many
+
+    monkeypatch.setattr(outbox, "ENABLED", True)
+    with dbo_engine.begin() as conn:
+        evaluate_rules_and_enqueue_many(conn, _seed(conn))
+
+    # Die after the batch is claimed but before it commits.
+    with pytest.raises(RuntimeError):
+        with dbo_engine.begin() as conn:
+            outbox.drain_once(conn)
+            raise RuntimeError("writer crashed")
+
+    with dbo_engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM dbo.RuleResultOutbox")).scalar_one() == 5
+        assert _rule_results(conn) == []
+
+    assert outbox.drain(dbo_engine, batch_size=2) == 5
+    with dbo_engine.connect() as conn:
+        assert len(_rule_results(conn)) == 7
+        assert outbox.lag(conn)["pending"] == 0
+
+
+def test_lag_reports_oldest_pending(dbo_engine):
+    from api import outbox
+
+    now = datetime(2025, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+    with dbo_engine.begin() as conn:
+        assert outbox.lag(conn, now) == {"pending": 0, "oldest_created_at": None, "lag_seconds": 0.0}
+        for created in ("2025-01-01 12:00:00", "2025-01-01 12:00:20"):
+            conn.execute(text(
+                "INSERT INTO dbo.RuleResultOutbox (CreatedAt, IntakeId, PayloadJson) VALUES (:c, 1, '[]')"
+            ), {"c": created})
+        assert outbox.lag(conn, now) == {
+            "pending": 2,
+            "oldest_created_at": "2025-01-01T12:00:00+00:00",
+            "lag_seconds": 30.0,
+        }
+
+
+def test_writer_drains_in_background(tmp_path, monkeypatch):
+    from api import outbox
+    from api.rules_engine import evaluate_rules_and_enqueue_many, rule_cache
+
+    # A file database so the writer thread gets its own connection.
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}", future=True)
+
+    @event.listens_for(engine, "connect")
+    def _attach_dbo(dbapi_conn, _):
+        dbapi_conn.execute(f"ATTACH DATABASE '{tmp_path / 'dbo.db'}' AS dbo")
+
+    with engine.begin() as conn:
+        create_dbo_schema(conn)
+
+    monkeypatch.setattr(outbox, "ENABLED", True)
+    rule_cache.invalidate()
+    writer = outbox.OutboxWriter(interval_s=0.05, batch_size=2)
+    writer.start(engine)
+    try:
+        with engine.begin() as conn:
+            evaluate_rules_and_enqueue_many(conn, _seed(conn))
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with engine.connect() as conn:
+                if outbox.lag(conn)["pending"] == 0:
+                    break
+            time.sleep(0.05)
+    finally:
+        writer.stop()
+        rule_cache.invalidate()
+
+    with engine.connect() as conn:
+        assert len(_rule_results(conn)) == 7
+    assert writer.status()["rows_moved"] == 5
+    assert writer.status()["last_error"] is None
+    engine.dispose()
@@ -1,3 +1,10 @@
+import json
+import random
+
+import pytest
+from sqlalchemy import event, text
+
+
 def test_rule_matcher_smoke():
     from api.rules_engine import _matches
 
@@ -12,3 +19,189 @@ def test_rule_matcher_smoke():
     ]}
 
     assert _matches(match, intake, attrs) is True
+
+
+def _insert_rule(conn, name, match, action="set_queue", params=None, order=100, enabled=1):
+    conn.execute(
+        text("""
+            INSERT INTO dbo.Rule (RuleName, IsEnabled, PriorityOrder, MatchJson, Action, ActionParamsJson)
+            VALUES (:n, :e, :o, :m, :a, :p)
+        """),
+        {"n": name, "e": enabled, "o": order, "m": json.dumps(match), "a": action,
+         "p": json.dumps(params) if params is not None else None},
+    )
+
+
+def _insert_intake(conn, domain="Housing", crisis=0, narrative="", attrs=None, priority="Normal"):
+    conn.execute(
+        text("""
+            INSERT INTO dbo.Intake (DomainModule, Priority, Crisis, Narrative, AttributesJson)
+            VALUES (:d, :p, :c, :n, :a)
+        """),
+        {"d": domain, "p": priority, "c": crisis, "n": narrative, "a": json.dumps(attrs or {})},
+    )
+    return int(conn.execute(text("SELECT last_insert_rowid()")).scalar_one())
+
+
+def test_compiled_rule_matches_interpreter():
+    from api.rules_engine import _apply_action, _matches, compile_rule
+
+    intakes = [
+        ({"DomainModule": "Housing", "Crisis": True, "Priority": "High", "Narrative": "Eviction next week"}, {"risk_days": 3, "zip": "96819"}),
+        ({"DomainModule": "Food", "Crisis": False, "Priority": "Low", "Narrative": None}, {"risk_days": "soon"}),
+        ({"DomainModule": "Utilities", "Crisis": 1, "Priority": None, "Narrative": "shutoff"}, {}),
+    ]
+    matches = [
+        {"all": [{"field": "DomainModule", "op": "eq", "value": "Housing"}]},
+        {"all": [{"field": "Crisis", "op": "neq", "value": False}]},
+        {"all": [{"field": "Narrative", "op": "contains", "value": "EVICTION"}]},
+        {"all": [{"attr": "risk_days", "op": "lt", "value": 7}, {"attr": "risk_days", "op": "gte", "value": 1}]},
+        {"all": [{"attr": "risk_days", "op": "lte", "value": 3}, {"attr": "risk_days", "op": "gt", "value": 0}]},
+        {"all": [{"field": "Priority", "op": "in", "value": ["High", "Critical"]}]},
+        {"all": [{"attr": "zip", "op": "in", "value": [["96819"], "96819"]}]},
+        {"all": [{"field": "DomainModule", "op": "regex", "value": ".*"}]},
+        {"all": [{"op": "eq", "value": 1}]},
+        {"all": []},
+        {},
+    ]
+    for m in matches:
+        rule = compile_rule({"RuleId": 1, "RuleName": "r", "MatchJson": json.dumps(m), "Action": "set_priority"})
+        for intake, attrs in intakes:
+            assert rule.matches(intake, attrs) is _matches(m, intake, attrs), (m, intake)
+            assert rule.apply(intake, attrs) == _apply_action(intake, attrs, "set_priority", {})
+
+
+def test_rule_cache_reloads_only_on_version_change(dbo_engine):
+    from api.rules_engine import evaluate_rules_and_enqueue, rule_cache
+
+    with dbo_engine.begin() as conn:
+        _insert_rule(conn, "Housing", {"all": [{"field": "DomainModule", "op": "eq", "value": "Housing"}]},
+                     params={"queue": "HousingEscalation", "reason": "housing"})
+        intake_id = _insert_intake(conn)
+
+    statements = []
+
+    @event.listens_for(dbo_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with dbo_engine.begin() as conn:
+        assert evaluate_rules_and_enqueue(conn, intake_id)[0] == "HousingEscalation"
+        first_version = rule_cache.version
+        statements.clear()
+        assert evaluate_rules_and_enqueue(conn, intake_id)[0] == "HousingEscalation"
+
+    assert not any("FROM dbo.Rule\n" in s for s in statements)
+
+    # Editing a rule bumps the stamp, so the next evaluation sees the change.
+    with dbo_engine.begin() as conn:
+        conn.execute(text("UPDATE dbo.Rule SET IsEnabled = 0"))
+        queue, reason, applied = evaluate_rules_and_enqueue(conn, intake_id)
+
+    assert rule_cache.version != first_version
+    assert (queue, reason, applied) == ("General", None, [])
+
+
+def test_rule_index_keeps_order_and_matches():
+    from api.rules_engine import RuleSet, compile_rule
+
+    rnd = random.Random(7)
+    domains = ["Housing", "Food", "Utilities", "Health", None]
+    clauses = [
+        lambda: {"field": "DomainModule", "op": "eq", "value": rnd.choice(domains)},
+        lambda: {"field": "DomainModule", "op": "in", "value": rnd.sample(domains[:4], 2)},
+        lambda: {"field": "Crisis", "op": "eq", "value": rnd.choice([True, False, 1])},
+        lambda: {"field": "Priority", "op": "in", "value": ["High", "Critical"]},
+        lambda: {"field": "Channel", "op": "eq", "value": "web"},
+        lambda: {"field": "DomainModule", "op": "eq", "value": ["Housing"]},
+        lambda: {"attr": "risk_days", "op": "lte", "value": 7},
+        lambda: {"field": "Narrative", "op": "contains", "value": "eviction"},
+    ]
+    rows = []
+    for i in range(300):
+        match = {"all": [rnd.choice(clauses)() for _ in range(rnd.randint(0, 3))]}
+        rows.append({"RuleId": i, "RuleName": f"r{i}", "MatchJson": json.dumps(match), "Action": "set_queue"})
+    rules = RuleSet([compile_rule(r) for r in rows])
+
+    for _ in range(200):
+        intake = {
+            "DomainModule": rnd.choice(domains + ["Other"]),
+            "Crisis": rnd.choice([True, False, 0, 1]),
+            "Priority": rnd.choice(["Low", "High", "Critical"]),
+            "Channel": rnd.choice(["web", "phone"]),
+            "Narrative": rnd.choice(["eviction notice", "food"]),
+        }
+        attrs = {"risk_days": rnd.randint(0, 14)}
+        expected = [r.rule_id for r in rules.rules if r.matches(intake, attrs)]
+        candidates = rules.candidates(intake)
+        assert [r.rule_id for r in candidates if r.matches(intake, attrs)] == expected
+        assert [r.rule_id for r in candidates] == sorted(r.rule_id for r in candidates)
+
+
+def test_evaluate_many_matches_single(dbo_engine):
+    from api.rules_engine import evaluate_rules_and_enqueue, evaluate_rules_and_enqueue_many
+
+    with dbo_engine.begin() as conn:
+        _insert_rule(conn, "Housing crisis", {"all": [
+            {"field": "DomainModule", "op": "eq", "value": "Housing"},
+            {"field": "Crisis", "op": "eq", "value": 1},
+        ]}, params={"queue": "HousingEscalation", "reason": "crisis"}, order=10)
+        _insert_rule(conn, "Eviction", {"all": [
+            {"field": "Narrative", "op": "contains", "value": "eviction"},
+        ]}, params={"queue": "Eviction"}, order=20)
+        ids = [
+            _insert_intake(conn, "Housing", 1, "eviction notice"),
+            _insert_intake(conn, "Food", 0, "pantry"),
+            _insert_intake(conn, "Housing", 0, "Eviction"),
+        ]
+
+    with dbo_engine.begin() as conn:
+        single = [evaluate_rules_and_enqueue(conn, i) for i in ids]
+    with dbo_engine.begin() as conn:
+        batch = evaluate_rules_and_enqueue_many(conn, ids)
+
+    assert batch == single
+    assert [q for q, _, _ in batch] == ["Eviction", "General", "Eviction"]
+
+    with dbo_engine.connect() as conn:
+        counts = conn.execute(text("""
+            SELECT (SELECT COUNT(*) FROM dbo.RuleResult), (SELECT COUNT(*) FROM dbo.QueueItem)
+        """)).one()
+    assert tuple(counts) == (6, 6)
+
+    with dbo_engine.begin() as conn, pytest.raises(RuntimeError):
+        evaluate_rules_and_enqueue_many(conn, [ids[0], 9999])
+
+
+@pytest.mark.parametrize("automaton", [True, False])
+def test_contains_scan_matches_interpreter(monkeypatch, automaton):
+    import api.rules_engine as re_mod
+    from api.rules_engine import RuleSet, _matches, compile_rule
+
+    if not automaton:
+        monkeypatch.setattr(re_mod, "ahocorasick", None)
+    elif re_mod.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+
+    matches = [
+        {"all": [{"field": "Narrative", "op": "contains", "value": v}]}
+        for v in ("eviction", "Evict", "shutoff", "domestic violence", "", None, 7)
+    ] + [
+        {"all": [{"field": "Narrative", "op": "contains", "value": "evict"},
+                 {"attr": "note", "op": "contains", "value": "LANDLORD"}]},
+        {"all": [{"attr": "code", "op": "contains", "value": "7"}]},
+    ]
+    rows = [{"RuleId": i, "RuleName": f"r{i}", "MatchJson": json.dumps(m), "Action": "set_queue"}
+            for i, m in enumerate(matches)]
+    rules = RuleSet([compile_rule(r) for r in rows])
+
+    cases = [
+        ({"Narrative": "Got an EVICTION notice; power SHUTOFF Friday"}, {"note": "landlord changed locks", "code": 17}),
+        ({"Narrative": "none of the above"}, {"code": None}),
+        ({"Narrative": None}, {}),
+        ({"Narrative": "Domestic Violence shelter, 7 kids"}, {"note": 5}),
+    ]
+    for intake, attrs in cases:
+        scan = rules.new_scan()
+        got = [r.rule_id for r in rules.rules if r.matches(intake, attrs, scan)]
+        assert got == [i for i, m in enumerate(matches) if _matches(m, intake, attrs)], intake